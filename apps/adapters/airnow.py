@@ -2,17 +2,24 @@
 EPA AirNow adapter for U.S. air quality data.
 """
 import logging
-from datetime import datetime
-from typing import List, Dict
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import List, Dict, Optional
 
 from django.utils import timezone
 from apps.core.utils import calculate_distance_km
 
 from .base import BaseAdapter
-from .models import SourceData
+from .observation import Observation
 
 logger = logging.getLogger(__name__)
 
+# UTC offsets (hours) of the LocalTimeZone abbreviations AirNow reports
+_LOCAL_TIME_ZONES = {
+    'EST': -5, 'EDT': -4, 'CST': -6, 'CDT': -5, 'MST': -7, 'MDT': -6,
+    'PST': -8, 'PDT': -7, 'AKST': -9, 'AKDT': -8, 'HST': -10, 'HDT': -9,
+    'AST': -4, 'ADT': -3, 'SST': -11, 'CHST': 10,
+}
+
 
 class AirNowAdapter(BaseAdapter):
     """
@@ -26,6 +33,7 @@ class AirNowAdapter(BaseAdapter):
     API_BASE_URL = "https://www.airnowapi.org/aq/"
     REQUIRES_API_KEY = True
     QUALITY_LEVEL = "verified"
+    STATION_UPDATE_INTERVAL = 3600  # Reporting areas update hourly
     
     def _add_api_key(self, params: Dict, headers: Dict):
         """AirNow uses 'API_KEY' parameter."""
@@ -33,33 +41,71 @@ class AirNowAdapter(BaseAdapter):
             params['API_KEY'] = self.api_key
             params['format'] = 'application/json'
     
-    def fetch_current(self, lat: float, lon: float, **kwargs) -> List[SourceData]:
+    def fetch_current(self, lat: float, lon: float, **kwargs) -> List[Observation]:
         """
         Fetch current AQI observations for coordinates.
         
+        Points whose reporting area is already known are served from the
+        area's cached observations (AirNow has no by-area endpoint).
+        
         Args:
             lat: Latitude
             lon: Longitude
             distance: Search distance in miles (default: 25)
             
         Returns:
-            List of SourceData objects
+            List of Observation records
         """
         distance = kwargs.get('distance', 25)
         
-        params = {
-            'latitude': lat,
-            'longitude': lon,
-            'distance': distance,
-        }
+        raw_data = self._station_payload(lat, lon)
         
-        raw_data = self._make_request('observation/latLong/current/', params=params)
+        if raw_data is None:
+            params = {
+                'latitude': lat,
+                'longitude': lon,
+                'distance': distance,
+            }
+            raw_data = self._make_request('observation/latLong/current/', params=params)
+            if raw_data:
+                self._learn_station(lat, lon, self._reporting_area_of(raw_data), raw_data)
         
         if not raw_data:
             return []
         
         return self.normalize_data(raw_data, lat, lon)
     
+    @staticmethod
+    def _observed_at(observation: Dict) -> Optional[datetime]:
+        """
+        Start of the observation's averaging hour, from DateObserved,
+        HourObserved and LocalTimeZone (the hour is local to the area).
+        """
+        try:
+            observed = datetime.strptime(observation['DateObserved'].strip(), '%Y-%m-%d')
+            observed += timedelta(hours=int(observation.get('HourObserved') or 0))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
+        offset = _LOCAL_TIME_ZONES.get(str(observation.get('LocalTimeZone', '')).strip().upper())
+        if offset is None:
+            return timezone.make_aware(observed)
+        return observed.replace(tzinfo=dt_timezone(timedelta(hours=offset)))
+    
+    @staticmethod
+    def _reporting_area_of(raw_data) -> Optional[Dict]:
+        """The single reporting area an observation response covers, for the station index."""
+        if not isinstance(raw_data, list) or not raw_data:
+            return None
+        areas = {(o.get('StateCode'), o.get('ReportingArea')) for o in raw_data}
+        first = raw_data[0]
+        if len(areas) != 1 or not first.get('ReportingArea'):
+            return None
+        return {
+            'id': f"{first.get('StateCode') or ''}/{first['ReportingArea']}",
+            'lat': first.get('Latitude'),
+            'lon': first.get('Longitude'),
+        }
+    
     def fetch_forecast(self, lat: float, lon: float, **kwargs) -> List[Dict]:
         """
         Fetch AQI forecast for coordinates.
@@ -90,9 +136,9 @@ class AirNowAdapter(BaseAdapter):
         
         return self._normalize_forecast(raw_data, lat, lon)
     
-    def normalize_data(self, raw_data: Dict, query_lat: float, query_lon: float) -> List[SourceData]:
+    def normalize_data(self, raw_data: Dict, query_lat: float, query_lon: float) -> List[Observation]:
         """
-        Normalize AirNow response to SourceData objects.
+        Normalize AirNow response to Observation records.
         
         AirNow returns a list of observations, one per pollutant.
         We need to group by station and combine pollutants.
@@ -113,7 +159,7 @@ class AirNowAdapter(BaseAdapter):
                     'lon': observation.get('Longitude'),
                     'aqi': None,
                     'pollutants': {},
-                    'timestamp': observation.get('DateObserved'),
+                    'timestamp': self._observed_at(observation),
                 }
             
             # Get pollutant data
@@ -143,18 +189,11 @@ class AirNowAdapter(BaseAdapter):
                 if current_aqi is None or aqi_value > current_aqi:
                     stations[area_name]['aqi'] = aqi_value
         
-        # Convert to SourceData objects
+        # Convert to Observation records
         source_data_list = []
         
         for station in stations.values():
-            # Parse timestamp
-            try:
-                timestamp_str = f"{station['timestamp']} 00:00:00"
-                timestamp = timezone.make_aware(
-                    datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-                )
-            except Exception:
-                timestamp = timezone.now()
+            timestamp = station['timestamp'] or timezone.now()
             
             # Calculate distance
             if station['lat'] and station['lon']:
@@ -165,7 +204,7 @@ class AirNowAdapter(BaseAdapter):
             else:
                 distance = None
             
-            source_data = SourceData(
+            source_data = Observation(
                 source=self.SOURCE_CODE,
                 lat=station['lat'] or query_lat,
                 lon=station['lon'] or query_lon,
@@ -201,6 +240,7 @@ class AirNowAdapter(BaseAdapter):
                     'aqi': item.get('AQI'),
                     'category': item.get('Category', {}).get('Name'),
                     'source': self.SOURCE_CODE,
+                    'period_hours': 24,  # One AQI per forecast day
                     'location': item.get('ReportingArea'),
                 })
             except Exception as e:
@@ -3,13 +3,13 @@ AirVisual (IQAir) adapter for global air quality data.
 """
 import logging
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from django.utils import timezone
 from apps.core.utils import calculate_distance_km
 
 from .base import BaseAdapter
-from .models import SourceData
+from .observation import Observation
 
 logger = logging.getLogger(__name__)
 
@@ -25,39 +25,77 @@ class AirVisualAdapter(BaseAdapter):
     API_BASE_URL = "https://api.airvisual.com/v2/"
     REQUIRES_API_KEY = True
     QUALITY_LEVEL = "model"
+    STATION_UPDATE_INTERVAL = 3600  # City readings update hourly
     
     def _add_api_key(self, params: Dict, headers: Dict):
         """AirVisual uses 'key' parameter."""
         if self.api_key:
             params['key'] = self.api_key
     
-    def fetch_current(self, lat: float, lon: float, **kwargs) -> List[SourceData]:
+    def fetch_current(self, lat: float, lon: float, **kwargs) -> List[Observation]:
         """
         Fetch current air quality data for nearest city.
         
+        Points whose city is already known are served from the city's
+        cached reading, or its city endpoint.
+        
         Args:
             lat: Latitude
             lon: Longitude
             
         Returns:
-            List of SourceData objects
+            List of Observation records
         """
-        # AirVisual API uses nearest_city endpoint with coordinates
-        params = {
-            'lat': lat,
-            'lon': lon,
-        }
+        raw_data = self._station_payload(lat, lon, self._fetch_city)
         
-        raw_data = self._make_request('nearest_city', params=params)
+        if raw_data is None:
+            # AirVisual API uses nearest_city endpoint with coordinates
+            params = {
+                'lat': lat,
+                'lon': lon,
+            }
+            raw_data = self._make_request('nearest_city', params=params)
+            if raw_data and raw_data.get('status') == 'success':
+                self._learn_station(lat, lon, self._city_of(raw_data), raw_data)
         
         if not raw_data or raw_data.get('status') != 'success':
             return []
         
         return self.normalize_data(raw_data, lat, lon)
     
-    def normalize_data(self, raw_data: Dict, query_lat: float, query_lon: float) -> List[SourceData]:
+    def _fetch_city(self, station: Dict) -> Optional[Dict]:
+        """Current reading of a known city."""
+        params = {
+            'city': station['city'],
+            'state': station['state'],
+            'country': station['country'],
+        }
+        raw_data = self._make_request('city', params=params)
+        if not raw_data or raw_data.get('status') != 'success':
+            return None
+        return raw_data
+    
+    @staticmethod
+    def _city_of(raw_data: Dict) -> Optional[Dict]:
+        """The city a nearest_city response resolved to, for the station index."""
+        data = raw_data.get('data')
+        if not isinstance(data, dict) or not all(data.get(k) for k in ('city', 'state', 'country')):
+            return None
+        coordinates = (data.get('location') or {}).get('coordinates') or []
+        if len(coordinates) != 2:
+            return None
+        return {
+            'id': f"{data['country']}/{data['state']}/{data['city']}",
+            'lat': coordinates[1],
+            'lon': coordinates[0],
+            'city': data['city'],
+            'state': data['state'],
+            'country': data['country'],
+        }
+    
+    def normalize_data(self, raw_data: Dict, query_lat: float, query_lon: float) -> List[Observation]:
         """
-        Normalize AirVisual response to SourceData objects.
+        Normalize AirVisual response to Observation records.
         """
         if 'data' not in raw_data:
             return []
@@ -111,7 +149,7 @@ class AirVisualAdapter(BaseAdapter):
             # other sources.
             pollutants = {}
 
-            source_data = SourceData(
+            source_data = Observation(
                 source=self.SOURCE_CODE,
                 lat=station_lat,
                 lon=station_lon,
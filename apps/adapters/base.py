@@ -7,15 +7,25 @@ import threading
 import time
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Tuple
 
 import requests
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
 
-from .models import SourceData, RawAPIResponse, AdapterStatus
+from apps.core import metrics
+from apps.core.cache import ResponseCache
+from apps.core.freshness import expires_in
+from . import retry
+from .batching import get_batcher
+from .http_cache import HTTPCache
+from .quota import get_quota
+from .stations import create_station_index
+from .streaming import JSONArrayStream
+from .models import RawAPIResponse, AdapterStatus
+from .observation import Observation
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +78,178 @@ class CircuitBreaker:
                 self._state = self.OPEN
 
 
+class SharedCircuitBreaker(CircuitBreaker):
+    """
+    Circuit breaker whose state is shared by every worker through the cache
+    backend (Redis in production).
+
+    On top of the consecutive-failure count it keeps sliding-window
+    success/failure counters (in fixed-size time buckets) so the breaker can
+    also trip on failure *rate*, and it coordinates HALF_OPEN so that only a
+    single probe request is sent across the whole fleet.
+
+    The in-memory state of the parent class is always kept up to date, so if
+    the cache backend is unreachable the breaker silently degrades to the
+    local per-process behaviour.
+
+    Keys (all under ``cb:<name>``):
+      open      – present while OPEN; expires after recovery_timeout
+      tripped   – present from trip until the breaker closes (OPEN or HALF_OPEN)
+      probe     – HALF_OPEN probe lock, claimed with cache.add()
+      consec    – consecutive failure counter
+      ok:<n>, fail:<n> – per-bucket counters for the sliding window
+    """
+
+    def __init__(
+        self,
+        name,
+        failure_threshold=5,
+        recovery_timeout=60,
+        window_seconds=60,
+        bucket_seconds=10,
+        failure_rate_threshold=0.5,
+        min_requests=10,
+        probe_timeout=30,
+    ):
+        super().__init__(failure_threshold=failure_threshold, recovery_timeout=recovery_timeout)
+        self.name = name
+        self.window_seconds = window_seconds
+        self.bucket_seconds = max(1, bucket_seconds)
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_requests = min_requests
+        self.probe_timeout = probe_timeout
+        self._shared_available = True
+        # Whether this worker claimed the HALF_OPEN probe lock
+        self._probing = False
+
+    # -- key helpers ---------------------------------------------------------
+
+    def _key(self, suffix: str) -> str:
+        return f"cb:{self.name}:{suffix}"
+
+    def _current_bucket(self) -> int:
+        return int(time.time() // self.bucket_seconds)
+
+    def _window_buckets(self) -> List[int]:
+        current = self._current_bucket()
+        count = max(1, -(-self.window_seconds // self.bucket_seconds))
+        return [current - i for i in range(count)]
+
+    def _incr(self, key: str, timeout) -> int:
+        cache.add(key, 0, timeout=timeout)
+        return cache.incr(key)
+
+    def _mark_unavailable(self, error: Exception):
+        if self._shared_available:
+            logger.warning(
+                f"Shared circuit breaker '{self.name}' unavailable, using local state: {error}"
+            )
+        self._shared_available = False
+
+    # -- shared state --------------------------------------------------------
+
+    def _shared_state(self) -> Optional[str]:
+        """Read the fleet-wide state, or None if the cache backend failed."""
+        try:
+            flags = cache.get_many([self._key('open'), self._key('tripped')])
+        except Exception as e:
+            self._mark_unavailable(e)
+            return None
+        self._shared_available = True
+        if self._key('open') in flags:
+            return self.OPEN
+        if self._key('tripped') in flags:
+            return self.HALF_OPEN
+        return self.CLOSED
+
+    def _failure_rate_exceeded(self) -> bool:
+        counts = cache.get_many(self._window_keys())
+        failures = sum(v for k, v in counts.items() if ':fail:' in k)
+        total = sum(counts.values())
+        if total < self.min_requests:
+            return False
+        return failures / total >= self.failure_rate_threshold
+
+    def _window_keys(self) -> List[str]:
+        buckets = self._window_buckets()
+        return [self._key(f'ok:{b}') for b in buckets] + [self._key(f'fail:{b}') for b in buckets]
+
+    def _trip(self):
+        cache.set(self._key('open'), 1, timeout=self.recovery_timeout)
+        cache.set(self._key('tripped'), 1, timeout=None)
+        cache.delete(self._key('probe'))
+        logger.warning(f"Shared circuit breaker '{self.name}' OPEN")
+
+    # -- CircuitBreaker interface ---------------------------------------------
+
+    @property
+    def state(self):
+        shared = self._shared_state()
+        if shared is None:
+            return super().state
+        return shared
+
+    def allow_request(self) -> bool:
+        """
+        Return True if the request should proceed.
+
+        In HALF_OPEN only the worker that claims the probe lock may proceed.
+        """
+        shared = self._shared_state()
+        if shared is None:
+            return super().allow_request()
+        if shared == self.OPEN:
+            return False
+        if shared == self.HALF_OPEN:
+            try:
+                self._probing = bool(cache.add(self._key('probe'), 1, timeout=self.probe_timeout))
+                return self._probing
+            except Exception as e:
+                self._mark_unavailable(e)
+                return super().allow_request()
+        return True
+
+    def record_success(self):
+        """
+        Count a success. The breaker closes on the probe's success, or on
+        any success once it is no longer OPEN; a late success of a request
+        sent before the trip leaves it OPEN so HALF_OPEN still probes.
+        """
+        super().record_success()
+        probing, self._probing = self._probing, False
+        bucket_ttl = self.window_seconds + self.bucket_seconds
+        try:
+            shared = self._shared_state()
+            # The probe lock is gone if the breaker re-tripped meanwhile
+            holds_probe = probing and cache.get(self._key('probe')) is not None
+            if shared == self.HALF_OPEN or holds_probe:
+                # Closing: failures from before the trip no longer count
+                cache.delete_many(
+                    [self._key('consec'), self._key('tripped'), self._key('probe')] + self._window_keys()
+                )
+            elif shared == self.CLOSED:
+                cache.delete(self._key('consec'))
+            self._incr(self._key(f'ok:{self._current_bucket()}'), bucket_ttl)
+        except Exception as e:
+            self._mark_unavailable(e)
+
+    def record_failure(self):
+        super().record_failure()
+        self._probing = False
+        bucket_ttl = self.window_seconds + self.bucket_seconds
+        try:
+            consecutive = self._incr(self._key('consec'), self.window_seconds)
+            self._incr(self._key(f'fail:{self._current_bucket()}'), bucket_ttl)
+            if (
+                self._shared_state() == self.HALF_OPEN
+                or consecutive >= self.failure_threshold
+                or self._failure_rate_exceeded()
+            ):
+                self._trip()
+        except Exception as e:
+            self._mark_unavailable(e)
+
+
 class BaseAdapter(ABC):
     """
     Abstract base class for all data source adapters.
@@ -85,6 +267,33 @@ class BaseAdapter(ABC):
     CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5
     CIRCUIT_BREAKER_RECOVERY_TIMEOUT = 60  # seconds
 
+    # HTTP cache: serve identical GETs for at least this long, even when the
+    # upstream sends no cache headers (0 = rely on upstream headers only)
+    HTTP_CACHE_MIN_FRESHNESS = 0
+
+    # Native grid resolution (degrees) of a gridded model source. Query points
+    # are snapped to it before calling upstream so nearby users share calls and
+    # cache entries. None = station data; send the true point.
+    GRID_RESOLUTION_DEG = None
+
+    # Seconds to remember that a cell has no data from this source, so it is
+    # not called again meanwhile (None = CACHE_SETTINGS NEGATIVE_CACHE_TTL,
+    # 0 = never)
+    NEGATIVE_CACHE_TTL = None
+
+    # Seconds between upstream updates of a nearest-station source's
+    # readings. Set by sources that resolve a point to a station, city or
+    # reporting area: the mapping is learned and the station's payload cached
+    # for every cell it serves until the source's next expected update
+    # (PUBLISH_SCHEDULES), or this long without a schedule (see stations.py).
+    # None = no stations.
+    STATION_UPDATE_INTERVAL = None
+
+    # Whether the upstream takes comma-separated latitude/longitude lists and
+    # answers with a list of per-location objects, so concurrent single-point
+    # calls can be batched (_make_location_request)
+    SUPPORTS_MULTI_LOCATION = False
+
     def __init__(self):
         if not all([self.SOURCE_NAME, self.SOURCE_CODE, self.API_BASE_URL]):
             raise ValueError("Adapter must define SOURCE_NAME, SOURCE_CODE, and API_BASE_URL")
@@ -92,7 +301,134 @@ class BaseAdapter(ABC):
         self.settings = settings.AIR_QUALITY_SETTINGS
         self.api_key = self._get_api_key()
         self.session = self._create_session()
-        self.circuit_breaker = CircuitBreaker(
+        self.circuit_breaker = self._create_circuit_breaker()
+        self.retry_policy = retry.RetryPolicy(
+            max_retries=self.settings.get('MAX_RETRIES', 3),
+            backoff_factor=self.settings.get('RETRY_BACKOFF_FACTOR', 2),
+            max_backoff=self.settings.get('RETRY_MAX_BACKOFF', 8),
+        )
+        self.retry_budget = retry.get_retry_budget(
+            self.SOURCE_CODE,
+            ratio=self.settings.get('RETRY_BUDGET_RATIO', 0.1),
+            min_per_second=self.settings.get('RETRY_BUDGET_MIN_PER_SECOND', 0.1),
+        )
+        # Quotas belong to the API key, so adapters sharing a key share a quota
+        self.quota = get_quota(self.API_KEY_SETTINGS_NAME or self.SOURCE_CODE)
+        self.http_cache = self._create_http_cache()
+        self.negative_cache = self._create_negative_cache()
+        self.stations = create_station_index(self.SOURCE_CODE, self.STATION_UPDATE_INTERVAL)
+        # Whether the last _make_request got a valid answer (see record_no_data)
+        self.last_request_ok = False
+        # Whether it went upstream rather than being answered from a cache,
+        # i.e. whether its duration is an upstream latency
+        self.last_request_upstream = False
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """
+        Stop work whose result is no longer wanted (e.g. a hedged request that
+        lost its race): new calls return None and calls in flight stop
+        retrying. The request already on the wire runs to completion.
+        """
+        self._cancelled.set()
+
+    def _create_http_cache(self) -> Optional[HTTPCache]:
+        """Create the upstream response cache, or None if disabled."""
+        if not getattr(settings, 'HTTP_CACHE_SETTINGS', {}).get('ENABLED', False):
+            return None
+        return HTTPCache(self.SOURCE_CODE, min_freshness=self.HTTP_CACHE_MIN_FRESHNESS)
+
+    def _create_negative_cache(self) -> Optional[ResponseCache]:
+        """Create the per-cell "no data" cache, or None if disabled."""
+        cache_settings = getattr(settings, 'CACHE_SETTINGS', {})
+        ttl = self.NEGATIVE_CACHE_TTL
+        if ttl is None:
+            ttl = cache_settings.get('NEGATIVE_CACHE_TTL', 0)
+        if not ttl:
+            return None
+        return ResponseCache(
+            namespace='neg',
+            default_ttl=ttl,
+            geohash_precision=cache_settings.get('GEOHASH_PRECISION', 6),
+        )
+
+    def has_no_data(self, lat: float, lon: float, *variant) -> bool:
+        """Whether this source recently had no data for the cell (skip calling it)."""
+        if self.negative_cache is None:
+            return False
+        if self.negative_cache.get_raw(lat, lon, self.SOURCE_CODE, *variant) is None:
+            return False
+        metrics.increment(self.SOURCE_CODE, 'negative_cache_hits')
+        return True
+
+    def record_no_data(self, lat: float, lon: float, *variant) -> bool:
+        """
+        Remember that the cell has no data from this source.
+
+        Only an empty answer to a successful request counts; failures are
+        not remembered. Returns whether the entry was stored.
+        """
+        if self.negative_cache is None or not self.last_request_ok:
+            return False
+        return self.negative_cache.set_raw(lat, lon, 1, self.SOURCE_CODE, *variant)
+
+    def _station_payload(
+        self, lat: float, lon: float, fetch_by_station: Optional[Callable[[Dict], object]] = None
+    ):
+        """
+        Upstream payload for a point from the station it is known to map to.
+
+        Serves the station's cached payload, else calls fetch_by_station
+        (a cheap by-ID request) if the source has one and caches its
+        result. None when the point's station is unknown or has no payload;
+        the caller then resolves the point upstream and calls _learn_station.
+        """
+        if self.stations is None:
+            return None
+        station = self.stations.lookup(lat, lon)
+        if station is None:
+            return None
+
+        payload = self.stations.get_data(station['id'])
+        if payload is not None:
+            metrics.increment(self.SOURCE_CODE, 'station_cache_hits')
+            self.last_request_ok = True
+            self.last_request_upstream = False
+            return payload
+        if fetch_by_station is None:
+            return None
+
+        payload = fetch_by_station(station)
+        if payload is not None:
+            metrics.increment(self.SOURCE_CODE, 'station_lookups')
+            self.stations.set_data(station['id'], payload, ttl=self._station_data_ttl())
+        return payload
+
+    def _learn_station(self, lat: float, lon: float, station: Optional[Dict], payload):
+        """Remember which station answered for a point, and its payload."""
+        if self.stations is None or not station or not self.stations.remember(lat, lon, station):
+            return
+        self.stations.set_data(station['id'], payload, ttl=self._station_data_ttl())
+
+    def _station_data_ttl(self) -> int:
+        """Seconds until the source is next expected to publish station readings."""
+        return expires_in(self.SOURCE_CODE, default=self.STATION_UPDATE_INTERVAL)
+
+    def _create_circuit_breaker(self) -> CircuitBreaker:
+        """Create a fleet-wide breaker if enabled in settings, else a local one."""
+        cb_settings = getattr(settings, 'CIRCUIT_BREAKER_SETTINGS', {})
+        if cb_settings.get('SHARED', False):
+            return SharedCircuitBreaker(
+                name=self.SOURCE_CODE,
+                failure_threshold=self.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                recovery_timeout=self.CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
+                window_seconds=cb_settings.get('WINDOW_SECONDS', 60),
+                bucket_seconds=cb_settings.get('BUCKET_SECONDS', 10),
+                failure_rate_threshold=cb_settings.get('FAILURE_RATE_THRESHOLD', 0.5),
+                min_requests=cb_settings.get('MIN_REQUESTS', 10),
+                probe_timeout=cb_settings.get('PROBE_TIMEOUT', 30),
+            )
+        return CircuitBreaker(
             failure_threshold=self.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
             recovery_timeout=self.CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
         )
@@ -114,94 +450,325 @@ class BaseAdapter(ABC):
         return api_key
     
     def _create_session(self) -> requests.Session:
-        """Create requests session with retry logic."""
+        """
+        Create requests session.
+
+        Transport-level retries are disabled; retries are handled by
+        _send_with_retries so they respect the retry budget and deadline.
+        """
         session = requests.Session()
-        
-        # Configure retry strategy
-        retry_strategy = Retry(
-            total=self.settings.get('MAX_RETRIES', 3),
-            backoff_factor=self.settings.get('RETRY_BACKOFF_FACTOR', 2),
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET", "POST"]  # Updated from method_whitelist
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+
+        adapter = HTTPAdapter(max_retries=0)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
-        
+
         return session
+
+    # Minimum time worth starting another attempt with (seconds)
+    _MIN_ATTEMPT_SECONDS = 1.0
+
+    def _send_with_retries(
+        self,
+        method: str,
+        url: str,
+        params: Dict,
+        headers: Dict,
+        deadline_at: float,
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        Send a request, retrying transient failures within budget and deadline.
+
+        Returns the last response (which may still be an error status) or
+        re-raises the last connection error/timeout.
+        """
+        timeout = self.settings.get('REQUEST_TIMEOUT', 10)
+        self.retry_budget.record_request()
+        metrics.increment(self.SOURCE_CODE, 'requests')
+
+        attempt = 0
+        while True:
+            remaining = deadline_at - time.monotonic()
+            response = None
+            error = None
+            try:
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    headers=headers,
+                    timeout=max(0.1, min(timeout, remaining)),
+                    stream=stream,
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+
+            if attempt >= self.retry_policy.max_retries or self._cancelled.is_set():
+                break
+            if not self.retry_policy.is_retryable(response=response, error=error):
+                break
+
+            # Retry-After wins over our own backoff; give up if it can't be met
+            remaining = deadline_at - time.monotonic() - self._MIN_ATTEMPT_SECONDS
+            delay = self.retry_policy.retry_after(response)
+            if delay is not None:
+                if delay > remaining:
+                    metrics.increment(self.SOURCE_CODE, 'retries_deadline_exceeded')
+                    break
+                metrics.increment(self.SOURCE_CODE, 'retry_after_honoured')
+            else:
+                if remaining <= 0:
+                    metrics.increment(self.SOURCE_CODE, 'retries_deadline_exceeded')
+                    break
+                delay = min(self.retry_policy.backoff(attempt), remaining)
+
+            if not self.retry_budget.try_spend():
+                metrics.increment(self.SOURCE_CODE, 'retries_budget_exhausted')
+                logger.info(f"{self.SOURCE_NAME} retry budget exhausted – not retrying")
+                break
+            if not self._acquire_quota():
+                break
+
+            metrics.increment(self.SOURCE_CODE, 'retries')
+            if response is not None:
+                response.close()
+            retry._sleep(delay)
+            attempt += 1
+
+        if error is not None:
+            raise error
+        return response
     
+    def _snap_coordinates(self, lat: float, lon: float) -> Tuple[float, float]:
+        """
+        Snap coordinates to the adapter's model grid for upstream calls.
+
+        Only the upstream request uses the snapped point; distances and
+        location metadata are still computed from the true point.
+        """
+        resolution = self.GRID_RESOLUTION_DEG
+        if not resolution or not getattr(settings, 'CACHE_SETTINGS', {}).get('SNAP_TO_MODEL_GRID', True):
+            return lat, lon
+        return (
+            round(round(float(lat) / resolution) * resolution, 6),
+            round(round(float(lon) / resolution) * resolution, 6),
+        )
+
+    def _make_location_request(self, endpoint: str, params: Dict) -> Optional[Dict]:
+        """
+        _make_request for one point given by params' latitude/longitude.
+
+        For sources with SUPPORTS_MULTI_LOCATION, concurrent calls with the
+        same other params are sent upstream as one multi-location request
+        (see batching.MicroBatcher) and each caller gets its own object.
+        Points with a fresh HTTP cache entry are answered without joining
+        a batch.
+        """
+        batcher = get_batcher(self.SOURCE_CODE) if self.SUPPORTS_MULTI_LOCATION else None
+        if batcher is None:
+            return self._make_request(endpoint, params=params)
+
+        self.last_request_upstream = False
+        cached = self._fresh_cached(self._http_cache_key(endpoint, params))
+        if cached is not None:
+            metrics.increment(self.SOURCE_CODE, 'http_cache_hits')
+            self.last_request_ok = True
+            return cached.data
+
+        shared = {k: v for k, v in params.items() if k not in ('latitude', 'longitude')}
+        data = batcher.submit(
+            group=(endpoint, tuple(sorted(shared.items()))),
+            coordinate=(params['latitude'], params['longitude']),
+            fetch_many=lambda coordinates: self._fetch_locations(endpoint, shared, coordinates),
+            timeout=self.settings.get('REQUEST_DEADLINE', 12) + batcher.window,
+        )
+        # Only the batch leader's adapter made the upstream call (and set
+        # last_request_upstream); followers' waits are not upstream latencies
+        self.last_request_ok = data is not None
+        return data
+
+    def _fetch_locations(self, endpoint: str, shared: Dict, coordinates) -> Optional[List[Dict]]:
+        """One upstream call for a batch of points; one object per point, or None."""
+        if len(coordinates) == 1:
+            (lat, lon), = coordinates
+            data = self._make_request(endpoint, params={'latitude': lat, 'longitude': lon, **shared})
+            return None if data is None else [data]
+
+        params = {
+            'latitude': ','.join(str(lat) for lat, _ in coordinates),
+            'longitude': ','.join(str(lon) for _, lon in coordinates),
+            **shared,
+        }
+        data = self._make_request(endpoint, params=params)
+        if data is None:
+            return None
+        if not isinstance(data, list) or len(data) != len(coordinates):
+            logger.warning(
+                f"{self.SOURCE_NAME} returned an unexpected body for {len(coordinates)} locations"
+            )
+            return None
+        metrics.increment(self.SOURCE_CODE, 'batched_locations', len(coordinates))
+        if self.http_cache is not None:
+            # Later single-point calls for these points are then cache hits
+            self.http_cache.store_items(self._http_cache_key(endpoint, params), [
+                self._http_cache_key(endpoint, {'latitude': lat, 'longitude': lon, **shared})
+                for lat, lon in coordinates
+            ])
+        return data
+
+    def _http_cache_key(self, endpoint: str, params: Dict) -> Optional[str]:
+        """HTTP cache key of a GET as _make_request builds it, or None without a cache."""
+        if self.http_cache is None:
+            return None
+        url = f"{self.API_BASE_URL.rstrip('/')}/{endpoint.lstrip('/')}"
+        return self.http_cache.make_key('GET', url, self._redact_params(params))
+
+    def _http_cache_min_freshness(self, params: Dict) -> int:
+        """Freshness floor for a GET's response; override for per-request floors."""
+        return self.HTTP_CACHE_MIN_FRESHNESS
+
+    def _fresh_cached(self, cache_key: Optional[str]):
+        """The HTTP cache entry under cache_key if it is fresh, else None."""
+        if cache_key is None:
+            return None
+        cached = self.http_cache.get(cache_key)
+        return cached if cached is not None and cached.is_fresh else None
+
     def _make_request(
         self,
         endpoint: str,
         params: Dict = None,
         headers: Dict = None,
-        method: str = 'GET'
+        method: str = 'GET',
+        deadline: float = None,
+        stream_array: str = None,
+        consume: Callable[[JSONArrayStream], object] = None,
     ) -> Optional[Dict]:
         """
-        Make HTTP request with circuit breaker, error handling, and logging.
+        Make HTTP request with circuit breaker, retries, error handling, and logging.
 
         Args:
             endpoint: API endpoint path
             params: Query parameters
             headers: HTTP headers
             method: HTTP method
+            deadline: Total seconds available for this call including
+                retries (defaults to settings REQUEST_DEADLINE)
+            stream_array: Top-level array key to stream (with consume)
+            consume: Called with a JSONArrayStream over `stream_array`; its
+                return value is returned instead of the parsed body. Large
+                responses are then parsed incrementally, never as a whole.
 
         Returns:
-            Response data as dict or None on error
+            Response data as dict (or consume's result), or None on error
         """
+        url = f"{self.API_BASE_URL.rstrip('/')}/{endpoint.lstrip('/')}"
+        params = params or {}
+        headers = headers or {}
+        self.last_request_ok = False
+        self.last_request_upstream = False
+
+        # HTTP cache – fresh entries are served without spending quota or
+        # touching the breaker; stale ones with validators are revalidated.
+        cache_key = None
+        cached = None
+        if self.http_cache is not None and method.upper() == 'GET' and consume is None:
+            cache_key = self._http_cache_key(endpoint, params)
+            cached = self.http_cache.get(cache_key)
+            if cached is not None:
+                if cached.is_fresh:
+                    metrics.increment(self.SOURCE_CODE, 'http_cache_hits')
+                    self.last_request_ok = True
+                    return cached.data
+                headers.update(cached.conditional_headers())
+
+        if self._cancelled.is_set():
+            return None
+
+        # Quota check – don't spend upstream calls we are not allowed.
+        # Running out of quota is not an upstream failure, so the breaker
+        # is left untouched.
+        if not self._acquire_quota():
+            logger.warning(f"{self.SOURCE_NAME} quota exhausted – skipping request to {endpoint}")
+            return None
+
         # Circuit breaker check – fail fast if API is known to be down
         if not self.circuit_breaker.allow_request():
             logger.warning(
                 f"{self.SOURCE_NAME} circuit breaker OPEN – skipping request to {endpoint}"
             )
+            if self.quota is not None:
+                self.quota.refund()
             return None
 
-        url = f"{self.API_BASE_URL.rstrip('/')}/{endpoint.lstrip('/')}"
-        params = params or {}
-        headers = headers or {}
-
         start_time = time.time()
+        if deadline is None:
+            deadline = self.settings.get('REQUEST_DEADLINE', 12)
+        deadline_at = time.monotonic() + deadline
 
         try:
             # Add API key to request
             self._add_api_key(params, headers)
 
-            # Make request
-            timeout = self.settings.get('REQUEST_TIMEOUT', 10)
-            response = self.session.request(
-                method=method,
-                url=url,
-                params=params,
-                headers=headers,
-                timeout=timeout
+            # Make request (retries are bounded by budget and deadline)
+            self.last_request_upstream = True
+            response = self._send_with_retries(
+                method, url, params, headers, deadline_at, stream=consume is not None
             )
 
             response_time_ms = int((time.time() - start_time) * 1000)
-
-            # Log raw response (with sensitive params redacted)
-            self._log_response(
-                endpoint=endpoint,
-                params=self._redact_params(params),
-                response=response,
-                response_time_ms=response_time_ms
-            )
+            log_kwargs = {
+                'endpoint': endpoint,
+                'params': self._redact_params(params),  # sensitive params redacted
+                'response': response,
+                'response_time_ms': response_time_ms,
+            }
+
+            # Not modified – serve and refresh the stored copy
+            if response.status_code == 304 and cached is not None:
+                self._log_response(**log_kwargs, data={})
+                self.http_cache.refresh(cache_key, cached, response, self._http_cache_min_freshness(params))
+                metrics.increment(self.SOURCE_CODE, 'http_cache_revalidated')
+                self.circuit_breaker.record_success()
+                self._update_status(success=True)
+                self.last_request_ok = True
+                return cached.data
 
             # Check response
+            if response.status_code >= 400:
+                self._log_response(**log_kwargs)
             response.raise_for_status()
 
-            # Parse JSON safely
+            # Parse JSON safely (streamed into the consumer when requested)
             try:
-                data = response.json()
+                if consume is not None:
+                    stream = self._open_stream(response, stream_array)
+                    try:
+                        data = consume(stream)
+                    finally:
+                        response.close()
+                    logged = {**stream.meta, 'rows_streamed': stream.rows}
+                else:
+                    data = logged = response.json()
             except (json.JSONDecodeError, ValueError) as e:
                 logger.error(f"{self.SOURCE_NAME} returned invalid JSON from {endpoint}: {e}")
+                self._log_response(**log_kwargs, data=None if consume is None else {})
                 self.circuit_breaker.record_failure()
                 self._update_status(success=False, error_message=f"Invalid JSON: {e}")
                 return None
 
+            # Log the already-parsed body rather than parsing it again
+            self._log_response(**log_kwargs, data=logged)
+
+            if cache_key is not None:
+                self.http_cache.store(
+                    cache_key, response, data, min_freshness=self._http_cache_min_freshness(params)
+                )
+
             # Success – record in circuit breaker and adapter status
             self.circuit_breaker.record_success()
             self._update_status(success=True)
+            self.last_request_ok = True
 
             return data
 
@@ -227,6 +794,29 @@ class BaseAdapter(ABC):
 
             return None
 
+    def _open_stream(self, response: requests.Response, array_key: str) -> JSONArrayStream:
+        """
+        Wrap a response body for row-by-row consumption.
+
+        Bodies known to be small are parsed in one go (faster); anything
+        larger or of unknown size is decoded incrementally.
+        """
+        threshold = self.settings.get('STREAMING_THRESHOLD_BYTES', 256 * 1024)
+        length = response.headers.get('Content-Length')
+        if isinstance(length, str) and length.isdigit() and int(length) < threshold:
+            return JSONArrayStream.from_parsed(response.json(), array_key)
+        return JSONArrayStream(response.iter_content(chunk_size=64 * 1024), array_key)
+
+    def _acquire_quota(self) -> bool:
+        """Consume quota for one upstream call. Always True without a quota."""
+        if self.quota is None:
+            return True
+        if self.quota.try_acquire():
+            metrics.increment(self.SOURCE_CODE, 'quota_used', self.quota.cost_per_call)
+            return True
+        metrics.increment(self.SOURCE_CODE, 'quota_exhausted')
+        return False
+
     # Keys that should be redacted from logged params
     _SENSITIVE_PARAM_KEYS = frozenset({
         'api_key', 'API_KEY', 'key', 'token', 'appid', 'apikey',
@@ -265,15 +855,23 @@ class BaseAdapter(ABC):
         params: Dict, 
         response: Optional[requests.Response],
         response_time_ms: int,
-        error: str = None
+        error: str = None,
+        data: Dict = None,
     ):
-        """Log API response to database."""
+        """
+        Log API response to database.
+
+        Pass `data` when the body has already been parsed (or streamed) so
+        it is not parsed a second time.
+        """
         try:
             status_code = response.status_code if response else 0
             is_error = bool(error) or (status_code >= 400)
             
             response_data = {}
-            if response:
+            if data is not None:
+                response_data = data
+            elif response:
                 try:
                     response_data = response.json()
                 except Exception:
@@ -332,9 +930,9 @@ class BaseAdapter(ABC):
         except Exception as e:
             logger.error(f"Failed to update adapter status: {e}")
     
-    def normalize_data(self, raw_data: Dict, query_lat: float, query_lon: float) -> List[SourceData]:
+    def normalize_data(self, raw_data: Dict, query_lat: float, query_lon: float) -> List[Observation]:
         """
-        Normalize raw API response to SourceData objects.
+        Normalize raw API response to Observation records.
         Must be implemented by subclasses.
         
         Args:
@@ -343,12 +941,12 @@ class BaseAdapter(ABC):
             query_lon: Query longitude
             
         Returns:
-            List of SourceData objects (not saved to DB)
+            List of Observation records (use to_model() to persist)
         """
         raise NotImplementedError("Subclasses must implement normalize_data()")
     
     @abstractmethod
-    def fetch_current(self, lat: float, lon: float, **kwargs) -> List[SourceData]:
+    def fetch_current(self, lat: float, lon: float, **kwargs) -> List[Observation]:
         """
         Fetch current air quality data for coordinates.
         Must be implemented by subclasses.
@@ -359,7 +957,7 @@ class BaseAdapter(ABC):
             **kwargs: Additional adapter-specific parameters
             
         Returns:
-            List of SourceData objects
+            List of Observation records
         """
         pass
     
@@ -379,8 +977,9 @@ class BaseAdapter(ABC):
     
     def is_available(self) -> bool:
         """Check if adapter is available and healthy."""
-        # Fail fast if circuit breaker is open
-        if not self.circuit_breaker.allow_request():
+        # Fail fast if circuit breaker is open (checked via state so that a
+        # health check never consumes the shared HALF_OPEN probe)
+        if self.circuit_breaker.state == CircuitBreaker.OPEN:
             return False
 
         if not self.REQUIRES_API_KEY:
@@ -0,0 +1,132 @@
+"""
+Micro-batching of upstream calls across concurrent requests.
+
+Open-Meteo's forecast and air-quality endpoints accept comma-separated
+latitude/longitude lists and answer with one object per location. When
+several requests in this process miss the cache at the same time (a cold
+start, a burst over many cells), the first caller for a given query opens
+a batch, waits up to BATCH_SETTINGS WINDOW_MS for others to join (or until
+MAX_LOCATIONS points have) and sends one upstream call for all of them.
+Every caller then gets its own location's object back.
+
+Batches are per process; only callers with identical non-coordinate
+parameters share one.
+"""
+import logging
+import threading
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+Coordinate = Tuple[float, float]
+
+
+class _Batch:
+    """Coordinates collected for one upstream call and its outcome."""
+
+    def __init__(self):
+        self.coordinates: List[Coordinate] = []
+        self.positions: Dict[Coordinate, int] = {}
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.results: Optional[List] = None
+
+    def add(self, coordinate: Coordinate) -> int:
+        """Position of a coordinate in the batch (repeated points share one)."""
+        position = self.positions.get(coordinate)
+        if position is None:
+            position = self.positions[coordinate] = len(self.coordinates)
+            self.coordinates.append(coordinate)
+        return position
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-location calls into multi-location ones.
+
+    The first caller of a group becomes the batch leader: it waits for the
+    window to pass (or the batch to fill), closes the batch and calls
+    fetch_many with every coordinate. The others block until the leader
+    is done. A failed batch call gives every caller None, as a failed
+    single call would.
+    """
+
+    def __init__(self, window: float, max_size: int):
+        self.window = window
+        self.max_size = max(1, max_size)
+        self._open: Dict[Hashable, _Batch] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        group: Hashable,
+        coordinate: Coordinate,
+        fetch_many: Callable[[Sequence[Coordinate]], Optional[List]],
+        timeout: float,
+    ):
+        """
+        Result for one coordinate, fetched together with concurrent calls.
+
+        Args:
+            group: Identifies the upstream query apart from its coordinates;
+                only calls with equal groups are batched together
+            coordinate: (lat, lon) to fetch
+            fetch_many: Called by the leader with the batch's coordinates;
+                returns one result per coordinate in the same order, or None
+            timeout: Longest a caller waits for the leader's call
+
+        Returns:
+            This coordinate's result, or None
+        """
+        with self._lock:
+            batch = self._open.get(group)
+            leader = batch is None
+            if leader:
+                batch = self._open[group] = _Batch()
+            position = batch.add(coordinate)
+            if len(batch.coordinates) >= self.max_size:
+                # Full: the next caller starts a new batch
+                del self._open[group]
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                if self._open.get(group) is batch:
+                    del self._open[group]
+            try:
+                results = fetch_many(batch.coordinates)
+                if results is not None and len(results) == len(batch.coordinates):
+                    batch.results = results
+            finally:
+                batch.done.set()
+        elif not batch.done.wait(timeout):
+            logger.warning(f"Batched upstream call did not finish within {timeout}s")
+            return None
+
+        return batch.results[position] if batch.results is not None else None
+
+
+_batchers: Dict[Tuple, MicroBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(source: str) -> Optional[MicroBatcher]:
+    """
+    Return the process-wide batcher for a source, or None if batching is off.
+
+    Configured by settings.BATCH_SETTINGS (ENABLED, WINDOW_MS, MAX_LOCATIONS).
+    """
+    batch_settings = getattr(settings, 'BATCH_SETTINGS', {})
+    window_ms = batch_settings.get('WINDOW_MS', 5)
+    max_size = batch_settings.get('MAX_LOCATIONS', 50)
+    if not batch_settings.get('ENABLED', False) or window_ms <= 0 or max_size <= 1:
+        return None
+    key = (source, window_ms, max_size)
+    with _batchers_lock:
+        batcher = _batchers.get(key)
+        if batcher is None:
+            batcher = _batchers[key] = MicroBatcher(window_ms / 1000, max_size)
+        return batcher
@@ -0,0 +1,201 @@
+"""
+HTTP-level cache for upstream GET requests.
+
+Stores parsed upstream responses in the shared Django cache (Redis in
+production), keyed on the normalized URL and params with credentials
+redacted, so identical upstream calls from any worker are answered locally.
+
+Freshness follows the upstream's Cache-Control / Expires headers, raised to
+the adapter's minimum freshness (HTTP_CACHE_MIN_FRESHNESS). Entries with an
+ETag or Last-Modified validator are kept past expiry so the next call can be
+a conditional request; a 304 then refreshes the stored entry.
+"""
+import hashlib
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+_MAX_AGE_RE = re.compile(r'(?:^|,)\s*(s-maxage|max-age)\s*=\s*"?(\d+)"?', re.IGNORECASE)
+
+
+@dataclass
+class CachedResponse:
+    """A stored upstream response."""
+    data: object
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Validator headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+def _header(response, name: str) -> Optional[str]:
+    value = response.headers.get(name)
+    return value if isinstance(value, str) and value else None
+
+
+def _directives(response) -> set:
+    cache_control = (_header(response, 'Cache-Control') or '').lower()
+    return {d.strip().split('=')[0] for d in cache_control.split(',') if d.strip()}
+
+
+def freshness_lifetime(response) -> Optional[int]:
+    """
+    Seconds the response may be served without revalidation, per its headers.
+
+    Returns None when the response must not be stored (no-store/private),
+    0 when it must be revalidated (no-cache), or when headers say nothing.
+    """
+    directives = _directives(response)
+    if 'no-store' in directives or 'private' in directives:
+        return None
+    if 'no-cache' in directives:
+        return 0
+
+    cache_control = (_header(response, 'Cache-Control') or '').lower()
+
+    max_ages = dict((k.lower(), int(v)) for k, v in _MAX_AGE_RE.findall(cache_control))
+    if max_ages:
+        lifetime = max_ages.get('s-maxage', max_ages.get('max-age'))
+    else:
+        expires = _header(response, 'Expires')
+        if not expires:
+            return 0
+        try:
+            lifetime = int(parsedate_to_datetime(expires).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return 0
+
+    age = _header(response, 'Age')
+    if age and age.isdigit():
+        lifetime -= int(age)
+    return max(0, lifetime)
+
+
+class HTTPCache:
+    """
+    Per-source store for upstream responses.
+
+    Args:
+        source: Source code used in cache keys
+        min_freshness: Lower bound (seconds) on freshness for stored responses
+    """
+
+    def __init__(self, source: str, min_freshness: int = 0):
+        cache_settings = getattr(settings, 'HTTP_CACHE_SETTINGS', {})
+        self.source = source
+        self.min_freshness = min_freshness
+        self.max_ttl = cache_settings.get('MAX_TTL', 86400)
+        self.stale_retention = cache_settings.get('STALE_RETENTION', 3600)
+
+    def make_key(self, method: str, url: str, params: Dict) -> str:
+        """Build a key from method, URL and sorted (already redacted) params."""
+        query = urlencode(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        digest = hashlib.sha1(f"{method.upper()} {url}?{query}".encode()).hexdigest()
+        return f"http:{self.source}:{digest}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return the stored entry (fresh or stale), or None."""
+        try:
+            raw = cache.get(key)
+            if raw is None:
+                return None
+            return CachedResponse(**json.loads(raw))
+        except Exception as e:
+            logger.warning(f"HTTP cache read failed ({self.source}): {e}")
+            return None
+
+    def store(
+        self,
+        key: str,
+        response,
+        data,
+        previous: Optional[CachedResponse] = None,
+        min_freshness: Optional[int] = None,
+    ) -> bool:
+        """
+        Store a parsed response according to its cache headers.
+
+        `previous` supplies validators when re-storing after a 304 that
+        omitted them. `min_freshness` replaces the source's floor for this
+        response. Returns False if the response is not cacheable or the
+        write failed.
+        """
+        lifetime = freshness_lifetime(response)
+        if lifetime is None:
+            return False
+        if min_freshness is None:
+            min_freshness = self.min_freshness
+        # The adapter's minimum freshness never overrides an explicit no-cache
+        if 'no-cache' not in _directives(response):
+            lifetime = max(lifetime, min_freshness)
+        lifetime = min(lifetime, self.max_ttl)
+
+        etag = _header(response, 'ETag') or (previous.etag if previous else None)
+        last_modified = _header(response, 'Last-Modified') or (previous.last_modified if previous else None)
+        has_validator = bool(etag or last_modified)
+        if lifetime <= 0 and not has_validator:
+            return False
+
+        entry = CachedResponse(
+            data=data,
+            expires_at=time.time() + lifetime,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        ttl = lifetime + (self.stale_retention if has_validator else 0)
+        try:
+            cache.set(key, json.dumps(entry.__dict__), timeout=ttl)
+            return True
+        except Exception as e:
+            logger.warning(f"HTTP cache write failed ({self.source}): {e}")
+            return False
+
+    def refresh(self, key: str, entry: CachedResponse, response, min_freshness: Optional[int] = None) -> bool:
+        """Re-store an entry after a 304 Not Modified, using the new headers."""
+        return self.store(key, response, entry.data, previous=entry, min_freshness=min_freshness)
+
+    def store_items(self, key: str, item_keys: List[str]) -> bool:
+        """
+        Store each element of the list entry under key as its own entry
+        (e.g. a multi-location answer under each single-location request's
+        key), fresh for as long as the list is. Validators belong to the
+        combined request and are not copied.
+        """
+        entry = self.get(key)
+        if entry is None or not isinstance(entry.data, list) or len(entry.data) != len(item_keys):
+            return False
+        ttl = int(entry.expires_at - time.time())
+        if ttl <= 0:
+            return False
+        items = {
+            item_key: json.dumps(CachedResponse(data=item, expires_at=entry.expires_at).__dict__)
+            for item_key, item in zip(item_keys, entry.data)
+        }
+        try:
+            cache.set_many(items, timeout=ttl)
+            return True
+        except Exception as e:
+            logger.warning(f"HTTP cache write failed ({self.source}): {e}")
+            return False
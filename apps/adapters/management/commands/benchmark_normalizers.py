@@ -0,0 +1,166 @@
+"""
+Management command to benchmark the Open-Meteo response normalizers.
+
+Usage:
+    python manage.py benchmark_normalizers
+    python manage.py benchmark_normalizers --fetch --lat 34.05 --lon -118.24
+    python manage.py benchmark_normalizers --weather-file forecast.json --aq-file aq.json
+
+Without options a synthetic 16-day response is used. --fetch captures real
+16-day responses from Open-Meteo once and benchmarks against those.
+"""
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.adapters.open_meteo import (
+    OpenMeteoWeatherAdapter, WMO_WEATHER_CODES,
+    _CURRENT_FIELDS as WEATHER_CURRENT_FIELDS,
+    _HOURLY_FIELDS as WEATHER_HOURLY_FIELDS,
+    _DAILY_FIELDS as WEATHER_DAILY_FIELDS,
+)
+from apps.adapters.open_meteo_air_quality import OpenMeteoAirQualityAdapter
+
+FORECAST_DAYS = 16
+
+
+def synthetic_weather_response(days: int = FORECAST_DAYS, seed: int = 0) -> dict:
+    """Build a response shaped like Open-Meteo /forecast for `days` days."""
+    rng = random.Random(seed)
+    start = datetime(2025, 6, 1)
+    hours = [start + timedelta(hours=h) for h in range(days * 24)]
+    codes = list(WMO_WEATHER_CODES)
+
+    def series(n, low, high, digits=1, gaps=True):
+        return [
+            None if gaps and rng.random() < 0.01 else round(rng.uniform(low, high), digits)
+            for _ in range(n)
+        ]
+
+    hourly = {'time': [h.strftime('%Y-%m-%dT%H:%M') for h in hours]}
+    for field in WEATHER_HOURLY_FIELDS:
+        if field == 'weather_code':
+            hourly[field] = [rng.choice(codes) for _ in hours]
+        elif field == 'is_day':
+            hourly[field] = [1 if 6 <= h.hour < 20 else 0 for h in hours]
+        else:
+            hourly[field] = series(len(hours), 0, 100)
+
+    dates = [(start + timedelta(days=d)).date() for d in range(days)]
+    daily = {'time': [d.isoformat() for d in dates]}
+    for field in WEATHER_DAILY_FIELDS:
+        if field == 'weather_code':
+            daily[field] = [rng.choice(codes) for _ in dates]
+        else:
+            daily[field] = series(len(dates), 0, 40, gaps=False)
+
+    current = {'time': hourly['time'][0], 'weather_code': 2, 'is_day': 1}
+    for field in WEATHER_CURRENT_FIELDS:
+        current.setdefault(field, round(rng.uniform(0, 40), 1))
+
+    return {'timezone': 'America/Los_Angeles', 'current': current, 'hourly': hourly, 'daily': daily}
+
+
+def synthetic_aq_response(days: int = FORECAST_DAYS, seed: int = 0) -> dict:
+    """Build a response shaped like Open-Meteo /air-quality for `days` days."""
+    rng = random.Random(seed)
+    start = datetime(2025, 6, 1)
+    times = [(start + timedelta(hours=h)).strftime('%Y-%m-%dT%H:%M') for h in range(days * 24)]
+    hourly = {'time': times}
+    for field in OpenMeteoAirQualityAdapter._HOURLY_FIELDS:
+        hourly[field] = [
+            None if rng.random() < 0.01 else round(rng.uniform(0, 300), 1) for _ in times
+        ]
+    current = {field: round(rng.uniform(0, 120), 1) for field in OpenMeteoAirQualityAdapter._CURRENT_FIELDS}
+    return {'current': current, 'hourly': hourly}
+
+
+class Command(BaseCommand):
+    help = 'Benchmark Open-Meteo weather and air quality normalization'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--weather-file', help='Captured /forecast JSON response')
+        parser.add_argument('--aq-file', help='Captured /air-quality JSON response')
+        parser.add_argument('--fetch', action='store_true',
+                            help='Capture live 16-day responses from Open-Meteo first')
+        parser.add_argument('--lat', type=float, default=34.05)
+        parser.add_argument('--lon', type=float, default=-118.24)
+        parser.add_argument('--iterations', type=int, default=200)
+
+    def handle(self, *args, **options):
+        weather_adapter = OpenMeteoWeatherAdapter()
+        aq_adapter = OpenMeteoAirQualityAdapter()
+        lat, lon = options['lat'], options['lon']
+
+        if options['fetch']:
+            weather_raw, aq_raw = self._fetch(weather_adapter, aq_adapter, lat, lon)
+        else:
+            weather_raw = self._load(options['weather_file']) or synthetic_weather_response()
+            aq_raw = self._load(options['aq_file']) or synthetic_aq_response()
+
+        iterations = options['iterations']
+        self._report(
+            'weather', len(weather_raw.get('hourly', {}).get('time', [])),
+            self._time(lambda: weather_adapter._normalize(weather_raw, lat, lon), iterations),
+        )
+        self._report(
+            'air quality', len(aq_raw.get('hourly', {}).get('time', [])),
+            self._time(lambda: aq_adapter._normalize(aq_raw), iterations),
+        )
+
+    def _load(self, path):
+        if not path:
+            return None
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Could not read {path}: {e}')
+
+    def _fetch(self, weather_adapter, aq_adapter, lat, lon):
+        """Fetch raw 16-day responses using the adapters' own request params."""
+        captured = {}
+
+        def capture(adapter, name):
+            # Every call must reach _make_request and upstream: no HTTP cache
+            # hit (possibly of shorter-range params) and no batching
+            adapter.http_cache = None
+            adapter.SUPPORTS_MULTI_LOCATION = False
+            original = adapter._make_request
+
+            def _make_request(endpoint, params=None, **kwargs):
+                params = {**(params or {}), 'forecast_days': FORECAST_DAYS}
+                captured[name] = original(endpoint, params=params, **kwargs)
+                return None
+            adapter._make_request = _make_request
+
+        capture(weather_adapter, 'weather')
+        capture(aq_adapter, 'aq')
+        weather_adapter.fetch_current(lat, lon)
+        aq_adapter.fetch_current(lat, lon)
+        if not captured.get('weather') or not captured.get('aq'):
+            raise CommandError('Open-Meteo request failed; see logs')
+        return captured['weather'], captured['aq']
+
+    @staticmethod
+    def _time(func, iterations):
+        func()  # warm-up
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - start) * 1000)
+        return samples
+
+    def _report(self, name, hours, samples):
+        samples.sort()
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        self.stdout.write(
+            f'{name:<12} {hours:>4} hours  '
+            f'median {statistics.median(samples):.3f} ms  p95 {p95:.3f} ms  '
+            f'({len(samples)} runs)'
+        )
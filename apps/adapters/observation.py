@@ -0,0 +1,38 @@
+"""
+In-flight air quality observations.
+
+Adapters return Observation records and FusionEngine blends them. They are
+plain slotted dataclasses rather than unsaved SourceData model instances,
+which avoids Django model __init__, per-instance _state and __dict__ on every
+reading of every request. Use to_model() when a reading should be persisted.
+"""
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Dict, Optional
+
+from .models import SourceData
+
+
+@dataclass(slots=True)
+class Observation:
+    """
+    One normalized reading from an air quality source.
+
+    Field names match SourceData so either can be passed to the fusion
+    engine.
+    """
+    source: str
+    lat: float
+    lon: float
+    timestamp: datetime
+    aqi: Optional[int]
+    pollutants: Dict[str, float] = field(default_factory=dict)
+    quality_level: str = ''
+    distance_km: Optional[float] = None
+    confidence_score: Optional[float] = None
+    station_id: str = ''
+    station_name: str = ''
+
+    def to_model(self) -> SourceData:
+        """Build an unsaved SourceData instance for persistence."""
+        return SourceData(**{f.name: getattr(self, f.name) for f in fields(self)})
@@ -3,13 +3,15 @@ Open-Meteo adapter for weather data (primary provider).
 Free, no API key required, global coverage, 16-day forecast.
 """
 import logging
-from datetime import datetime, date as date_type
+from datetime import datetime, date as date_type, timedelta, timezone as dt_timezone, tzinfo
 from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from django.utils import timezone
 
 from .base import BaseAdapter
-from apps.weather.astronomy import compute_moon_phase, compute_golden_hour
+from apps.core.freshness import next_update
+from apps.weather.astronomy import compute_moon_phase, compute_sun_events
 
 logger = logging.getLogger(__name__)
 
@@ -47,23 +49,116 @@ WMO_WEATHER_CODES = {
 }
 
 
+# Night variants for the clear / partly-cloudy icons
+_NIGHT_ICONS = {
+    'clear-day': 'clear-night',
+    'partly-cloudy-day': 'partly-cloudy-night',
+}
+
+_UNKNOWN_WEATHER = ('Unknown', 'unknown')
+
+# (code, is_day) -> (description, icon), precomputed so normalizers decode
+# hundreds of hourly codes with a single dict lookup each
+_WEATHER_LOOKUP = {
+    (code, is_day): (info['description'], info['icon'] if is_day else _NIGHT_ICONS.get(info['icon'], info['icon']))
+    for code, info in WMO_WEATHER_CODES.items()
+    for is_day in (0, 1)
+}
+
+
+def _lookup_weather(code: Optional[int], is_day) -> tuple:
+    """Return (description, icon) for a WMO code and day/night flag."""
+    try:
+        return _WEATHER_LOOKUP.get((code, 1 if is_day else 0), _UNKNOWN_WEATHER)
+    except TypeError:
+        return _UNKNOWN_WEATHER
+
+
 def _decode_weather_code(code: Optional[int], is_day: int = 1) -> Dict:
     """Convert WMO weather code to description and icon.
 
     Handles day/night icon variants for codes 0-2 (clear/partly cloudy).
     """
-    if code is None:
-        return {'description': 'Unknown', 'icon': 'unknown'}
-    info = WMO_WEATHER_CODES.get(code, {'description': 'Unknown', 'icon': 'unknown'})
-    icon = info['icon']
-    # Swap day→night icons when is_day == 0
-    if not is_day:
-        night_map = {
-            'clear-day': 'clear-night',
-            'partly-cloudy-day': 'partly-cloudy-night',
-        }
-        icon = night_map.get(icon, icon)
-    return {'description': info['description'], 'icon': icon}
+    description, icon = _lookup_weather(code, is_day)
+    return {'description': description, 'icon': icon}
+
+
+def columns(raw: Dict, fields, length: int) -> List[list]:
+    """
+    Return each field's array from an Open-Meteo block cut or padded to `length`.
+
+    Missing fields and short arrays are padded with None, so the result can
+    be transposed with zip() instead of bounds-checking every cell.
+    """
+    result = []
+    for field in fields:
+        values = raw.get(field) or []
+        if len(values) >= length:
+            result.append(values[:length])
+        else:
+            result.append(list(values) + [None] * (length - len(values)))
+    return result
+
+
+_CURRENT_FIELDS = [
+    'temperature_2m', 'relative_humidity_2m', 'apparent_temperature',
+    'precipitation', 'weather_code', 'cloud_cover', 'pressure_msl',
+    'surface_pressure', 'wind_speed_10m', 'wind_direction_10m',
+    'wind_gusts_10m', 'is_day',
+]
+
+_HOURLY_FIELDS = [
+    'temperature_2m', 'relative_humidity_2m', 'dew_point_2m',
+    'apparent_temperature', 'precipitation', 'precipitation_probability',
+    'rain', 'showers', 'snowfall', 'weather_code', 'cloud_cover',
+    'visibility', 'wind_speed_10m', 'wind_direction_10m',
+    'wind_gusts_10m', 'is_day', 'uv_index',
+]
+
+_DAILY_FIELDS = [
+    'weather_code', 'temperature_2m_max', 'temperature_2m_min',
+    'apparent_temperature_max', 'apparent_temperature_min',
+    'uv_index_max',
+    'precipitation_sum', 'precipitation_probability_max',
+    'wind_speed_10m_max', 'wind_gusts_10m_max',
+    'wind_direction_10m_dominant',
+]
+
+# Column order consumed by the normalizer (see _normalize)
+_HOURLY_ROW_FIELDS = (
+    'temperature_2m', 'apparent_temperature', 'dew_point_2m', 'relative_humidity_2m',
+    'precipitation', 'precipitation_probability', 'weather_code', 'cloud_cover',
+    'visibility', 'wind_speed_10m', 'wind_direction_10m', 'wind_gusts_10m',
+    'is_day', 'uv_index',
+)
+
+_DAILY_ROW_FIELDS = (
+    'weather_code', 'temperature_2m_max', 'temperature_2m_min',
+    'apparent_temperature_max', 'apparent_temperature_min',
+    'precipitation_sum', 'precipitation_probability_max',
+    'wind_speed_10m_max', 'wind_gusts_10m_max', 'wind_direction_10m_dominant',
+    'uv_index_max',
+)
+
+
+def _parse_date(value) -> Optional[date_type]:
+    """Parse an ISO date string (None if invalid)."""
+    try:
+        return date_type.fromisoformat(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _resolve_timezone(raw_data: Dict) -> tzinfo:
+    """
+    Timezone of an Open-Meteo response: the IANA name when known,
+    otherwise the fixed offset it reports (UTC if neither is usable).
+    """
+    try:
+        return ZoneInfo(raw_data.get('timezone') or 'UTC')
+    except (ZoneInfoNotFoundError, ValueError):
+        offset = raw_data.get('utc_offset_seconds') or 0
+        return dt_timezone(timedelta(seconds=offset))
 
 
 class OpenMeteoWeatherAdapter(BaseAdapter):
@@ -76,11 +171,29 @@ class OpenMeteoWeatherAdapter(BaseAdapter):
     SOURCE_CODE = "OPEN_METEO"
     API_BASE_URL = "https://api.open-meteo.com/v1/"
     REQUIRES_API_KEY = False
+    # Current conditions update every 15 minutes; identical requests can share a response
+    HTTP_CACHE_MIN_FRESHNESS = 900
+    # Finest regional models behind best_match are ~2 km
+    GRID_RESOLUTION_DEG = 0.02
+    # Accepts latitude/longitude lists; concurrent misses share one call
+    SUPPORTS_MULTI_LOCATION = True
 
     def _add_api_key(self, params: Dict, headers: Dict):
         """No API key needed for Open-Meteo."""
         pass
 
+    def _http_cache_min_freshness(self, params: Dict) -> int:
+        """
+        Current-only requests (fetch_conditions) are fresh only until the
+        next 15-minute update, so a refresh is not served the old conditions.
+        """
+        if 'hourly' in params or 'daily' in params:
+            return self.HTTP_CACHE_MIN_FRESHNESS
+        expected = next_update(self.SOURCE_CODE)
+        if expected is None:
+            return self.HTTP_CACHE_MIN_FRESHNESS
+        return max(0, min(int(expected - timezone.now().timestamp()), self.HTTP_CACHE_MIN_FRESHNESS))
+
     def fetch_current(self, lat: float, lon: float, **kwargs) -> Optional[Dict]:
         """
         Fetch current weather and 10-day daily forecast in a single call.
@@ -89,41 +202,56 @@ class OpenMeteoWeatherAdapter(BaseAdapter):
             Dict with 'current' and 'daily_forecast' keys, or None on error.
         """
         forecast_days = kwargs.get('forecast_days', 10)
+        grid_lat, grid_lon = self._snap_coordinates(lat, lon)
 
         params = {
-            'latitude': lat,
-            'longitude': lon,
-            'current': ','.join([
-                'temperature_2m', 'relative_humidity_2m', 'apparent_temperature',
-                'precipitation', 'weather_code', 'cloud_cover', 'pressure_msl',
-                'surface_pressure', 'wind_speed_10m', 'wind_direction_10m',
-                'wind_gusts_10m', 'is_day',
-            ]),
-            'hourly': ','.join([
-                'temperature_2m', 'relative_humidity_2m', 'dew_point_2m',
-                'apparent_temperature', 'precipitation', 'precipitation_probability',
-                'rain', 'showers', 'snowfall', 'weather_code', 'cloud_cover',
-                'visibility', 'wind_speed_10m', 'wind_direction_10m',
-                'wind_gusts_10m', 'is_day', 'uv_index',
-            ]),
-            'daily': ','.join([
-                'weather_code', 'temperature_2m_max', 'temperature_2m_min',
-                'apparent_temperature_max', 'apparent_temperature_min',
-                'sunrise', 'sunset', 'uv_index_max',
-                'precipitation_sum', 'precipitation_probability_max',
-                'wind_speed_10m_max', 'wind_gusts_10m_max',
-                'wind_direction_10m_dominant',
-            ]),
+            'latitude': grid_lat,
+            'longitude': grid_lon,
+            'current': ','.join(_CURRENT_FIELDS),
+            'hourly': ','.join(_HOURLY_FIELDS),
+            'daily': ','.join(_DAILY_FIELDS),
             'forecast_days': forecast_days,
             'timezone': 'auto',
         }
 
-        raw_data = self._make_request('forecast', params=params)
+        raw_data = self._make_location_request('forecast', params)
         if not raw_data:
             return None
 
         return self._normalize(raw_data, lat, lon)
 
+    def fetch_conditions(self, lat: float, lon: float) -> Optional[Dict]:
+        """
+        Fetch current conditions only, without the hourly and daily blocks.
+
+        For refreshing current conditions more often than the forecast.
+
+        Returns:
+            fetch_current's 'current' dict, or None on error. Its uv_index is
+            None: Open-Meteo's comes from the daily forecast.
+        """
+        grid_lat, grid_lon = self._snap_coordinates(lat, lon)
+
+        params = {
+            'latitude': grid_lat,
+            'longitude': grid_lon,
+            'current': ','.join(_CURRENT_FIELDS),
+            'timezone': 'auto',
+        }
+
+        raw_data = self._make_location_request('forecast', params)
+        if not raw_data:
+            return None
+
+        current = self._normalize_current(raw_data.get('current', {}))
+        # Today's sun events, which _normalize takes from the first forecast day
+        today = _parse_date((current['observation_time'] or '')[:10])
+        if today is not None:
+            events = compute_sun_events(lat, lon, [today], _resolve_timezone(raw_data))[0]
+            current['sunrise'] = events['sunrise']
+            current['sunset'] = events['sunset']
+        return current
+
     def fetch_forecast(self, lat: float, lon: float, **kwargs) -> Optional[List[Dict]]:
         """Fetch daily forecast only."""
         result = self.fetch_current(lat, lon, **kwargs)
@@ -133,81 +261,57 @@ class OpenMeteoWeatherAdapter(BaseAdapter):
 
     def _normalize(self, raw_data: Dict, lat: float, lon: float) -> Dict:
         """Normalize Open-Meteo response to unified weather schema."""
-        current_raw = raw_data.get('current', {})
         daily_raw = raw_data.get('daily', {})
         tz_name = raw_data.get('timezone', 'UTC')
 
-        # Parse current conditions
-        current_code = current_raw.get('weather_code')
-        is_day = current_raw.get('is_day', 1)
-        weather_info = _decode_weather_code(current_code, is_day=is_day)
+        current = self._normalize_current(raw_data.get('current', {}))
 
-        current = {
-            'temperature': current_raw.get('temperature_2m'),
-            'feels_like': current_raw.get('apparent_temperature'),
-            'dew_point': self._calculate_dew_point(
-                current_raw.get('temperature_2m'),
-                current_raw.get('relative_humidity_2m'),
-            ),
-            'humidity': current_raw.get('relative_humidity_2m'),
-            'pressure': current_raw.get('pressure_msl'),
-            'visibility': None,  # Open-Meteo current doesn't include visibility
-            'cloud_cover': current_raw.get('cloud_cover'),
-            'uv_index': None,  # Only in daily
-            'wind_speed': current_raw.get('wind_speed_10m'),
-            'wind_direction': current_raw.get('wind_direction_10m'),
-            'wind_gusts': current_raw.get('wind_gusts_10m'),
-            'weather_code': current_code,
-            'weather_description': weather_info['description'],
-            'weather_icon': weather_info['icon'],
-            'sunrise': None,
-            'sunset': None,
-            'observation_time': current_raw.get('time'),
-        }
-
-        # Get today's sunrise/sunset and UV from daily data
-        if daily_raw.get('sunrise') and len(daily_raw['sunrise']) > 0:
-            current['sunrise'] = daily_raw['sunrise'][0]
-        if daily_raw.get('sunset') and len(daily_raw['sunset']) > 0:
-            current['sunset'] = daily_raw['sunset'][0]
         if daily_raw.get('uv_index_max') and len(daily_raw['uv_index_max']) > 0:
             current['uv_index'] = daily_raw['uv_index_max'][0]
 
-        # Parse daily forecast
-        daily_forecast = []
+        # Sun events for every forecast date in one pass (computed locally,
+        # not requested from Open-Meteo)
         dates = daily_raw.get('time', [])
-        for i, date_str in enumerate(dates):
-            day_code = self._safe_index(daily_raw.get('weather_code', []), i)
-            day_weather = _decode_weather_code(day_code, is_day=1)
-            day_sunrise = self._safe_index(daily_raw.get('sunrise', []), i)
-            day_sunset = self._safe_index(daily_raw.get('sunset', []), i)
-
-            # Compute moon phase from date
-            try:
-                d = date_type.fromisoformat(date_str)
-                moon_phase = compute_moon_phase(d)
-            except (ValueError, TypeError):
-                moon_phase = None
+        parsed_dates = [_parse_date(date_str) for date_str in dates]
+        valid_dates = [d for d in parsed_dates if d is not None]
+        sun_events = dict(zip(valid_dates, compute_sun_events(
+            lat, lon, valid_dates, _resolve_timezone(raw_data),
+        )))
+
+        # Today's sunrise/sunset
+        if valid_dates:
+            current['sunrise'] = sun_events[valid_dates[0]]['sunrise']
+            current['sunset'] = sun_events[valid_dates[0]]['sunset']
+
+        # Parse daily forecast (columns transposed once, not indexed per cell)
+        daily_forecast = []
+        for (date_str, d, day_code, temp_high, temp_low, feels_like_high, feels_like_low,
+             precipitation_sum, precipitation_probability, wind_speed_max, wind_gusts_max,
+             wind_direction_dominant, uv_index_max) in zip(
+                dates, parsed_dates, *columns(daily_raw, _DAILY_ROW_FIELDS, len(dates))):
+            events = sun_events.get(d, {})
+            description, icon = _lookup_weather(day_code, 1)
 
             daily_forecast.append({
                 'date': date_str,
-                'temp_high': self._safe_index(daily_raw.get('temperature_2m_max', []), i),
-                'temp_low': self._safe_index(daily_raw.get('temperature_2m_min', []), i),
-                'feels_like_high': self._safe_index(daily_raw.get('apparent_temperature_max', []), i),
-                'feels_like_low': self._safe_index(daily_raw.get('apparent_temperature_min', []), i),
+                'temp_high': temp_high,
+                'temp_low': temp_low,
+                'feels_like_high': feels_like_high,
+                'feels_like_low': feels_like_low,
                 'weather_code': day_code,
-                'weather_description': day_weather['description'],
-                'weather_icon': day_weather['icon'],
-                'precipitation_sum': self._safe_index(daily_raw.get('precipitation_sum', []), i),
-                'precipitation_probability': self._safe_index(daily_raw.get('precipitation_probability_max', []), i),
-                'wind_speed_max': self._safe_index(daily_raw.get('wind_speed_10m_max', []), i),
-                'wind_gusts_max': self._safe_index(daily_raw.get('wind_gusts_10m_max', []), i),
-                'wind_direction_dominant': self._safe_index(daily_raw.get('wind_direction_10m_dominant', []), i),
-                'uv_index_max': self._safe_index(daily_raw.get('uv_index_max', []), i),
-                'sunrise': day_sunrise,
-                'sunset': day_sunset,
-                'moon_phase': moon_phase,
-                'golden_hour': compute_golden_hour(day_sunrise, day_sunset),
+                'weather_description': description,
+                'weather_icon': icon,
+                'precipitation_sum': precipitation_sum,
+                'precipitation_probability': precipitation_probability,
+                'wind_speed_max': wind_speed_max,
+                'wind_gusts_max': wind_gusts_max,
+                'wind_direction_dominant': wind_direction_dominant,
+                'uv_index_max': uv_index_max,
+                'sunrise': events.get('sunrise'),
+                'sunset': events.get('sunset'),
+                'moon_phase': compute_moon_phase(d) if d is not None else None,
+                'golden_hour': events.get('golden_hour'),
+                'blue_hour': events.get('blue_hour'),
             })
 
         # Parse hourly forecast (limit to 48 hours for today + tomorrow)
@@ -215,29 +319,31 @@ class OpenMeteoWeatherAdapter(BaseAdapter):
         hourly_forecast = []
         hourly_times = hourly_raw.get('time', [])
         max_hourly = min(len(hourly_times), 48)
-        for i in range(max_hourly):
-            h_code = self._safe_index(hourly_raw.get('weather_code', []), i)
-            h_is_day = self._safe_index(hourly_raw.get('is_day', []), i) or 0
-            h_weather = _decode_weather_code(h_code, is_day=h_is_day)
+        for (h_time, temperature, feels_like, dew_point, humidity, precipitation,
+             precipitation_probability, h_code, cloud_cover, visibility, wind_speed,
+             wind_direction, wind_gusts, h_is_day, uv_index) in zip(
+                hourly_times[:max_hourly], *columns(hourly_raw, _HOURLY_ROW_FIELDS, max_hourly)):
+            h_is_day = h_is_day or 0
+            description, icon = _lookup_weather(h_code, h_is_day)
 
             hourly_forecast.append({
-                'time': hourly_times[i],
-                'temperature': self._safe_index(hourly_raw.get('temperature_2m', []), i),
-                'feels_like': self._safe_index(hourly_raw.get('apparent_temperature', []), i),
-                'dew_point': self._safe_index(hourly_raw.get('dew_point_2m', []), i),
-                'humidity': self._safe_index(hourly_raw.get('relative_humidity_2m', []), i),
-                'precipitation': self._safe_index(hourly_raw.get('precipitation', []), i),
-                'precipitation_probability': self._safe_index(hourly_raw.get('precipitation_probability', []), i),
+                'time': h_time,
+                'temperature': temperature,
+                'feels_like': feels_like,
+                'dew_point': dew_point,
+                'humidity': humidity,
+                'precipitation': precipitation,
+                'precipitation_probability': precipitation_probability,
                 'weather_code': h_code,
-                'weather_description': h_weather['description'],
-                'weather_icon': h_weather['icon'],
-                'cloud_cover': self._safe_index(hourly_raw.get('cloud_cover', []), i),
-                'visibility': self._safe_index(hourly_raw.get('visibility', []), i),
-                'wind_speed': self._safe_index(hourly_raw.get('wind_speed_10m', []), i),
-                'wind_direction': self._safe_index(hourly_raw.get('wind_direction_10m', []), i),
-                'wind_gusts': self._safe_index(hourly_raw.get('wind_gusts_10m', []), i),
+                'weather_description': description,
+                'weather_icon': icon,
+                'cloud_cover': cloud_cover,
+                'visibility': visibility,
+                'wind_speed': wind_speed,
+                'wind_direction': wind_direction,
+                'wind_gusts': wind_gusts,
                 'is_day': h_is_day,
-                'uv_index': self._safe_index(hourly_raw.get('uv_index', []), i),
+                'uv_index': uv_index,
             })
 
         return {
@@ -248,12 +354,35 @@ class OpenMeteoWeatherAdapter(BaseAdapter):
             'timezone': tz_name,
         }
 
-    @staticmethod
-    def _safe_index(lst: list, idx: int):
-        """Safely index into a list, returning None if out of bounds."""
-        if lst and 0 <= idx < len(lst):
-            return lst[idx]
-        return None
+    def _normalize_current(self, current_raw: Dict) -> Dict:
+        """Normalize the `current` block (sunrise and sunset unset, uv_index None)."""
+        # Parse current conditions
+        current_code = current_raw.get('weather_code')
+        is_day = current_raw.get('is_day', 1)
+        weather_info = _decode_weather_code(current_code, is_day=is_day)
+
+        return {
+            'temperature': current_raw.get('temperature_2m'),
+            'feels_like': current_raw.get('apparent_temperature'),
+            'dew_point': self._calculate_dew_point(
+                current_raw.get('temperature_2m'),
+                current_raw.get('relative_humidity_2m'),
+            ),
+            'humidity': current_raw.get('relative_humidity_2m'),
+            'pressure': current_raw.get('pressure_msl'),
+            'visibility': None,  # Open-Meteo current doesn't include visibility
+            'cloud_cover': current_raw.get('cloud_cover'),
+            'uv_index': None,  # Only in daily
+            'wind_speed': current_raw.get('wind_speed_10m'),
+            'wind_direction': current_raw.get('wind_direction_10m'),
+            'wind_gusts': current_raw.get('wind_gusts_10m'),
+            'weather_code': current_code,
+            'weather_description': weather_info['description'],
+            'weather_icon': weather_info['icon'],
+            'sunrise': None,
+            'sunset': None,
+            'observation_time': current_raw.get('time'),
+        }
 
     @staticmethod
     def _calculate_dew_point(temp: Optional[float], humidity: Optional[float]) -> Optional[float]:
@@ -1,11 +1,22 @@
 """
 Open-Meteo Air Quality adapter for pollen data, hourly AQI, and historical AQ.
 Free, no API key required, global coverage.
+
+fetch_combined serves all of these, plus a current Observation for
+fusion, from one upstream call.
 """
 import logging
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone as dt_timezone
 from typing import Dict, List, Optional
 
+from django.utils import timezone
+
+from apps.core.aqi import aqi_from_concentrations, category_name, series_aqi
+
 from .base import BaseAdapter
+from .observation import Observation
+from .open_meteo import columns
 from apps.core.constants import (
     POLLEN_TYPE_GROUPS,
     POLLEN_THRESHOLDS,
@@ -15,32 +26,67 @@ from apps.core.constants import (
 logger = logging.getLogger(__name__)
 
 
+# Category -> (upper bounds, levels) for bisecting POLLEN_THRESHOLDS
+_POLLEN_BOUNDS = {
+    category: (tuple(t for t, _ in thresholds), tuple(level for _, level in thresholds))
+    for category, thresholds in POLLEN_THRESHOLDS.items()
+}
+
+
 def _classify_pollen_level(value: Optional[float], category: str) -> str:
     """Classify a pollen grains/m³ value into a named level."""
     if value is None or value <= 0:
         return 'none'
-    thresholds = POLLEN_THRESHOLDS.get(category, POLLEN_THRESHOLDS['tree'])
-    for threshold, level in thresholds:
-        if value <= threshold:
-            return level
-    return 'very_high'
-
-
-def _aqi_to_category(aqi: Optional[int]) -> str:
-    """Convert US AQI integer to category string."""
-    if aqi is None:
-        return 'unknown'
-    if aqi <= 50:
-        return 'Good'
-    if aqi <= 100:
-        return 'Moderate'
-    if aqi <= 150:
-        return 'Unhealthy for Sensitive Groups'
-    if aqi <= 200:
-        return 'Unhealthy'
-    if aqi <= 300:
-        return 'Very Unhealthy'
-    return 'Hazardous'
+    bounds, levels = _POLLEN_BOUNDS.get(category, _POLLEN_BOUNDS['tree'])
+    i = bisect_left(bounds, value)
+    return levels[i] if i < len(levels) else 'very_high'
+
+
+# Pollen fields flattened in POLLEN_TYPE_GROUPS order, so a row of values
+# can be summarized with precomputed per-category positions
+_POLLEN_FIELDS = tuple(field for fields in POLLEN_TYPE_GROUPS.values() for field in fields)
+_POLLEN_FIELD_NAMES = tuple(POLLEN_DISPLAY_NAMES.get(field, field) for field in _POLLEN_FIELDS)
+_POLLEN_GROUP_POSITIONS = tuple(
+    (category, tuple(_POLLEN_FIELDS.index(field) for field in fields))
+    for category, fields in POLLEN_TYPE_GROUPS.items()
+)
+
+
+def _summarize_pollen(values) -> Dict:
+    """
+    Average and classify pollen per category and find the dominant allergen.
+
+    `values` are ordered as _POLLEN_FIELDS.
+    """
+    result = {}
+    for category, positions in _POLLEN_GROUP_POSITIONS:
+        present = [values[i] for i in positions if values[i] is not None]
+        avg = sum(present) / len(present) if present else 0
+        result[category] = {
+            'level': _classify_pollen_level(avg, category),
+            'value': round(avg, 1),
+        }
+
+    dominant_value = 0
+    dominant_allergen = None
+    for name, val in zip(_POLLEN_FIELD_NAMES, values):
+        if val is not None and val > dominant_value:
+            dominant_value = val
+            dominant_allergen = name
+
+    result['dominant_allergen'] = dominant_allergen
+    return result
+
+
+# Open-Meteo variable -> EPA pollutant key, for sub-index calculations
+_EPA_POLLUTANT_FIELDS = {
+    'pm25': 'pm2_5',
+    'pm10': 'pm10',
+    'o3': 'ozone',
+    'no2': 'nitrogen_dioxide',
+    'so2': 'sulphur_dioxide',
+    'co': 'carbon_monoxide',
+}
 
 
 class OpenMeteoAirQualityAdapter(BaseAdapter):
@@ -55,6 +101,12 @@ class OpenMeteoAirQualityAdapter(BaseAdapter):
     API_BASE_URL = "https://air-quality-api.open-meteo.com/v1/"
     REQUIRES_API_KEY = False
     QUALITY_LEVEL = 'model'
+    # Air quality model output is hourly; identical requests can share a response
+    HTTP_CACHE_MIN_FRESHNESS = 1800
+    # CAMS Europe runs at 0.1° (~11 km); CAMS global is coarser still
+    GRID_RESOLUTION_DEG = 0.1
+    # Accepts latitude/longitude lists; concurrent misses share one call
+    SUPPORTS_MULTI_LOCATION = True
 
     _CURRENT_FIELDS = [
         'us_aqi', 'pm10', 'pm2_5', 'carbon_monoxide', 'nitrogen_dioxide',
@@ -65,6 +117,12 @@ class OpenMeteoAirQualityAdapter(BaseAdapter):
 
     _HOURLY_FIELDS = _CURRENT_FIELDS + ['uv_index']
 
+    # Non-pollen column order consumed by _normalize
+    _HOURLY_ROW_FIELDS = (
+        'us_aqi', 'pm2_5', 'pm10', 'ozone', 'nitrogen_dioxide',
+        'sulphur_dioxide', 'carbon_monoxide', 'uv_index',
+    )
+
     def _add_api_key(self, params: Dict, headers: Dict):
         """No API key needed for Open-Meteo."""
         pass
@@ -76,21 +134,100 @@ class OpenMeteoAirQualityAdapter(BaseAdapter):
         Returns dict with 'current', 'hourly', and 'pollen' sections.
         """
         forecast_days = kwargs.get('forecast_days', 2)
+        raw_data = self._request_hourly(lat, lon, past_days=0, forecast_days=forecast_days)
+        if not raw_data:
+            return None
+
+        return self._normalize(raw_data)
+
+    def fetch_combined(
+        self, lat: float, lon: float, past_days: int = 0, forecast_days: int = 2
+    ) -> Optional[Dict]:
+        """
+        Current, hourly, pollen and historical AQ from a single upstream call.
+
+        The hourly arrays cover `past_days` of history before today plus
+        `forecast_days`; current, pollen and the 48-hour series are derived
+        as in fetch_current and the history as in fetch_historical. Without
+        past_days the upstream call is identical to fetch_current's, so
+        concurrent callers of either share it.
+
+        Returns:
+            fetch_current's dict plus:
+            'historical': fetch_historical's summary (None without past_days)
+            'observation': the current reading as an Observation for
+                FusionEngine.blend (None without a current AQI)
+        """
+        past_days = min(past_days, 92)
+        raw_data = self._request_hourly(lat, lon, past_days=past_days, forecast_days=forecast_days)
+        if not raw_data:
+            return None
+
+        # Hourly arrays start at midnight `past_days` days ago
+        result = self._normalize(raw_data, start_hour=past_days * 24)
+        result['historical'] = (
+            # Past days plus today, as fetch_historical requests them
+            self._summarize_historical(raw_data, past_days, hours=(past_days + 1) * 24)
+            if past_days else None
+        )
+        result['observation'] = self._current_observation(raw_data, result['current'], lat, lon)
+        return result
+
+    def _request_hourly(self, lat: float, lon: float, past_days: int, forecast_days: int) -> Optional[Dict]:
+        """Current conditions and hourly AQ + pollen around today."""
+        grid_lat, grid_lon = self._snap_coordinates(lat, lon)
 
         params = {
-            'latitude': lat,
-            'longitude': lon,
+            'latitude': grid_lat,
+            'longitude': grid_lon,
             'current': ','.join(self._CURRENT_FIELDS),
             'hourly': ','.join(self._HOURLY_FIELDS),
             'forecast_days': forecast_days,
             'timezone': 'auto',
         }
+        if past_days:
+            params['past_days'] = past_days
+
+        return self._make_location_request('air-quality', params)
+
+    def fetch_forecast(self, lat: float, lon: float, **kwargs) -> List[Dict]:
+        """
+        Fetch the hourly AQ forecast in the shape ForecastAggregator blends.
+
+        Times are requested in GMT so they carry no local-offset ambiguity.
+
+        Returns:
+            List of forecast dicts (timestamp, aqi, pollutants, source)
+        """
+        forecast_days = kwargs.get('forecast_days', 5)
+        grid_lat, grid_lon = self._snap_coordinates(lat, lon)
+
+        params = {
+            'latitude': grid_lat,
+            'longitude': grid_lon,
+            'hourly': ','.join(('us_aqi',) + tuple(_EPA_POLLUTANT_FIELDS.values())),
+            'forecast_days': forecast_days,
+            'timezone': 'GMT',
+        }
 
         raw_data = self._make_request('air-quality', params=params)
         if not raw_data:
-            return None
+            return []
 
-        return self._normalize(raw_data)
+        hourly_raw = raw_data.get('hourly', {})
+        times = hourly_raw.get('time', [])
+        keys = tuple(_EPA_POLLUTANT_FIELDS)
+        forecasts = []
+        for h_time, h_aqi, *values in zip(
+                times,
+                *columns(hourly_raw, ('us_aqi',) + tuple(_EPA_POLLUTANT_FIELDS.values()), len(times))):
+            forecasts.append({
+                'timestamp': f"{h_time}:00+00:00",
+                'aqi': h_aqi,
+                'pollutants': dict(zip(keys, values)),
+                'source': self.SOURCE_CODE,
+            })
+        return forecasts
 
     def fetch_historical(self, lat: float, lon: float, past_days: int = 30, **kwargs) -> Optional[Dict]:
         """
@@ -100,10 +237,11 @@ class OpenMeteoAirQualityAdapter(BaseAdapter):
         Returns summary statistics for the historical period.
         """
         past_days = min(past_days, 92)
+        grid_lat, grid_lon = self._snap_coordinates(lat, lon)
 
         params = {
-            'latitude': lat,
-            'longitude': lon,
+            'latitude': grid_lat,
+            'longitude': grid_lon,
             'hourly': 'us_aqi,pm2_5',
             'past_days': past_days,
             'forecast_days': 1,
@@ -116,51 +254,61 @@ class OpenMeteoAirQualityAdapter(BaseAdapter):
 
         return self._summarize_historical(raw_data, past_days)
 
-    def _normalize(self, raw_data: Dict) -> Dict:
-        """Normalize Open-Meteo AQ response."""
+    def _normalize(self, raw_data: Dict, start_hour: int = 0) -> Dict:
+        """
+        Normalize Open-Meteo AQ response.
+
+        The hourly series starts at index `start_hour` of the hourly arrays.
+        """
         current_raw = raw_data.get('current', {})
         hourly_raw = raw_data.get('hourly', {})
+        if start_hour:
+            hourly_raw = {field: values[start_hour:] for field, values in hourly_raw.items()}
 
         # Current AQI and pollutants
         current_aqi = current_raw.get('us_aqi')
+        current_aqi = int(current_aqi) if current_aqi is not None else None
+        pollutants = {key: current_raw.get(field) for key, field in _EPA_POLLUTANT_FIELDS.items()}
         current = {
-            'aqi': int(current_aqi) if current_aqi is not None else None,
-            'aqi_category': _aqi_to_category(int(current_aqi) if current_aqi is not None else None),
-            'pollutants': {
-                'pm25': current_raw.get('pm2_5'),
-                'pm10': current_raw.get('pm10'),
-                'o3': current_raw.get('ozone'),
-                'no2': current_raw.get('nitrogen_dioxide'),
-                'so2': current_raw.get('sulphur_dioxide'),
-                'co': current_raw.get('carbon_monoxide'),
-            },
+            'aqi': current_aqi,
+            'aqi_category': category_name(current_aqi),
+            'pollutants': pollutants,
+            # Concentrations are µg/m³ for all species
+            'dominant_pollutant': aqi_from_concentrations(pollutants, ugm3=True)[1],
         }
 
         # Current pollen
         pollen = self._extract_pollen(current_raw)
 
-        # Hourly data (limit to 48 hours)
+        # Hourly data (limit to 48 hours), transposed once from the columns
         hourly = []
         times = hourly_raw.get('time', [])
         max_hours = min(len(times), 48)
-        for i in range(max_hours):
-            h_aqi = self._safe_index(hourly_raw.get('us_aqi', []), i)
+        pollen_rows = zip(*columns(hourly_raw, _POLLEN_FIELDS, max_hours))
+        _, dominant = series_aqi(
+            {key: hourly_raw.get(field) for key, field in _EPA_POLLUTANT_FIELDS.items()},
+            max_hours, ugm3=True,
+        )
+        for (h_time, h_aqi, pm25, pm10, o3, no2, so2, co, uv_index), pollen_values, h_dominant in zip(
+                zip(times[:max_hours], *columns(hourly_raw, self._HOURLY_ROW_FIELDS, max_hours)),
+                pollen_rows, dominant):
             h_aqi_int = int(h_aqi) if h_aqi is not None else None
 
             hourly.append({
-                'time': times[i],
+                'time': h_time,
                 'aqi': h_aqi_int,
-                'aqi_category': _aqi_to_category(h_aqi_int),
+                'aqi_category': category_name(h_aqi_int),
+                'dominant_pollutant': h_dominant,
                 'pollutants': {
-                    'pm25': self._safe_index(hourly_raw.get('pm2_5', []), i),
-                    'pm10': self._safe_index(hourly_raw.get('pm10', []), i),
-                    'o3': self._safe_index(hourly_raw.get('ozone', []), i),
-                    'no2': self._safe_index(hourly_raw.get('nitrogen_dioxide', []), i),
-                    'so2': self._safe_index(hourly_raw.get('sulphur_dioxide', []), i),
-                    'co': self._safe_index(hourly_raw.get('carbon_monoxide', []), i),
+                    'pm25': pm25,
+                    'pm10': pm10,
+                    'o3': o3,
+                    'no2': no2,
+                    'so2': so2,
+                    'co': co,
                 },
-                'pollen': self._extract_pollen_at_index(hourly_raw, i),
-                'uv_index': self._safe_index(hourly_raw.get('uv_index', []), i),
+                'pollen': _summarize_pollen(pollen_values),
+                'uv_index': uv_index,
             })
 
         return {
@@ -172,42 +320,44 @@ class OpenMeteoAirQualityAdapter(BaseAdapter):
 
     def _extract_pollen(self, data: Dict) -> Dict:
         """Extract and categorize pollen data from a data dict."""
-        result = {}
-        dominant_value = 0
-        dominant_allergen = None
-
-        for category, fields in POLLEN_TYPE_GROUPS.items():
-            total = 0
-            count = 0
-            for field in fields:
-                val = data.get(field)
-                if val is not None:
-                    total += val
-                    count += 1
-                    if val > dominant_value:
-                        dominant_value = val
-                        dominant_allergen = POLLEN_DISPLAY_NAMES.get(field, field)
-            avg = total / count if count > 0 else 0
-            result[category] = {
-                'level': _classify_pollen_level(avg, category),
-                'value': round(avg, 1),
-            }
-
-        result['dominant_allergen'] = dominant_allergen
-        return result
+        return _summarize_pollen([data.get(field) for field in _POLLEN_FIELDS])
+
+    def _current_observation(
+        self, raw_data: Dict, current: Dict, query_lat: float, query_lon: float
+    ) -> Optional[Observation]:
+        """Normalized current reading as a fusion input, or None without an AQI."""
+        if current['aqi'] is None:
+            return None
 
-    def _extract_pollen_at_index(self, hourly_raw: Dict, i: int) -> Dict:
-        """Extract pollen data at a specific hourly index."""
-        data = {}
-        for field in ['alder_pollen', 'birch_pollen', 'olive_pollen',
-                       'grass_pollen', 'mugwort_pollen', 'ragweed_pollen']:
-            data[field] = self._safe_index(hourly_raw.get(field, []), i)
-        return self._extract_pollen(data)
+        # Local time of the model step; the offset makes it absolute
+        try:
+            local_time = datetime.fromisoformat(raw_data['current']['time'])
+            timestamp = (
+                local_time - timedelta(seconds=raw_data.get('utc_offset_seconds') or 0)
+            ).replace(tzinfo=dt_timezone.utc)
+        except (KeyError, TypeError, ValueError):
+            timestamp = timezone.now()
+
+        return Observation(
+            source=self.SOURCE_CODE,
+            lat=query_lat,
+            lon=query_lon,
+            timestamp=timestamp,
+            aqi=current['aqi'],
+            pollutants={k: v for k, v in current['pollutants'].items() if v is not None},
+            quality_level=self.QUALITY_LEVEL,
+            distance_km=0.0,  # Gridded model output for the point itself
+            confidence_score=75.0,  # Model-based data
+        )
+
+    def _summarize_historical(self, raw_data: Dict, past_days: int, hours: Optional[int] = None) -> Dict:
+        """
+        Compute summary statistics from historical hourly AQ data.
 
-    def _summarize_historical(self, raw_data: Dict, past_days: int) -> Dict:
-        """Compute summary statistics from historical hourly AQ data."""
+        Only the first `hours` values are used when given.
+        """
         hourly_raw = raw_data.get('hourly', {})
-        aqi_values = [v for v in hourly_raw.get('us_aqi', []) if v is not None]
+        aqi_values = [v for v in (hourly_raw.get('us_aqi') or [])[:hours] if v is not None]
 
         if not aqi_values:
             return {'past_days': past_days, 'aqi_avg': None, 'aqi_min': None, 'aqi_max': None}
@@ -219,10 +369,3 @@ class OpenMeteoAirQualityAdapter(BaseAdapter):
             'aqi_max': int(max(aqi_values)),
             'sample_count': len(aqi_values),
         }
-
-    @staticmethod
-    def _safe_index(lst: list, idx: int):
-        """Safely index into a list, returning None if out of bounds."""
-        if lst and 0 <= idx < len(lst):
-            return lst[idx]
-        return None
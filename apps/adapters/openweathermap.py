@@ -2,13 +2,13 @@
 OpenWeatherMap adapter for global air quality data and forecasts.
 """
 import logging
-from datetime import datetime
+from datetime import datetime, timezone as dt_timezone
 from typing import List, Dict
 
 from django.utils import timezone
 
 from .base import BaseAdapter
-from .models import SourceData
+from .observation import Observation
 
 logger = logging.getLogger(__name__)
 
@@ -24,13 +24,15 @@ class OpenWeatherMapAdapter(BaseAdapter):
     API_BASE_URL = "https://api.openweathermap.org/data/2.5/"
     REQUIRES_API_KEY = True
     QUALITY_LEVEL = "model"
+    # Air pollution data is CAMS-derived model output
+    GRID_RESOLUTION_DEG = 0.1
     
     def _add_api_key(self, params: Dict, headers: Dict):
         """OpenWeatherMap uses 'appid' parameter."""
         if self.api_key:
             params['appid'] = self.api_key
     
-    def fetch_current(self, lat: float, lon: float, **kwargs) -> List[SourceData]:
+    def fetch_current(self, lat: float, lon: float, **kwargs) -> List[Observation]:
         """
         Fetch current air pollution data.
         
@@ -39,11 +41,12 @@ class OpenWeatherMapAdapter(BaseAdapter):
             lon: Longitude
             
         Returns:
-            List of SourceData objects
+            List of Observation records
         """
+        grid_lat, grid_lon = self._snap_coordinates(lat, lon)
         params = {
-            'lat': lat,
-            'lon': lon,
+            'lat': grid_lat,
+            'lon': grid_lon,
         }
         
         raw_data = self._make_request('air_pollution', params=params)
@@ -64,9 +67,10 @@ class OpenWeatherMapAdapter(BaseAdapter):
         Returns:
             List of forecast dictionaries
         """
+        grid_lat, grid_lon = self._snap_coordinates(lat, lon)
         params = {
-            'lat': lat,
-            'lon': lon,
+            'lat': grid_lat,
+            'lon': grid_lon,
         }
         
         raw_data = self._make_request('air_pollution/forecast', params=params)
@@ -76,9 +80,9 @@ class OpenWeatherMapAdapter(BaseAdapter):
         
         return self._normalize_forecast(raw_data, lat, lon)
     
-    def normalize_data(self, raw_data: Dict, query_lat: float, query_lon: float) -> List[SourceData]:
+    def normalize_data(self, raw_data: Dict, query_lat: float, query_lon: float) -> List[Observation]:
         """
-        Normalize OpenWeatherMap response to SourceData objects.
+        Normalize OpenWeatherMap response to Observation records.
         
         OpenWeatherMap provides AQI on a 1-5 scale which we convert to EPA scale.
         """
@@ -92,7 +96,7 @@ class OpenWeatherMapAdapter(BaseAdapter):
                 # Get timestamp
                 dt = item.get('dt')
                 if dt:
-                    timestamp = datetime.fromtimestamp(dt, tz=timezone.utc)
+                    timestamp = datetime.fromtimestamp(dt, tz=dt_timezone.utc)
                 else:
                     timestamp = timezone.now()
 
@@ -116,7 +120,7 @@ class OpenWeatherMapAdapter(BaseAdapter):
                 # Remove None values
                 pollutants = {k: v for k, v in pollutants.items() if v is not None}
                 
-                source_data = SourceData(
+                source_data = Observation(
                     source=self.SOURCE_CODE,
                     lat=query_lat,
                     lon=query_lon,
@@ -147,7 +151,7 @@ class OpenWeatherMapAdapter(BaseAdapter):
             try:
                 dt = item.get('dt')
                 if dt:
-                    timestamp = datetime.fromtimestamp(dt, tz=timezone.utc)
+                    timestamp = datetime.fromtimestamp(dt, tz=dt_timezone.utc)
                 else:
                     continue
                 
@@ -2,14 +2,17 @@
 PurpleAir adapter for community sensor data.
 """
 import logging
-from datetime import datetime
-from typing import List, Dict
+from datetime import datetime, timezone as dt_timezone
+from itertools import chain
+from typing import Dict, Iterable, List
 
 from django.utils import timezone
+from apps.core.aqi import sub_index
 from apps.core.utils import calculate_distance_km, apply_purpleair_epa_correction
 
 from .base import BaseAdapter
-from .models import SourceData
+from .observation import Observation
+from .streaming import JSONArrayStream, NearestK
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +34,7 @@ class PurpleAirAdapter(BaseAdapter):
         if self.api_key:
             headers['X-API-Key'] = self.api_key
     
-    def fetch_current(self, lat: float, lon: float, **kwargs) -> List[SourceData]:
+    def fetch_current(self, lat: float, lon: float, **kwargs) -> List[Observation]:
         """
         Fetch current PM2.5 data from nearby PurpleAir sensors.
         
@@ -42,7 +45,7 @@ class PurpleAirAdapter(BaseAdapter):
             max_sensors: Maximum number of sensors to return (default: 10)
             
         Returns:
-            List of SourceData objects
+            List of Observation records
         """
         radius_km = kwargs.get('radius_km', 25)
         max_sensors = kwargs.get('max_sensors', 10)
@@ -52,7 +55,7 @@ class PurpleAirAdapter(BaseAdapter):
         degree_offset = radius_km / 111.0
         
         params = {
-            'fields': 'name,latitude,longitude,pm2.5_atm,pm2.5_atm_a,pm2.5_atm_b,confidence,last_seen,humidity,temperature',
+            'fields': 'sensor_index,name,latitude,longitude,pm2.5_atm,pm2.5_atm_a,pm2.5_atm_b,confidence,last_seen,humidity,temperature',
             'location_type': '0',  # Outside sensors only
             'max_age': '3600',     # Data within last hour
             'nwlat': lat + degree_offset,
@@ -61,16 +64,34 @@ class PurpleAirAdapter(BaseAdapter):
             'selng': lon + degree_offset,
         }
         
-        raw_data = self._make_request('sensors', params=params)
-        
-        if not raw_data or 'data' not in raw_data:
+        # The sensors payload can be several MB for dense areas, so it is
+        # streamed and only the nearest max_sensors rows are kept.
+        sensors = self._make_request(
+            'sensors',
+            params=params,
+            stream_array='data',
+            consume=lambda stream: self._nearest_from_stream(stream, lat, lon, max_sensors),
+        )
+        return sensors or []
+
+    def _nearest_from_stream(
+        self, stream: JSONArrayStream, query_lat: float, query_lon: float, max_sensors: int
+    ) -> List[Observation]:
+        """Select the nearest sensors from a streamed sensors response."""
+        rows = iter(stream)
+        first = next(rows, None)
+        if first is None:
             return []
-        
-        return self.normalize_data(raw_data, lat, lon, max_sensors=max_sensors)
-    
-    def normalize_data(self, raw_data: Dict, query_lat: float, query_lon: float, max_sensors: int = 10) -> List[SourceData]:
+        if 'fields' not in stream.meta:
+            # 'fields' comes after 'data' in this body; buffer the rows
+            rows = list(rows)
+        return self._select_nearest(
+            stream.meta.get('fields', []), chain([first], rows), query_lat, query_lon, max_sensors
+        )
+
+    def normalize_data(self, raw_data: Dict, query_lat: float, query_lon: float, max_sensors: int = 10) -> List[Observation]:
         """
-        Normalize PurpleAir response to SourceData objects.
+        Normalize PurpleAir response to Observation records.
         
         PurpleAir sensors have dual channels (A and B). We average them.
         Apply EPA correction factor if enabled in settings.
@@ -78,14 +99,27 @@ class PurpleAirAdapter(BaseAdapter):
         if not raw_data.get('data'):
             return []
         
-        fields = raw_data.get('fields', [])
-        data = raw_data.get('data', [])
-        
+        return self._select_nearest(
+            raw_data.get('fields', []), raw_data['data'], query_lat, query_lon, max_sensors
+        )
+
+    def _select_nearest(
+        self,
+        fields: List[str],
+        rows: Iterable[list],
+        query_lat: float,
+        query_lon: float,
+        max_sensors: int,
+    ) -> List[Observation]:
+        """
+        Filter sensor rows and return the max_sensors nearest, nearest first.
+
+        Rows are consumed one at a time; only the current winners are held
+        and Observation records are built for those alone.
+        """
         # Create field index map
         field_indices = {field: idx for idx, field in enumerate(fields)}
-        
-        source_data_list = []
-        
+
         def _get_field(row, field_name, default=None):
             """Safely get a field value from a sensor data row."""
             idx = field_indices.get(field_name)
@@ -93,10 +127,13 @@ class PurpleAirAdapter(BaseAdapter):
                 return default
             return row[idx]
 
-        for sensor_data in data:
+        apply_correction = self.settings.get('PURPLEAIR_EPA_CORRECTION', True)
+        min_confidence = self.settings.get('PURPLEAIR_MIN_CONFIDENCE', 80)
+        nearest = NearestK(max(0, max_sensors))
+
+        for sensor_data in rows:
             try:
                 # Extract sensor info
-                sensor_name = _get_field(sensor_data, 'name', 'Unknown')
                 sensor_lat = _get_field(sensor_data, 'latitude')
                 sensor_lon = _get_field(sensor_data, 'longitude')
 
@@ -118,18 +155,15 @@ class PurpleAirAdapter(BaseAdapter):
                     continue
                 
                 # Apply EPA correction if enabled
-                apply_correction = self.settings.get('PURPLEAIR_EPA_CORRECTION', True)
                 if apply_correction:
                     pm25_corrected = apply_purpleair_epa_correction(pm25_raw)
                 else:
                     pm25_corrected = pm25_raw
                 
-                # Get confidence and quality metrics
+                # Skip low-confidence sensors
                 confidence = _get_field(sensor_data, 'confidence')
-                min_confidence = self.settings.get('PURPLEAIR_MIN_CONFIDENCE', 80)
-
                 if confidence is not None and confidence < min_confidence:
-                    continue  # Skip low-confidence sensors
+                    continue
 
                 # Calculate distance
                 distance = calculate_distance_km(
@@ -140,65 +174,37 @@ class PurpleAirAdapter(BaseAdapter):
                 # Get timestamp
                 last_seen = _get_field(sensor_data, 'last_seen')
                 if last_seen:
-                    timestamp = datetime.fromtimestamp(last_seen, tz=timezone.utc)
+                    timestamp = datetime.fromtimestamp(last_seen, tz=dt_timezone.utc)
                 else:
                     timestamp = timezone.now()
                 
-                # Convert PM2.5 to AQI (EPA formula)
-                aqi = self._pm25_to_aqi(pm25_corrected)
-                
-                source_data = SourceData(
-                    source=self.SOURCE_CODE,
-                    lat=sensor_lat,
-                    lon=sensor_lon,
-                    timestamp=timestamp,
-                    aqi=aqi,
-                    pollutants={'pm25': round(pm25_corrected, 2)},
-                    quality_level=self.QUALITY_LEVEL,
-                    distance_km=round(distance, 2),
-                    confidence_score=confidence,
-                    station_name=sensor_name,
-                )
-                
-                source_data_list.append((distance, source_data))
+                # Convert PM2.5 to AQI (EPA breakpoints)
+                aqi = sub_index('pm25', pm25_corrected)
                 
             except Exception as e:
                 logger.error(f"Error parsing PurpleAir sensor data: {e}")
                 continue
-        
-        # Sort by distance and limit to max_sensors
-        source_data_list.sort(key=lambda x: x[0])
-        return [sd for _, sd in source_data_list[:max_sensors]]
-    
-    def _pm25_to_aqi(self, pm25: float) -> int:
-        """
-        Convert PM2.5 concentration to AQI using EPA breakpoints.
-        
-        Args:
-            pm25: PM2.5 concentration in µg/m³
-            
-        Returns:
-            AQI value
-        """
-        # EPA PM2.5 breakpoints
-        breakpoints = [
-            (0.0, 12.0, 0, 50),
-            (12.1, 35.4, 51, 100),
-            (35.5, 55.4, 101, 150),
-            (55.5, 150.4, 151, 200),
-            (150.5, 250.4, 201, 300),
-            (250.5, 350.4, 301, 400),
-            (350.5, 500.4, 401, 500),
+
+            nearest.offer(distance, (
+                sensor_lat, sensor_lon, timestamp, aqi, pm25_corrected, distance,
+                confidence, _get_field(sensor_data, 'name', 'Unknown'),
+                _get_field(sensor_data, 'sensor_index'),
+            ))
+
+        return [
+            Observation(
+                source=self.SOURCE_CODE,
+                lat=sensor_lat,
+                lon=sensor_lon,
+                timestamp=timestamp,
+                aqi=aqi,
+                pollutants={'pm25': round(pm25_corrected, 2)},
+                quality_level=self.QUALITY_LEVEL,
+                distance_km=round(distance, 2),
+                confidence_score=confidence,
+                station_id='' if sensor_index is None else str(sensor_index),
+                station_name=sensor_name,
+            )
+            for (sensor_lat, sensor_lon, timestamp, aqi, pm25_corrected, distance,
+                 confidence, sensor_name, sensor_index) in nearest.items()
         ]
-        
-        for c_low, c_high, aqi_low, aqi_high in breakpoints:
-            if c_low <= pm25 <= c_high:
-                # Linear interpolation
-                aqi = ((aqi_high - aqi_low) / (c_high - c_low)) * (pm25 - c_low) + aqi_low
-                return round(aqi)
-        
-        # If beyond range, return max
-        if pm25 > 500.4:
-            return 500
-        
-        return 0
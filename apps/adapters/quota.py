@@ -0,0 +1,134 @@
+"""
+Upstream quota tracking shared across workers.
+
+PurpleAir charges points per call; WAQI, AirVisual and OpenWeatherMap
+enforce per-minute and per-day limits. Each configured source gets a
+QuotaBucket holding one counter per window in the shared cache, so every
+worker draws from the same allowance and we stop calling an upstream
+before it starts answering with 429s.
+
+Limits are configured per source in settings.QUOTA_SETTINGS['LIMITS'].
+Sources without a configuration are unlimited. If the cache is
+unavailable, quota checks fail open.
+"""
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Window name -> (settings key, length in seconds)
+_WINDOWS = (
+    ('minute', 'PER_MINUTE', 60),
+    ('day', 'PER_DAY', 86400),
+)
+
+
+class QuotaBucket:
+    """
+    Fixed-window quota counters for one upstream source.
+
+    Windows are aligned with the wall clock, matching how upstream
+    providers reset their own limits.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        per_minute: Optional[int] = None,
+        per_day: Optional[int] = None,
+        cost_per_call: int = 1,
+    ):
+        self.source = source
+        self.limits = {'minute': per_minute, 'day': per_day}
+        self.cost_per_call = cost_per_call
+
+    def _windows(self) -> List[Tuple[str, int, int]]:
+        """Return (key, limit, ttl) for each configured window."""
+        now = int(time.time())
+        windows = []
+        for name, _, length in _WINDOWS:
+            limit = self.limits.get(name)
+            if not limit:
+                continue
+            window_start = now - (now % length)
+            key = f"quota:{self.source}:{name}:{window_start}"
+            windows.append((key, limit, length + 60))
+        return windows
+
+    def try_acquire(self, cost: int = None) -> bool:
+        """
+        Consume `cost` units from every window.
+
+        Returns False (and consumes nothing) if any window would go over
+        its limit. Returns True on cache failure.
+        """
+        cost = self.cost_per_call if cost is None else cost
+        acquired = []
+        try:
+            for key, limit, ttl in self._windows():
+                cache.add(key, 0, timeout=ttl)
+                used = cache.incr(key, cost)
+                acquired.append(key)
+                if used > limit:
+                    for k in acquired:
+                        cache.decr(k, cost)
+                    return False
+            return True
+        except Exception as e:
+            logger.debug(f"Quota check failed for {self.source} (allowing): {e}")
+            return True
+
+    def refund(self, cost: int = None):
+        """Return units for a call that was never sent."""
+        cost = self.cost_per_call if cost is None else cost
+        try:
+            for key, _, _ in self._windows():
+                if cache.get(key):
+                    cache.decr(key, cost)
+        except Exception as e:
+            logger.debug(f"Quota refund failed for {self.source}: {e}")
+
+    def status(self) -> Dict:
+        """Return usage and limit per window."""
+        windows = self._windows()
+        try:
+            used = cache.get_many([key for key, _, _ in windows])
+        except Exception:
+            used = {}
+        return {
+            key.split(':')[2]: {'used': used.get(key, 0), 'limit': limit}
+            for key, limit, _ in windows
+        }
+
+    def remaining_fraction(self) -> float:
+        """Smallest fraction of quota left across windows (1.0 if unknown)."""
+        fractions = [
+            max(0.0, 1.0 - (window['used'] / window['limit']))
+            for window in self.status().values()
+        ]
+        return min(fractions) if fractions else 1.0
+
+    def is_low(self) -> bool:
+        """True when remaining quota is under the configured low-water mark."""
+        low_watermark = getattr(settings, 'QUOTA_SETTINGS', {}).get('LOW_WATERMARK', 0.2)
+        return self.remaining_fraction() < low_watermark
+
+
+def get_quota(source: str) -> Optional[QuotaBucket]:
+    """Return the QuotaBucket for a source, or None if it has no limits."""
+    quota_settings = getattr(settings, 'QUOTA_SETTINGS', {})
+    if not quota_settings.get('ENABLED', False):
+        return None
+    config = quota_settings.get('LIMITS', {}).get(source)
+    if not config:
+        return None
+    return QuotaBucket(
+        source=source,
+        per_minute=config.get('PER_MINUTE'),
+        per_day=config.get('PER_DAY'),
+        cost_per_call=config.get('COST_PER_CALL', 1),
+    )
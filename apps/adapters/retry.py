@@ -0,0 +1,144 @@
+"""
+Retry policy and retry budgets for upstream HTTP calls.
+
+Replaces the static urllib3 ``Retry`` that used to be mounted on every
+adapter session. During an upstream brownout blind retries multiply load
+and hold request threads well past the orchestrator's deadline, so retries
+here are:
+
+  - limited by a per-source token-bucket budget (retries <= ~10% of requests)
+  - delayed by ``Retry-After`` when the upstream sends one
+  - spaced with full-jitter exponential backoff
+  - abandoned when the next attempt cannot finish before the caller's deadline
+"""
+import email.utils
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+
+# Status codes worth retrying (rate limited or transient server errors)
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Indirection so tests can skip real sleeps without patching time.sleep globally
+_sleep = time.sleep
+
+
+class RetryBudget:
+    """
+    Token bucket that caps retries as a fraction of requests.
+
+    Every first attempt deposits ``ratio`` tokens and every retry spends one,
+    so a sustained failure can add at most ``ratio`` extra load. A small
+    time-based refill (``min_per_second``) lets low-traffic sources still
+    retry occasionally. The balance never exceeds ``capacity``.
+    """
+
+    def __init__(self, ratio: float = 0.1, min_per_second: float = 0.1, capacity: float = 10.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.min_per_second)
+
+    def record_request(self):
+        """Deposit tokens for a first attempt."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Withdraw one token for a retry. Returns False if the budget is empty."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+_budgets: Dict[str, RetryBudget] = {}
+_budgets_lock = threading.Lock()
+
+
+def get_retry_budget(source: str, **kwargs) -> RetryBudget:
+    """
+    Return the process-wide retry budget for a source.
+
+    Adapters are instantiated per request, so the budget must outlive them.
+    """
+    with _budgets_lock:
+        budget = _budgets.get(source)
+        if budget is None:
+            budget = RetryBudget(**kwargs)
+            _budgets[source] = budget
+        return budget
+
+
+class RetryPolicy:
+    """
+    Decide whether and when to retry an upstream call.
+
+    Args:
+        max_retries: Maximum retries after the first attempt
+        backoff_factor: Base of the exponential backoff (seconds)
+        max_backoff: Upper bound for a single backoff delay (seconds)
+    """
+
+    def __init__(self, max_retries: int = 3, backoff_factor: float = 2, max_backoff: float = 8):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+
+    def is_retryable(
+        self,
+        response: Optional[requests.Response] = None,
+        error: Optional[Exception] = None,
+    ) -> bool:
+        """True for connection errors, timeouts and retryable status codes."""
+        if error is not None:
+            return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+        if response is None:
+            return False
+        return response.status_code in RETRYABLE_STATUS_CODES
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given (0-based) retry."""
+        ceiling = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def retry_after(response: Optional[requests.Response]) -> Optional[float]:
+        """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+        if response is None:
+            return None
+        value = response.headers.get('Retry-After')
+        if not isinstance(value, str) or not value.strip():
+            return None
+        value = value.strip()
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at is None:
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
@@ -0,0 +1,135 @@
+"""
+Learned point → station mapping for nearest-station sources.
+
+WAQI (feed/geo), AirVisual (nearest_city) and AirNow (observation/latLong)
+resolve a point to the nearest station, city or reporting area, which is
+the same for everyone over a wide area. Once an adapter has seen which
+station answers for a point, it remembers:
+
+- the cell → station mapping, under the point's geohash cell;
+- the station, in a coarser geohash "area" cell (STATION_SETTINGS
+  INDEX_PRECISION) listing the stations known there. A cell never seen
+  before reuses the nearest station known in its own or a neighbouring
+  area, without an upstream call, only if that station is within one
+  cell diagonal of the point: points sharing a cell are already that far
+  apart. Anything farther is resolved upstream, so closer stations are
+  still discovered;
+- the station's latest upstream payload, keyed by station ID, until the
+  source is next expected to publish (PUBLISH_SCHEDULES). Every cell
+  mapped to the station shares it.
+
+All of it lives in the shared Django cache (Redis in production). The
+geohash prefix is the spatial index, so it works on any cache backend.
+Failures are non-fatal; the adapter then resolves the point upstream.
+"""
+import logging
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core import geohash
+from apps.core.cache import ResponseCache
+from apps.core.utils import calculate_distance_km
+
+logger = logging.getLogger(__name__)
+
+# Stations kept per area cell; the oldest are dropped first
+_MAX_AREA_STATIONS = 32
+
+
+class StationIndex:
+    """
+    Cell → station mapping and per-station payload cache of one source.
+
+    Stations are dicts with at least 'id', 'lat' and 'lon'; adapters may
+    add whatever they need to query the station directly.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        data_ttl: int,
+        mapping_ttl: int = 7 * 86400,
+        cell_precision: int = 6,
+        index_precision: int = 5,
+    ):
+        self.source = source
+        self.data_ttl = data_ttl
+        self.cells = ResponseCache('stn', mapping_ttl, cell_precision)
+        self.areas = ResponseCache('stn_area', mapping_ttl, index_precision)
+
+    def lookup(self, lat: float, lon: float) -> Optional[Dict]:
+        """The station known to answer for a point, or None."""
+        station = self.cells.get(lat, lon, self.source)
+        if station is not None:
+            return station
+
+        nearest, nearest_km = None, self._reuse_distance_km(lat, lon)
+        for known in self.areas.get_around(lat, lon, self.source):
+            for candidate in known if isinstance(known, list) else []:
+                try:
+                    distance = calculate_distance_km(
+                        lat, lon, float(candidate['lat']), float(candidate['lon'])
+                    )
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if distance <= nearest_km:
+                    nearest, nearest_km = candidate, distance
+        return nearest
+
+    def _reuse_distance_km(self, lat: float, lon: float) -> float:
+        """Diagonal of the point's mapping cell."""
+        lat_min, lat_max, lon_min, lon_max = geohash.decode_bbox(
+            geohash.encode(float(lat), float(lon), self.cells.precision)
+        )
+        return calculate_distance_km(lat_min, lon_min, lat_max, lon_max)
+
+    def remember(self, lat: float, lon: float, station: Dict) -> bool:
+        """Record that upstream resolved this point to the station."""
+        if not station.get('id') or station.get('lat') is None or station.get('lon') is None:
+            return False
+        self.cells.set(lat, lon, station, self.source)
+
+        known: List[Dict] = self.areas.get(lat, lon, self.source) or []
+        known = [s for s in known if s.get('id') != station['id']]
+        known.append(station)
+        return self.areas.set(lat, lon, known[-_MAX_AREA_STATIONS:], self.source)
+
+    def _data_key(self, station_id: str) -> str:
+        return f"stn_data:{self.source}:{quote(str(station_id), safe='')}"
+
+    def get_data(self, station_id: str):
+        """The station's cached upstream payload, or None."""
+        try:
+            return cache.get(self._data_key(station_id))
+        except Exception as e:
+            logger.warning(f"Station cache read failed ({self.source}): {e}")
+            return None
+
+    def set_data(self, station_id: str, payload, ttl: Optional[int] = None) -> bool:
+        """Cache the station's upstream payload (by default for one update interval)."""
+        try:
+            cache.set(self._data_key(station_id), payload, timeout=ttl or self.data_ttl)
+            return True
+        except Exception as e:
+            logger.warning(f"Station cache write failed ({self.source}): {e}")
+            return False
+
+
+def create_station_index(source: str, update_interval: Optional[int]) -> Optional[StationIndex]:
+    """
+    Build a source's station index from settings.STATION_SETTINGS, or None
+    if disabled or the source has no stations (update_interval None).
+    """
+    station_settings = getattr(settings, 'STATION_SETTINGS', {})
+    if not update_interval or not station_settings.get('ENABLED', False):
+        return None
+    return StationIndex(
+        source,
+        data_ttl=update_interval,
+        mapping_ttl=station_settings.get('MAPPING_TTL', 7 * 86400),
+        cell_precision=getattr(settings, 'CACHE_SETTINGS', {}).get('GEOHASH_PRECISION', 6),
+        index_precision=station_settings.get('INDEX_PRECISION', 5),
+    )
@@ -0,0 +1,184 @@
+"""
+Incremental parsing of large upstream JSON payloads.
+
+PurpleAir ``sensors`` and WAQI ``map/bounds`` responses are a top-level
+object holding one large array (``data``) plus a few small fields. Loading
+them with ``response.json()`` materializes every row at once. JSONArrayStream
+instead decodes the body chunk by chunk with ``json.JSONDecoder.raw_decode``
+and yields the array's elements one at a time, so callers can filter and
+select rows while only holding what they keep.
+
+Usage::
+
+    stream = JSONArrayStream(response.iter_content(65536), array_key='data')
+    for row in stream:
+        ...                       # stream.meta holds keys seen so far
+    stream.meta['fields']         # small top-level values
+    stream.rows                   # number of array elements yielded
+
+NearestK keeps the k nearest rows seen so far, so selection by distance
+can run while the body is still streaming.
+"""
+import codecs
+import heapq
+import json
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+# Characters that may continue a number raw_decode has stopped before
+_NUMBER_CONTINUATION = '0123456789.eE+-'
+
+
+class JSONArrayStream:
+    """
+    Iterate the elements of one top-level array in a streamed JSON object.
+
+    Other top-level values are decoded whole into ``meta``. Values that
+    precede the array are available as soon as the first row is yielded.
+
+    Args:
+        chunks: Iterable of bytes (or str) chunks of the response body
+        array_key: Top-level key of the array to stream
+    """
+
+    def __init__(self, chunks: Iterable, array_key: str):
+        self.array_key = array_key
+        self.meta: Dict = {}
+        self.rows = 0
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ''
+        self._pos = 0
+        self._exhausted = False
+        self._consumed = False
+        self._rows_source = None
+
+    @classmethod
+    def from_parsed(cls, data: Dict, array_key: str) -> 'JSONArrayStream':
+        """Wrap an already-parsed response (small bodies parsed with json())."""
+        if not isinstance(data, dict):
+            raise ValueError("Expected a JSON object at the top level")
+        stream = cls((), array_key)
+        stream.meta = {k: v for k, v in data.items() if k != array_key}
+        stream._rows_source = data.get(array_key) or []
+        return stream
+
+    # -- buffer handling ----------------------------------------------------
+
+    def _read_more(self) -> bool:
+        """Append the next chunk to the buffer. Returns False at end of body."""
+        if self._exhausted:
+            return False
+        # Drop consumed text so the buffer stays around one chunk in size
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            self._buf += self._utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+            return True
+        self._buf += self._utf8.decode(b'', final=True)
+        self._exhausted = True
+        return False
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._read_more():
+                return ''
+
+    def _expect(self, chars: str) -> str:
+        char = self._peek()
+        if not char or char not in chars:
+            raise ValueError(f"Invalid JSON stream: expected one of {chars!r}, got {char!r}")
+        self._pos += 1
+        return char
+
+    def _value(self):
+        """Decode one complete JSON value at the current position."""
+        self._peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._read_more():
+                    continue
+                raise
+            # A number cut off by the end of the buffer decodes as a shorter
+            # one ('34.' as 34, '1e-' as 1); read on while it may continue
+            if not self._exhausted and (end == len(self._buf) or (
+                isinstance(value, (int, float)) and not isinstance(value, bool)
+                and self._buf[end] in _NUMBER_CONTINUATION
+            )):
+                if self._read_more():
+                    continue
+            self._pos = end
+            return value
+
+    # -- iteration ----------------------------------------------------------
+
+    def __iter__(self) -> Iterator:
+        if self._consumed:
+            raise RuntimeError("JSONArrayStream can only be iterated once")
+        self._consumed = True
+
+        if self._rows_source is not None:
+            for row in self._rows_source:
+                self.rows += 1
+                yield row
+            return
+
+        self._expect('{')
+        if self._peek() == '}':
+            return
+        while True:
+            key = self._value()
+            self._expect(':')
+            if key == self.array_key and self._peek() == '[':
+                self._pos += 1
+                if self._peek() == ']':
+                    self._pos += 1
+                else:
+                    while True:
+                        row = self._value()
+                        self.rows += 1
+                        yield row
+                        if self._expect(',]') == ']':
+                            break
+            else:
+                self.meta[key] = self._value()
+            if self._expect(',}') == '}':
+                return
+
+
+class NearestK:
+    """
+    Keep the ``k`` nearest items offered so far.
+
+    A bounded max-heap on distance holds the current winners, so memory is
+    O(k) however many rows stream past. Ties keep the earlier item, matching
+    a stable sort by distance. ``k=None`` keeps everything.
+    """
+
+    def __init__(self, k: Optional[int]):
+        self.k = k
+        self._heap: List[Tuple[float, int, object]] = []
+        self._seq = 0
+
+    def offer(self, distance: float, item) -> None:
+        entry = (-distance, -self._seq, item)
+        self._seq += 1
+        if self.k is None or len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif self._heap and entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> List:
+        """Kept items, nearest first."""
+        return [item for _, _, item in sorted(self._heap, key=lambda e: (-e[0], -e[1]))]
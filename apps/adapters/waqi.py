@@ -3,13 +3,14 @@ WAQI (World Air Quality Index) adapter for global air quality data.
 """
 import logging
 from datetime import datetime
-from typing import List, Dict
+from typing import Dict, Iterable, List, Optional
 
 from django.utils import timezone
 from apps.core.utils import calculate_distance_km
 
 from .base import BaseAdapter
-from .models import SourceData
+from .observation import Observation
+from .streaming import JSONArrayStream, NearestK
 
 logger = logging.getLogger(__name__)
 
@@ -25,33 +26,60 @@ class WAQIAdapter(BaseAdapter):
     API_BASE_URL = "https://api.waqi.info/"
     REQUIRES_API_KEY = True
     QUALITY_LEVEL = "verified"
+    STATION_UPDATE_INTERVAL = 3600  # Stations report hourly
     
     def _add_api_key(self, params: Dict, headers: Dict):
         """WAQI uses 'token' parameter."""
         if self.api_key:
             params['token'] = self.api_key
     
-    def fetch_current(self, lat: float, lon: float, **kwargs) -> List[SourceData]:
+    def fetch_current(self, lat: float, lon: float, **kwargs) -> List[Observation]:
         """
         Fetch current air quality data for nearest station.
         
+        Points whose station is already known are served from the
+        station's cached feed, or its feed/@<idx> by-ID endpoint.
+        
         Args:
             lat: Latitude
             lon: Longitude
             
         Returns:
-            List of SourceData objects
+            List of Observation records
         """
-        endpoint = f"feed/geo:{lat};{lon}/"
+        raw_data = self._station_payload(lat, lon, self._fetch_station_feed)
         
-        raw_data = self._make_request(endpoint)
+        if raw_data is None:
+            raw_data = self._make_request(f"feed/geo:{lat};{lon}/")
+            if raw_data and raw_data.get('status') == 'ok':
+                self._learn_station(lat, lon, self._station_of(raw_data), raw_data)
         
         if not raw_data or raw_data.get('status') != 'ok':
             return []
         
         return self.normalize_data(raw_data, lat, lon)
     
-    def fetch_nearby_stations(self, lat: float, lon: float, radius_km: float = 25) -> List[SourceData]:
+    def _fetch_station_feed(self, station: Dict) -> Optional[Dict]:
+        """Current feed of a known station by its WAQI idx."""
+        raw_data = self._make_request(f"feed/@{station['id']}/")
+        if not raw_data or raw_data.get('status') != 'ok':
+            return None
+        return raw_data
+    
+    @staticmethod
+    def _station_of(raw_data: Dict) -> Optional[Dict]:
+        """The station a feed response came from, for the station index."""
+        data = raw_data.get('data')
+        if not isinstance(data, dict):
+            return None
+        geo = (data.get('city') or {}).get('geo') or []
+        if not data.get('idx') or len(geo) != 2:
+            return None
+        return {'id': str(data['idx']), 'lat': geo[0], 'lon': geo[1]}
+    
+    def fetch_nearby_stations(
+        self, lat: float, lon: float, radius_km: float = 25, max_stations: int = 10
+    ) -> List[Observation]:
         """
         Fetch data from multiple nearby stations within bounding box.
         
@@ -59,9 +87,10 @@ class WAQIAdapter(BaseAdapter):
             lat: Latitude
             lon: Longitude
             radius_km: Search radius in kilometers
+            max_stations: Maximum number of stations to return
             
         Returns:
-            List of SourceData objects
+            List of Observation records
         """
         # Calculate bounding box
         # Approximate: 1 degree ≈ 111 km
@@ -70,16 +99,17 @@ class WAQIAdapter(BaseAdapter):
         latlng = f"{lat-degree_offset},{lon-degree_offset},{lat+degree_offset},{lon+degree_offset}"
         endpoint = f"map/bounds/?latlng={latlng}"
         
-        raw_data = self._make_request(endpoint)
-        
-        if not raw_data or raw_data.get('status') != 'ok':
-            return []
-        
-        return self._normalize_map_data(raw_data, lat, lon)
+        # map/bounds bodies grow with the box; stream them and keep only
+        # the nearest stations.
+        def consume(stream: JSONArrayStream) -> List[Observation]:
+            stations = self._select_stations(stream, lat, lon, max_stations)
+            return stations if stream.meta.get('status') == 'ok' else []
+
+        return self._make_request(endpoint, stream_array='data', consume=consume) or []
     
-    def normalize_data(self, raw_data: Dict, query_lat: float, query_lon: float) -> List[SourceData]:
+    def normalize_data(self, raw_data: Dict, query_lat: float, query_lon: float) -> List[Observation]:
         """
-        Normalize WAQI response to SourceData objects.
+        Normalize WAQI response to Observation records.
         """
         if 'data' not in raw_data:
             return []
@@ -143,7 +173,7 @@ class WAQIAdapter(BaseAdapter):
                 if waqi_key in iaqi and 'v' in iaqi[waqi_key]:
                     pollutants[our_key] = iaqi[waqi_key]['v']
             
-            source_data = SourceData(
+            source_data = Observation(
                 source=self.SOURCE_CODE,
                 lat=station_lat,
                 lon=station_lon,
@@ -163,15 +193,24 @@ class WAQIAdapter(BaseAdapter):
             logger.error(f"Error parsing WAQI data: {e}")
             return []
     
-    def _normalize_map_data(self, raw_data: Dict, query_lat: float, query_lon: float) -> List[SourceData]:
+    def _normalize_map_data(self, raw_data: Dict, query_lat: float, query_lon: float) -> List[Observation]:
         """
         Normalize WAQI map/bounds response with multiple stations.
         """
         if 'data' not in raw_data:
             return []
         
-        stations = raw_data['data']
-        source_data_list = []
+        return self._select_stations(raw_data['data'], query_lat, query_lon)
+
+    def _select_stations(
+        self,
+        stations: Iterable[Dict],
+        query_lat: float,
+        query_lon: float,
+        max_stations: Optional[int] = None,
+    ) -> List[Observation]:
+        """Return the max_stations nearest valid stations (all if None), nearest first."""
+        nearest = NearestK(None if max_stations is None else max(0, max_stations))
         
         for station in stations:
             try:
@@ -197,26 +236,25 @@ class WAQIAdapter(BaseAdapter):
                 except (ValueError, TypeError):
                     continue
                 
-                source_data = SourceData(
-                    source=self.SOURCE_CODE,
-                    lat=station_lat,
-                    lon=station_lon,
-                    timestamp=timezone.now(),  # Map data doesn't include timestamps
-                    aqi=aqi,
-                    pollutants={},  # Map data doesn't include detailed pollutants
-                    quality_level=self.QUALITY_LEVEL,
-                    distance_km=round(distance, 2),
-                    confidence_score=80.0,
-                    station_id=str(station.get('uid', '')),
-                    station_name=station.get('station', {}).get('name', 'Unknown'),
-                )
-                
-                source_data_list.append((distance, source_data))
-                
             except Exception as e:
                 logger.error(f"Error parsing WAQI station: {e}")
                 continue
+
+            nearest.offer(distance, (distance, aqi, station))
         
-        # Sort by distance
-        source_data_list.sort(key=lambda x: x[0])
-        return [sd for _, sd in source_data_list]
+        return [
+            Observation(
+                source=self.SOURCE_CODE,
+                lat=station['lat'],
+                lon=station['lon'],
+                timestamp=timezone.now(),  # Map data doesn't include timestamps
+                aqi=aqi,
+                pollutants={},  # Map data doesn't include detailed pollutants
+                quality_level=self.QUALITY_LEVEL,
+                distance_km=round(distance, 2),
+                confidence_score=80.0,
+                station_id=str(station.get('uid', '')),
+                station_name=(station.get('station') or {}).get('name', 'Unknown'),
+            )
+            for distance, aqi, station in nearest.items()
+        ]
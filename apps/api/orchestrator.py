@@ -2,8 +2,8 @@
 Main orchestrator that coordinates all services to fetch and blend air quality data.
 """
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
-from typing import Dict, List
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from typing import Dict, List, Optional, Set, Tuple
 
 from django.conf import settings
 
@@ -13,14 +13,17 @@ from apps.adapters.purpleair import PurpleAirAdapter
 from apps.adapters.openweathermap import OpenWeatherMapAdapter
 from apps.adapters.waqi import WAQIAdapter
 from apps.adapters.airvisual import AirVisualAdapter
+from apps.adapters.open_meteo_air_quality import OpenMeteoAirQualityAdapter
 from apps.fusion.engine import FusionEngine
 from apps.forecast.services import ForecastAggregator
+from apps.core import geohash
+from apps.core.background import schedule_refresh
 from apps.core.utils import convert_aqi_to_category
 
 logger = logging.getLogger(__name__)
 
 # Per-adapter timeout for future.result().  Should be slightly above the
-# adapter's own REQUEST_TIMEOUT (default 10s) + retry overhead.
+# adapter's REQUEST_DEADLINE (default 12s), which already bounds retries.
 _ADAPTER_FUTURE_TIMEOUT = 15  # seconds
 
 
@@ -47,6 +50,10 @@ class AirQualityOrchestrator:
             'WAQI': WAQIAdapter(),
             'AIRVISUAL': AirVisualAdapter(),
         }
+        # Hourly model output, no key required: a forecast source, and its
+        # current reading is one more fusion input
+        self.om_aq_adapter = OpenMeteoAirQualityAdapter()
+        self.adapters['OPEN_METEO_AQ'] = self.om_aq_adapter
     
     def get_air_quality(
         self,
@@ -54,7 +61,8 @@ class AirQualityOrchestrator:
         lon: float,
         include_forecast: bool = False,
         radius_km: float = 25,
-        use_cache: bool = True
+        use_cache: bool = True,
+        om_aq: Optional[Future] = None,
     ) -> Dict:
         """
         Main method to get air quality data for coordinates.
@@ -65,6 +73,9 @@ class AirQualityOrchestrator:
             include_forecast: Whether to include forecast data
             radius_km: Search radius for sensors
             use_cache: Whether to use cached data
+            om_aq: Future of an OpenMeteoAirQualityAdapter.fetch_combined
+                result the caller is already fetching; its observation is
+                blended instead of calling Open-Meteo again
             
         Returns:
             Complete air quality response dict
@@ -76,22 +87,32 @@ class AirQualityOrchestrator:
         # Get region-specific configuration
         region_config = self.location_service.get_region_config(region_code)
         
-        # 2. Fetch current data from all available adapters (parallel)
-        current_data = self._fetch_all_current(lat, lon, radius_km, region_config)
-        
-        # 3. Blend data from multiple sources
-        blended_result = self.fusion_engine.blend(
-            lat=lat,
-            lon=lon,
-            source_data_list=current_data,
-            region_code=region_code,
-            use_cache=use_cache
-        )
+        # 2. Serve from the cell's cache before spending any upstream calls
+        blended_result = None
+        if use_cache:
+            blended_result = self.fusion_engine.get_cached(lat, lon)
+            if blended_result is not None and self.fusion_engine.neighbor_hit:
+                # Served from the adjacent cell; compute this one off the request path
+                precision = getattr(settings, 'CACHE_SETTINGS', {}).get('GEOHASH_PRECISION', 6)
+                cell = geohash.encode(float(lat), float(lon), precision)
+                schedule_refresh(f"aq:{cell}", _refresh_cell, lat, lon, radius_km)
+
+        if blended_result is None:
+            # On a miss, a source low on quota also makes a result from the
+            # wider cell acceptable, and is skipped below if low-trust
+            low_quota = self._low_quota_sources()
+            if low_quota and use_cache:
+                blended_result = self.fusion_engine.get_cached_wide(lat, lon)
+            if blended_result is None:
+                # 3-4. Fetch current data and blend it (cache already checked)
+                blended_result = self._fetch_and_blend(
+                    lat, lon, radius_km, region_code, region_config, low_quota, om_aq=om_aq
+                )
         
-        # 4. Add location info
+        # 5. Add location info
         blended_result['location'] = location_info
         
-        # 5. Add health advice
+        # 6. Add health advice
         if blended_result['current']['aqi'] is not None:
             category_info = convert_aqi_to_category(
                 blended_result['current']['aqi'],
@@ -100,26 +121,87 @@ class AirQualityOrchestrator:
             if category_info:
                 blended_result['health_advice'] = category_info['health_message']
         
-        # 6. Fetch and aggregate forecasts if requested
+        # 7. Fetch and aggregate forecasts if requested
         if include_forecast:
-            forecast_data = self._fetch_all_forecasts(lat, lon, region_config)
-            aggregated_forecasts = self.forecast_aggregator.aggregate_forecasts(
-                lat, lon, forecast_data, use_cache=use_cache
-            )
-            blended_result['forecast'] = aggregated_forecasts
+            aggregated_forecasts = self.forecast_aggregator.get_cached(lat, lon) if use_cache else None
+            if aggregated_forecasts is None:
+                forecast_data, fresh_sources = self._fetch_all_forecasts(
+                    lat, lon, region_config, use_cache=use_cache
+                )
+                aggregated_forecasts = self.forecast_aggregator.aggregate_forecasts(
+                    lat, lon, forecast_data, use_cache=False, fresh_sources=fresh_sources
+                )
+            blended_result['forecast'] = aggregated_forecasts['hourly']
+            blended_result['forecast_daily'] = aggregated_forecasts['daily']
         
         return blended_result
-    
+
+    def refresh_current(self, lat: float, lon: float, radius_km: float = 25) -> Dict:
+        """Recompute and cache the blended current result for a cell."""
+        location_info = self.location_service.reverse_geocode(lat, lon)
+        region_code = location_info.get('country', 'DEFAULT')
+        region_config = self.location_service.get_region_config(region_code)
+        return self._fetch_and_blend(
+            lat, lon, radius_km, region_code, region_config, self._low_quota_sources()
+        )
+
+    def _fetch_and_blend(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        region_code: str,
+        region_config: Dict,
+        low_quota: Set[str],
+        om_aq: Optional[Future] = None,
+    ) -> Dict:
+        """Fetch current data from the adapters and blend (and cache) it."""
+        # Parallel, skipping low-trust sources that are running out of quota
+        current_data = self._fetch_all_current(
+            lat, lon, radius_km, region_config,
+            skip_sources=self._sources_to_skip(low_quota),
+            om_aq=om_aq,
+        )
+        return self.fusion_engine.blend(
+            lat=lat,
+            lon=lon,
+            source_data_list=current_data,
+            region_code=region_code,
+            use_cache=False
+        )
+
+    def _low_quota_sources(self) -> Set[str]:
+        """Return codes of sources whose upstream quota is running low."""
+        low = set()
+        for source_code, adapter in self.adapters.items():
+            if adapter.quota is not None and adapter.quota.is_low():
+                low.add(source_code)
+        if low:
+            logger.info(f"Upstream quota low for {sorted(low)} – degrading")
+        return low
+
+    def _sources_to_skip(self, low_quota: Set[str]) -> Set[str]:
+        """Of the low-quota sources, pick the low-trust ones to skip."""
+        if not low_quota:
+            return set()
+        threshold = getattr(settings, 'QUOTA_SETTINGS', {}).get('LOW_TRUST_THRESHOLD', 0.75)
+        weights = settings.AIR_QUALITY_SETTINGS.get('SOURCE_WEIGHTS', {})
+        return {code for code in low_quota if weights.get(code, 0.5) < threshold}
+
     def _fetch_all_current(
         self,
         lat: float,
         lon: float,
         radius_km: float,
-        region_config: Dict
+        region_config: Dict,
+        skip_sources: Set[str] = frozenset(),
+        om_aq: Optional[Future] = None,
     ) -> List:
         """
         Fetch current data from all available adapters in parallel.
         Uses per-adapter timeouts to avoid one slow source blocking the response.
+        Sources that recently had no data for this cell (BaseAdapter
+        negative cache) are skipped.
         """
         all_data = []
 
@@ -128,17 +210,21 @@ class AirQualityOrchestrator:
 
         # Determine which adapters to use based on priority and availability
         active_adapters = []
-        seen = set()
+        seen = set(skip_sources)
         for source_code in source_priority:
+            if source_code in seen:
+                continue
             adapter = self.adapters.get(source_code)
             if adapter and adapter.is_available():
-                active_adapters.append((source_code, adapter))
                 seen.add(source_code)
+                if not adapter.has_no_data(lat, lon, radius_km):
+                    active_adapters.append((source_code, adapter))
 
         # Add remaining adapters not in priority list
         for source_code, adapter in self.adapters.items():
             if source_code not in seen and adapter.is_available():
-                active_adapters.append((source_code, adapter))
+                if not adapter.has_no_data(lat, lon, radius_km):
+                    active_adapters.append((source_code, adapter))
 
         if not active_adapters:
             logger.warning("No active adapters available")
@@ -154,7 +240,8 @@ class AirQualityOrchestrator:
                     adapter,
                     lat,
                     lon,
-                    radius_km
+                    radius_km,
+                    om_aq,
                 )
                 future_to_source[future] = source_code
 
@@ -179,33 +266,72 @@ class AirQualityOrchestrator:
 
         return all_data
     
-    def _safe_fetch_current(self, adapter, lat: float, lon: float, radius_km: float) -> List:
-        """Safely fetch data with error handling."""
+    def _safe_fetch_current(
+        self, adapter, lat: float, lon: float, radius_km: float, om_aq: Optional[Future] = None
+    ) -> List:
+        """Safely fetch data with error handling; remembers cells without data."""
         try:
-            if hasattr(adapter, 'SOURCE_CODE') and adapter.SOURCE_CODE == 'PURPLEAIR':
-                # PurpleAir uses radius_km parameter
-                return adapter.fetch_current(lat, lon, radius_km=radius_km)
-            else:
-                return adapter.fetch_current(lat, lon)
+            data = self._fetch_current(adapter, lat, lon, radius_km, om_aq)
         except Exception as e:
             logger.error(f"Error in {adapter.SOURCE_NAME}: {e}")
             return []
+        if not data:
+            adapter.record_no_data(lat, lon, radius_km)
+        return data
+
+    def _fetch_current(
+        self, adapter, lat: float, lon: float, radius_km: float, om_aq: Optional[Future] = None
+    ) -> List:
+        """Current records from one adapter, with its call convention."""
+        if hasattr(adapter, 'SOURCE_CODE') and adapter.SOURCE_CODE == 'PURPLEAIR':
+            # PurpleAir uses radius_km parameter
+            return adapter.fetch_current(lat, lon, radius_km=radius_km)
+        elif hasattr(adapter, 'SOURCE_CODE') and adapter.SOURCE_CODE == 'OPEN_METEO_AQ':
+            # Its current fetch is pollen + hourly; fusion takes the observation
+            combined = (
+                om_aq.result(timeout=_ADAPTER_FUTURE_TIMEOUT) if om_aq is not None
+                else adapter.fetch_combined(lat, lon)
+            )
+            observation = combined.get('observation') if combined else None
+            return [observation] if observation else []
+        else:
+            return adapter.fetch_current(lat, lon)
     
-    def _fetch_all_forecasts(self, lat: float, lon: float, region_config: Dict) -> List[Dict]:
+    def _fetch_all_forecasts(
+        self, lat: float, lon: float, region_config: Dict, use_cache: bool = True
+    ) -> Tuple[List[Dict], Set[str]]:
         """
         Fetch forecast data from adapters that support it.
+
+        Sources whose series for the current run is cached are not called.
+
+        Returns:
+            (all forecast dicts, codes of sources fetched upstream)
         """
         all_forecasts = []
+        fresh_sources = set()
 
         # Only certain adapters support forecasts
         forecast_adapters = [
             self.adapters.get('EPA_AIRNOW'),
             self.adapters.get('OPENWEATHERMAP'),
+            self.om_aq_adapter,
         ]
-        active = [a for a in forecast_adapters if a and a.is_available()]
+        active = []
+        for adapter in forecast_adapters:
+            if not adapter or not adapter.is_available():
+                continue
+            cached = (
+                self.forecast_aggregator.get_source_forecast(lat, lon, adapter.SOURCE_CODE)
+                if use_cache else None
+            )
+            if cached is not None:
+                all_forecasts.extend(cached)
+            else:
+                active.append(adapter)
 
         if not active:
-            return all_forecasts
+            return all_forecasts, fresh_sources
 
         with ThreadPoolExecutor(max_workers=len(active)) as executor:
             future_to_adapter = {}
@@ -217,16 +343,22 @@ class AirQualityOrchestrator:
                     lat,
                     lon
                 )
-                future_to_adapter[future] = adapter.SOURCE_NAME
+                future_to_adapter[future] = adapter
 
             # Collect results
             try:
                 for future in as_completed(future_to_adapter, timeout=_ADAPTER_FUTURE_TIMEOUT + 5):
-                    adapter_name = future_to_adapter[future]
+                    adapter = future_to_adapter[future]
+                    adapter_name = adapter.SOURCE_NAME
                     try:
                         data = future.result(timeout=_ADAPTER_FUTURE_TIMEOUT)
                         if data:
                             all_forecasts.extend(data)
+                            fresh_sources.add(adapter.SOURCE_CODE)
+                            # Failures are not cached; the source is retried next time
+                            self.forecast_aggregator.save_source_forecast(
+                                lat, lon, adapter.SOURCE_CODE, data
+                            )
                     except FuturesTimeoutError:
                         logger.warning(f"Timeout fetching forecast from {adapter_name}")
                         future.cancel()
@@ -235,7 +367,7 @@ class AirQualityOrchestrator:
             except (FuturesTimeoutError, TimeoutError):
                 logger.warning("Aggregate forecast fetch deadline exceeded – returning partial results")
 
-        return all_forecasts
+        return all_forecasts, fresh_sources
     
     def _safe_fetch_forecast(self, adapter, lat: float, lon: float) -> List[Dict]:
         """Safely fetch forecast with error handling."""
@@ -244,3 +376,8 @@ class AirQualityOrchestrator:
         except Exception as e:
             logger.error(f"Error in {adapter.SOURCE_NAME} forecast: {e}")
             return []
+
+
+def _refresh_cell(lat: float, lon: float, radius_km: float):
+    """Background refresh of a cell answered from a neighbouring cell."""
+    AirQualityOrchestrator().refresh_current(lat, lon, radius_km)
@@ -13,16 +13,21 @@ from rest_framework import status
 
 from apps.core.utils import validate_coordinates
 from .orchestrator import AirQualityOrchestrator
+from .rendering import RenderedResponseMixin, has_current_aqi, render_json
+from .views import air_quality_key
 from .serializers import AirQualityResponseSerializer
 from apps.weather.orchestrator import WeatherOrchestrator
 from apps.weather.serializers import WeatherResponseSerializer
+from apps.weather.utils import UNITS, convert_response, requested_units
+from apps.weather.views import weather_key
 from apps.jaspr.orchestrator import JasprOrchestrator
 from apps.jaspr.serializers import JasprResponseSerializer
+from apps.jaspr.views import jaspr_key
 
 logger = logging.getLogger(__name__)
 
 
-class PublicAirQualityView(APIView):
+class PublicAirQualityView(RenderedResponseMixin, APIView):
     """
     Public air quality endpoint for the demo page.
     Same as /api/v1/air-quality/ but requires no API key.
@@ -30,6 +35,9 @@ class PublicAirQualityView(APIView):
     GET /api/v1/public/air-quality/?lat=34.05&lon=-118.24
     """
     permission_classes = [AllowAny]
+    # Bodies are identical to the keyed endpoint's, so they share entries
+    rendered_view = 'aq'
+    rendered_key = staticmethod(air_quality_key)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -77,16 +85,17 @@ class PublicAirQualityView(APIView):
                 include_forecast=include_forecast,
                 radius_km=radius_km,
             )
-            serializer = AirQualityResponseSerializer(data=result)
-            if serializer.is_valid():
-                return Response(serializer.data)
-            return Response(result)
+            content = render_json(AirQualityResponseSerializer, result)
+            if content is None:
+                return Response(result)
+            key = air_quality_key(request.query_params) if has_current_aqi(result) else None
+            return self.rendered_response(request, content, key)
         except Exception as e:
             logger.error(f"Public AQ endpoint error: {e}", exc_info=True)
             return Response({'error': 'Unable to fetch air quality data'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class PublicWeatherView(APIView):
+class PublicWeatherView(RenderedResponseMixin, APIView):
     """
     Public weather endpoint for the demo page.
     Same as /api/v1/weather/ but requires no API key.
@@ -94,6 +103,9 @@ class PublicWeatherView(APIView):
     GET /api/v1/public/weather/?lat=34.05&lon=-118.24&units=imperial
     """
     permission_classes = [AllowAny]
+    # Bodies are identical to the keyed endpoint's, so they share entries
+    rendered_view = 'weather'
+    rendered_key = staticmethod(weather_key)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -125,24 +137,23 @@ class PublicWeatherView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        from django.conf import settings as django_settings
-        default_units = django_settings.WEATHER_SETTINGS.get('DEFAULT_UNITS', 'imperial')
-        units = request.query_params.get('units', default_units).lower()
-        if units not in ('metric', 'imperial'):
+        units = requested_units(request.query_params)
+        if units not in UNITS:
             return Response({'error': "units must be 'metric' or 'imperial'"}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
             result = self.orchestrator.get_weather(lat=lat, lon=lon, units=units)
-            serializer = WeatherResponseSerializer(data=result)
-            if serializer.is_valid():
-                return Response(serializer.data)
-            return Response(result)
+            content = render_json(WeatherResponseSerializer, result, context={'units': units})
+            if content is None:
+                return Response(convert_response(result, units))
+            key = weather_key(request.query_params) if 'error' not in result else None
+            return self.rendered_response(request, content, key)
         except Exception as e:
             logger.error(f"Public weather endpoint error: {e}", exc_info=True)
             return Response({'error': 'Unable to fetch weather data'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class PublicJasprView(APIView):
+class PublicJasprView(RenderedResponseMixin, APIView):
     """
     Public combined endpoint for the demo page.
     Same as /api/v1/jaspr/ but requires no API key.
@@ -150,6 +161,9 @@ class PublicJasprView(APIView):
     GET /api/v1/public/jaspr/?lat=34.05&lon=-118.24&units=imperial
     """
     permission_classes = [AllowAny]
+    # Bodies are identical to the keyed endpoint's, so they share entries
+    rendered_view = 'jaspr'
+    rendered_key = staticmethod(jaspr_key)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -175,10 +189,8 @@ class PublicJasprView(APIView):
         if not is_valid:
             return Response({'error': error_message}, status=status.HTTP_400_BAD_REQUEST)
 
-        from django.conf import settings as django_settings
-        default_units = django_settings.WEATHER_SETTINGS.get('DEFAULT_UNITS', 'imperial')
-        units = request.query_params.get('units', default_units).lower()
-        if units not in ('metric', 'imperial'):
+        units = requested_units(request.query_params)
+        if units not in UNITS:
             return Response({'error': "units must be 'metric' or 'imperial'"}, status=status.HTTP_400_BAD_REQUEST)
 
         include_historical = request.query_params.get('include_historical', 'false').lower() == 'true'
@@ -187,10 +199,11 @@ class PublicJasprView(APIView):
             result = self.orchestrator.get_jaspr_data(
                 lat=lat, lon=lon, units=units, include_historical=include_historical,
             )
-            serializer = JasprResponseSerializer(data=result)
-            if serializer.is_valid():
-                return Response(serializer.data)
-            return Response(result)
+            content = render_json(JasprResponseSerializer, result, context={'units': units})
+            if content is None:
+                return Response(convert_response(result, units))
+            key = jaspr_key(request.query_params) if has_current_aqi(result) else None
+            return self.rendered_response(request, content, key)
         except Exception as e:
             logger.error(f"Public JASPR endpoint error: {e}", exc_info=True)
             return Response({'error': 'Unable to fetch data'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
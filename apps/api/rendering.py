@@ -0,0 +1,295 @@
+"""
+Fast rendering for response payloads the orchestrators build themselves.
+
+Those payloads are trusted, so running them through Serializer(data=...)
+validation and back out through serializer.data only burns CPU. Instead
+each response serializer is compiled once into a projection: a tree of
+small functions that copies the declared fields (the same whitelist the
+serializer applies), fills declared defaults and coerces leaf values. The
+result is encoded with orjson when it is installed.
+
+Encoded bodies are cached as-is with their ETag (RenderedCache), and
+RenderedResponseMixin serves them before the view runs, so a repeat
+request costs one cache GET (or ends in a 304 for a polling client).
+"""
+import hashlib
+import json
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException
+from rest_framework.fields import empty
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.utils import encoders
+
+from apps.core.cache import ResponseCache
+from apps.core.utils import validate_coordinates
+
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the stdlib encoder DRF uses
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+Projection = Callable[[Any, Dict], Any]
+
+# Types DRF's encoder handles that orjson should defer to it for
+# (datetimes keep DRF's formatting: 'Z' suffix, millisecond precision)
+_encoder_default = encoders.JSONEncoder().default
+
+
+class ProjectionError(ValueError):
+    """Payload is missing a required field of its serializer."""
+
+
+def encode(data) -> bytes:
+    """Encode data as compact UTF-8 JSON, like DRF's JSONRenderer."""
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            default=_encoder_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+    return json.dumps(
+        data, cls=encoders.JSONEncoder, ensure_ascii=False,
+        allow_nan=False, separators=(',', ':'),
+    ).encode('utf-8')
+
+
+def _leaf(field: serializers.Field) -> Projection:
+    """Projection for a single value field."""
+    project = getattr(field, 'project', None)
+    if project is not None:
+        return project
+    if isinstance(field, serializers.IntegerField):
+        return lambda value, context: value if type(value) is int else int(value)
+    if isinstance(field, serializers.FloatField):
+        return lambda value, context: value if type(value) is float else float(value)
+    if isinstance(field, serializers.CharField):
+        return lambda value, context: value if type(value) is str else str(value)
+    if isinstance(field, (serializers.BooleanField, serializers.DictField,
+                          serializers.ListField, serializers.JSONField)):
+        return lambda value, context: value
+    if isinstance(field, serializers.DateTimeField):
+        return lambda value, context: _datetime(field, value)
+    # Anything else (dates, decimals) keeps the field's own representation;
+    # DRF's date fields return strings unchanged
+    return lambda value, context: field.to_representation(value)
+
+
+def _datetime(field: serializers.DateTimeField, value):
+    """DRF's rendering of a datetime or ISO string, with a shortcut for UTC strings."""
+    if isinstance(value, str):
+        if value.endswith('+00:00'):
+            return value[:-6] + 'Z'
+        try:
+            value = field.to_internal_value(value)
+        except serializers.ValidationError:
+            return value
+    return field.to_representation(value)
+
+
+def _compile(field: serializers.Field) -> Projection:
+    if isinstance(field, serializers.ListSerializer):
+        child = _compile(field.child)
+        return lambda value, context: [child(item, context) for item in value]
+    if not isinstance(field, serializers.Serializer):
+        return _leaf(field)
+
+    # (key, projection, default, allow_null, required) per readable field
+    entries = [
+        (name, _compile(child), child.default, child.allow_null, child.required)
+        for name, child in field.fields.items()
+        if not child.write_only
+    ]
+
+    def project_object(value, context):
+        result = {}
+        for key, project, default, allow_null, required in entries:
+            try:
+                item = value[key]
+            except KeyError:
+                # Same precedence as Field.get_attribute
+                if default is not empty:
+                    result[key] = default() if callable(default) else default
+                elif allow_null:
+                    result[key] = None
+                elif required:
+                    raise ProjectionError(key)
+                continue
+            result[key] = None if item is None else project(item, context)
+        return result
+
+    return project_object
+
+
+_projections: Dict[type, Projection] = {}
+
+
+def project(serializer_class: type, payload: Dict, context: Optional[Dict] = None) -> Dict:
+    """
+    Output of serializer_class for a trusted payload, without validation.
+
+    Raises:
+        ProjectionError: A required field is missing
+    """
+    projection = _projections.get(serializer_class)
+    if projection is None:
+        projection = _projections[serializer_class] = _compile(serializer_class())
+    return projection(payload, context or {})
+
+
+def render_json(serializer_class: type, payload: Dict, context: Optional[Dict] = None) -> Optional[bytes]:
+    """Projected and encoded payload, or None if it doesn't fit the serializer."""
+    try:
+        return encode(project(serializer_class, payload, context))
+    except (ProjectionError, TypeError, ValueError) as e:
+        logger.warning(f"{serializer_class.__name__} projection failed: {e!r}")
+        return None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer using the fast encoder.
+
+    Bytes are taken to be an already encoded body (render_json or
+    RenderedCache) and written as-is.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, bytes):
+            return data
+        if data is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return encode(data)
+
+
+def make_etag(content: bytes) -> str:
+    """Strong ETag for an encoded body."""
+    return '"%s"' % hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def etag_matches(request, etag: str) -> bool:
+    """Whether the request's If-None-Match covers etag (weak comparison)."""
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    tags = parse_etags(header)
+    return '*' in tags or etag in (tag[2:] if tag.startswith('W/') else tag for tag in tags)
+
+
+class RenderedCache:
+    """
+    Encoded response bodies and their ETags for repeat requests.
+
+    Keys are (lat, lon, *variant) on the same geohash cells as the data
+    caches (CACHE_SETTINGS GEOHASH_PRECISION), where `variant` is every
+    request parameter that changes the body. One cache GET returns both
+    the ETag and the body. CACHE_SETTINGS RENDERED_RESPONSE_TTL sets the
+    lifetime; 0 disables it.
+    """
+
+    def __init__(self, view: str):
+        cache_settings = getattr(settings, 'CACHE_SETTINGS', {})
+        self.view = view
+        self.ttl = cache_settings.get('RENDERED_RESPONSE_TTL', 60)
+        self.enabled = self.ttl > 0
+        self._cache = ResponseCache(
+            namespace='rendered',
+            default_ttl=self.ttl,
+            geohash_precision=cache_settings.get('GEOHASH_PRECISION', 6),
+        )
+
+    def get(self, key: Tuple) -> Optional[Tuple[str, bytes]]:
+        """(etag, body) for a key, or None."""
+        if not self.enabled:
+            return None
+        lat, lon, *variant = key
+        hit = self._cache.get_raw(lat, lon, self.view, *variant)
+        return hit if isinstance(hit, tuple) else None
+
+    def set(self, key: Tuple, content: bytes) -> str:
+        """Store a body and return its ETag."""
+        etag = make_etag(content)
+        if self.enabled:
+            lat, lon, *variant = key
+            self._cache.set_raw(lat, lon, (etag, content), self.view, *variant)
+        return etag
+
+
+class RenderedResponseMixin:
+    """
+    APIView mixin answering repeat GETs from RenderedCache before the view runs.
+
+    On a hit, dispatch() only runs DRF's authentication, permission and
+    throttle checks (initial()) and writes the stored body, or a 304 when
+    If-None-Match carries its ETag. Any failure in those checks takes the
+    normal path so DRF renders the error.
+
+    Views set `rendered_view` and implement rendered_key(params), which
+    returns (lat, lon, *variant) for a well-formed cacheable request and
+    None otherwise (including no_cache=true).
+    """
+    rendered_view: str = ''
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.rendered = RenderedCache(self.rendered_view)
+
+    def rendered_key(self, params) -> Optional[Tuple]:
+        raise NotImplementedError
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method == 'GET' and self.rendered.enabled:
+            key = self.rendered_key(request.GET)
+            hit = self.rendered.get(key) if key else None
+            if hit is not None and self._passes_checks(request, *args, **kwargs):
+                etag, content = hit
+                if etag_matches(request, etag):
+                    response = HttpResponseNotModified()
+                else:
+                    response = HttpResponse(content, content_type='application/json')
+                response['ETag'] = etag
+                return response
+        return super().dispatch(request, *args, **kwargs)
+
+    def _passes_checks(self, request, *args, **kwargs) -> bool:
+        self.args, self.kwargs = args, kwargs
+        self.request = self.initialize_request(request, *args, **kwargs)
+        self.headers = self.default_response_headers
+        try:
+            self.initial(self.request, *args, **kwargs)
+        except APIException:
+            return False
+        return True
+
+    def rendered_response(self, request, content: bytes, key: Optional[Tuple]) -> Response:
+        """
+        200 (or 304) response for a freshly encoded body with its ETag.
+
+        The body is stored under `key` unless it is None.
+        """
+        etag = self.rendered.set(key, content) if key else make_etag(content)
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+        return Response(content, status=status.HTTP_200_OK, headers={'ETag': etag})
+
+
+def has_current_aqi(result: Dict) -> bool:
+    """Whether an AQ or JASPR result is worth a RenderedCache entry: no error and a current AQI."""
+    return 'error' not in result and (result.get('current') or {}).get('aqi') is not None
+
+
+def parse_coordinates(params) -> Optional[Tuple[float, float]]:
+    """Valid (lat, lon) from query parameters, or None."""
+    try:
+        lat, lon = float(params['lat']), float(params['lon'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return (lat, lon) if validate_coordinates(lat, lon)[0] else None
@@ -41,11 +41,22 @@ class ForecastItemSerializer(serializers.Serializer):
     sources = serializers.ListField(child=serializers.CharField(), required=False)
 
 
+class DailyForecastItemSerializer(serializers.Serializer):
+    """Serializer for a single day of the blended forecast."""
+    date = serializers.DateField()
+    aqi = serializers.IntegerField()
+    aqi_avg = serializers.IntegerField()
+    category = serializers.CharField()
+    hours = serializers.IntegerField()
+    sources = serializers.ListField(child=serializers.CharField(), required=False)
+
+
 class AirQualityResponseSerializer(serializers.Serializer):
     """Main response serializer for air quality endpoint."""
     location = LocationSerializer()
     current = CurrentAirQualitySerializer()
     forecast = ForecastItemSerializer(many=True, required=False)
+    forecast_daily = DailyForecastItemSerializer(many=True, required=False)
     health_advice = serializers.CharField(required=False)
     source_details = serializers.ListField(required=False)
 
@@ -10,18 +10,36 @@ from django.shortcuts import render
 from django.views import View
 
 from apps.core.utils import validate_coordinates
+from .rendering import RenderedResponseMixin, has_current_aqi, parse_coordinates, render_json
 from .orchestrator import AirQualityOrchestrator
 from .serializers import AirQualityResponseSerializer, ErrorSerializer
 
 logger = logging.getLogger(__name__)
 
 
-class AirQualityView(APIView):
+def air_quality_key(params):
+    """RenderedCache key of an air quality request: (lat, lon, include_forecast, radius_km)."""
+    coordinates = parse_coordinates(params)
+    if coordinates is None or params.get('no_cache', 'false').lower() == 'true':
+        return None
+    try:
+        radius_km = float(params.get('radius_km', 25))
+    except (TypeError, ValueError):
+        return None
+    if radius_km <= 0:
+        return None
+    include_forecast = params.get('include_forecast', 'false').lower() == 'true'
+    return (*coordinates, include_forecast, min(radius_km, 100))
+
+
+class AirQualityView(RenderedResponseMixin, APIView):
     """
     Main endpoint for fetching air quality data.
     
     GET /api/v1/air-quality/?lat=34.05&lon=-118.24&include_forecast=true
     """
+    rendered_view = 'aq'
+    rendered_key = staticmethod(air_quality_key)
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -94,13 +112,13 @@ class AirQualityView(APIView):
                 use_cache=not no_cache
             )
             
-            # Serialize and return
-            serializer = AirQualityResponseSerializer(data=result)
-            if serializer.is_valid():
-                return Response(serializer.data, status=status.HTTP_200_OK)
-            else:
-                # Return raw result if serialization fails
+            # Project and encode (our own payload, so no input validation)
+            content = render_json(AirQualityResponseSerializer, result)
+            if content is None:
+                # Return raw result if it doesn't fit the serializer
                 return Response(result, status=status.HTTP_200_OK)
+            key = air_quality_key(request.query_params) if has_current_aqi(result) else None
+            return self.rendered_response(request, content, key)
             
         except Exception as e:
             logger.error(f"Error fetching air quality data: {e}", exc_info=True)
@@ -170,6 +188,8 @@ class SourcesView(APIView):
     def get(self, request):
         """List all data sources and their health status."""
         from apps.adapters.models import AdapterStatus
+        from apps.adapters.quota import get_quota
+        from apps.core import metrics
         from apps.core.models import DataSource
 
         sources = []
@@ -197,7 +217,7 @@ class SourcesView(APIView):
                     'consecutive_failures': 0,
                 }
 
-            sources.append({
+            source_info = {
                 'code': data_source.code,
                 'name': data_source.name,
                 'type': data_source.source_type,
@@ -205,7 +225,12 @@ class SourcesView(APIView):
                 'countries': data_source.countries_covered,
                 'trust_weight': data_source.default_trust_weight,
                 'status': health_status,
-            })
+                'metrics': metrics.get_counters(data_source.code),
+            }
+            quota = get_quota(data_source.code)
+            if quota is not None:
+                source_info['quota'] = quota.status()
+            sources.append(source_info)
 
         return Response({'sources': sources})
 
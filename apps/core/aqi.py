@@ -0,0 +1,249 @@
+"""
+AQI calculations from pollutant concentrations.
+
+Breakpoint and category tables are compiled once at import into parallel
+tuples, so converting a concentration is one truncation, one bisect and
+one linear interpolation. Batch helpers convert whole hourly series with
+the per-pollutant tables bound once.
+
+Concentrations use the EPA reporting units (µg/m³ for particulates, ppb
+for NO2/SO2, ppm for O3/CO) unless `ugm3=True`, in which case gases in
+µg/m³ (as Open-Meteo and OpenWeatherMap report them) are converted at
+25 °C first.
+"""
+from bisect import bisect_left
+from math import exp, floor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .constants import AQHI_CATEGORIES, EPA_AQI_CATEGORIES
+
+# US EPA breakpoints (2024 revision: PM2.5 "Good" ends at 9.0 µg/m³).
+# pollutant: (decimals kept when truncating, [(C_low, C_high, I_low, I_high), ...])
+EPA_BREAKPOINTS = {
+    'pm25': (1, [  # 24-hour, µg/m³
+        (0.0, 9.0, 0, 50),
+        (9.1, 35.4, 51, 100),
+        (35.5, 55.4, 101, 150),
+        (55.5, 125.4, 151, 200),
+        (125.5, 225.4, 201, 300),
+        (225.5, 325.4, 301, 500),
+    ]),
+    'pm10': (0, [  # 24-hour, µg/m³
+        (0, 54, 0, 50),
+        (55, 154, 51, 100),
+        (155, 254, 101, 150),
+        (255, 354, 151, 200),
+        (355, 424, 201, 300),
+        (425, 604, 301, 500),
+    ]),
+    # 8-hour, ppm. The EPA 8-hour table ends at 0.200 (above it only 1-hour
+    # values are defined), so higher 8-hour input is reported as MAX_INDEX.
+    'o3': (3, [
+        (0.000, 0.054, 0, 50),
+        (0.055, 0.070, 51, 100),
+        (0.071, 0.085, 101, 150),
+        (0.086, 0.105, 151, 200),
+        (0.106, 0.200, 201, 300),
+    ]),
+    'no2': (0, [  # 1-hour, ppb
+        (0, 53, 0, 50),
+        (54, 100, 51, 100),
+        (101, 360, 101, 150),
+        (361, 649, 151, 200),
+        (650, 1249, 201, 300),
+        (1250, 2049, 301, 500),
+    ]),
+    'so2': (0, [  # 1-hour, ppb
+        (0, 35, 0, 50),
+        (36, 75, 51, 100),
+        (76, 185, 101, 150),
+        (186, 304, 151, 200),
+        (305, 604, 201, 300),
+        (605, 1004, 301, 500),
+    ]),
+    'co': (1, [  # 8-hour, ppm
+        (0.0, 4.4, 0, 50),
+        (4.5, 9.4, 51, 100),
+        (9.5, 12.4, 101, 150),
+        (12.5, 15.4, 151, 200),
+        (15.5, 30.4, 201, 300),
+        (30.5, 50.4, 301, 500),
+    ]),
+}
+
+POLLUTANT_KEYS = tuple(EPA_BREAKPOINTS)
+
+# µg/m³ -> EPA reporting unit at 25 °C (24.45 L/mol / molecular weight)
+UGM3_TO_EPA_UNITS = {
+    'pm25': 1.0,
+    'pm10': 1.0,
+    'o3': 24.45 / 48.00 / 1000,   # ppm
+    'no2': 24.45 / 46.01,         # ppb
+    'so2': 24.45 / 64.07,         # ppb
+    'co': 24.45 / 28.01 / 1000,   # ppm
+}
+
+MAX_INDEX = 500
+
+
+class _Table:
+    """One pollutant's breakpoints as parallel tuples for bisect lookup."""
+    __slots__ = ('scale', 'highs', 'segments')
+
+    def __init__(self, decimals: int, rows: Sequence[Tuple]):
+        self.scale = 10 ** decimals
+        self.highs = tuple(c_high for _, c_high, _, _ in rows)
+        # Precompute slope per segment: I = I_low + slope * (C - C_low)
+        self.segments = tuple(
+            (c_low, i_low, (i_high - i_low) / (c_high - c_low))
+            for c_low, c_high, i_low, i_high in rows
+        )
+
+    def index(self, concentration: float) -> int:
+        if concentration <= 0:
+            return 0
+        # EPA truncates to the reporting precision; the epsilon absorbs
+        # binary representation error (0.07 * 1000 == 70.00000000000001)
+        scale = self.scale
+        c = int(concentration * scale + 1e-9) / scale
+        position = bisect_left(self.highs, c)
+        if position == len(self.highs):
+            return MAX_INDEX
+        c_low, i_low, slope = self.segments[position]
+        return int(i_low + slope * (c - c_low) + 0.5)
+
+
+_TABLES = {name: _Table(decimals, rows) for name, (decimals, rows) in EPA_BREAKPOINTS.items()}
+
+
+def sub_index(pollutant: str, concentration: Optional[float], ugm3: bool = False) -> Optional[int]:
+    """
+    EPA sub-index for one pollutant concentration.
+
+    Returns None for a missing concentration or unknown pollutant.
+    Concentrations above the table are reported as 500.
+    """
+    table = _TABLES.get(pollutant)
+    if table is None or concentration is None:
+        return None
+    if ugm3:
+        concentration *= UGM3_TO_EPA_UNITS[pollutant]
+    return table.index(concentration)
+
+
+def sub_indices(pollutant: str, concentrations: Iterable[Optional[float]], ugm3: bool = False) -> List[Optional[int]]:
+    """Batch form of sub_index for a whole series (None entries stay None)."""
+    table = _TABLES.get(pollutant)
+    if table is None:
+        return [None for _ in concentrations]
+    index = table.index
+    factor = UGM3_TO_EPA_UNITS[pollutant] if ugm3 else 1.0
+    return [None if c is None else index(c * factor) for c in concentrations]
+
+
+def aqi_from_concentrations(
+    concentrations: Dict[str, Optional[float]], ugm3: bool = False
+) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Overall AQI and dominant pollutant from per-pollutant concentrations.
+
+    The AQI is the highest sub-index; ties go to the first pollutant in
+    POLLUTANT_KEYS order. Returns (None, None) if nothing is computable.
+    """
+    best, dominant = None, None
+    for pollutant in POLLUTANT_KEYS:
+        value = sub_index(pollutant, concentrations.get(pollutant), ugm3=ugm3)
+        if value is not None and (best is None or value > best):
+            best, dominant = value, pollutant
+    return best, dominant
+
+
+def series_aqi(
+    series: Dict[str, Sequence[Optional[float]]], length: int, ugm3: bool = False
+) -> Tuple[List[Optional[int]], List[Optional[str]]]:
+    """
+    Overall AQI and dominant pollutant for each step of aligned series.
+
+    Args:
+        series: pollutant key -> concentrations (missing keys are skipped)
+        length: Number of steps to compute (shorter series count as missing)
+        ugm3: Whether gas concentrations are in µg/m³
+
+    Returns:
+        (aqi per step, dominant pollutant per step)
+    """
+    aqi = [None] * length
+    dominant = [None] * length
+    for pollutant in POLLUTANT_KEYS:
+        values = series.get(pollutant)
+        if not values:
+            continue
+        for i, value in enumerate(sub_indices(pollutant, values[:length], ugm3=ugm3)):
+            if value is not None and (aqi[i] is None or value > aqi[i]):
+                aqi[i] = value
+                dominant[i] = pollutant
+    return aqi, dominant
+
+
+class _CategoryTable:
+    """Category dicts indexed by their upper bound for bisect lookup."""
+    __slots__ = ('minimum', 'maxes', 'categories')
+
+    def __init__(self, categories: Sequence[Dict]):
+        self.minimum = categories[0]['min_value']
+        self.maxes = tuple(c['max_value'] for c in categories)
+        self.categories = tuple(categories)
+
+    def lookup(self, value: float) -> Optional[Dict]:
+        if value < self.minimum:
+            return None
+        position = bisect_left(self.maxes, value)
+        if position == len(self.maxes):
+            return None
+        return self.categories[position]
+
+
+_CATEGORY_TABLES = {
+    'EPA': _CategoryTable(EPA_AQI_CATEGORIES),
+    'AQHI': _CategoryTable(AQHI_CATEGORIES),
+}
+
+
+def category(value: Optional[float], scale: str = 'EPA') -> Optional[Dict]:
+    """
+    Category dict for an index value on the given scale.
+
+    Returns None when the value is missing or outside the scale, or the
+    scale is not 'EPA' or 'AQHI'.
+    """
+    table = _CATEGORY_TABLES.get(scale)
+    if value is None or table is None:
+        return None
+    return table.lookup(value)
+
+
+def category_name(aqi: Optional[float]) -> str:
+    """EPA category name, clamping out-of-range values ('unknown' if missing)."""
+    if aqi is None:
+        return 'unknown'
+    return category(min(max(aqi, 0), MAX_INDEX))['category']
+
+
+def aqhi(o3_ppb: float, no2_ppb: float, pm25: float) -> int:
+    """
+    Canadian Air Quality Health Index from 3-hour average concentrations.
+
+    Args:
+        o3_ppb: Ozone in ppb
+        no2_ppb: Nitrogen dioxide in ppb
+        pm25: PM2.5 in µg/m³
+
+    Returns:
+        AQHI rounded to the nearest integer, at least 1
+    """
+    value = (1000 / 10.4) * (
+        (exp(0.000871 * no2_ppb) - 1)
+        + (exp(0.000537 * o3_ppb) - 1)
+        + (exp(0.000487 * pm25) - 1)
+    )
+    return max(1, floor(value + 0.5))
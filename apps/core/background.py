@@ -0,0 +1,65 @@
+"""
+Best-effort background refreshes of cached data.
+
+When a request is answered from approximate cached data (e.g. a
+neighbouring cell), the true value is recomputed off the request path so
+the next request hits it. Refreshes run on a small process-wide thread
+pool (CACHE_SETTINGS BACKGROUND_REFRESH_WORKERS). The same key is
+refreshed at most once at a time fleet-wide: a short lock is claimed with
+cache.add(), so other workers skip it.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+# How long a refresh holds its key (longer than any refresh should take)
+_LOCK_TIMEOUT = 60
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = getattr(settings, 'CACHE_SETTINGS', {}).get('BACKGROUND_REFRESH_WORKERS', 2)
+            _executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='refresh')
+        return _executor
+
+
+def _run(lock_key: str, refresh: Callable, args: tuple):
+    try:
+        refresh(*args)
+    except Exception as e:
+        logger.warning(f"Background refresh {lock_key} failed: {e}")
+    finally:
+        try:
+            cache.delete(lock_key)
+        except Exception:
+            pass
+        # Threads of the pool hold their own DB connections
+        close_old_connections()
+
+
+def schedule_refresh(key: str, refresh: Callable, *args) -> bool:
+    """
+    Run refresh(*args) in the background unless key is already being
+    refreshed. Returns whether it was scheduled.
+    """
+    lock_key = f"refresh:{key}"
+    try:
+        if not cache.add(lock_key, 1, timeout=_LOCK_TIMEOUT):
+            return False
+    except Exception as e:
+        logger.warning(f"Background refresh lock failed ({key}): {e}")
+        return False
+    _get_executor().submit(_run, lock_key, refresh, args)
+    return True
@@ -4,16 +4,29 @@ Unified Redis-backed response cache with geohash-based spatial keys.
 Uses django.core.cache (backed by django_redis in production)
 for all cache operations. Falls back gracefully when Redis is
 unavailable — callers proceed to fetch live data on any failure.
+
+Keys of the namespaces in CACHE_SETTINGS INDEXED_NAMESPACES are also
+listed per coarse geohash prefix (KEY_INDEX_PRECISION; a Redis set when
+the backend is django_redis), so every entry
+around a point can be found and evicted (invalidate_within) without
+scanning the keyspace.
 """
 import json
 import logging
+import time
 from datetime import datetime, date
 from decimal import Decimal
-from typing import Optional
+from typing import Iterable, Optional
 
+from django.conf import settings
 from django.core.cache import cache
 
 from . import geohash
+from .utils import calculate_distance_km
+
+# Keys listed per index prefix by the non-Redis fallback; the oldest
+# (most likely expired) are dropped
+_MAX_INDEXED_KEYS = 2048
 
 logger = logging.getLogger(__name__)
 
@@ -61,10 +74,14 @@ class ResponseCache:
         self.namespace = namespace
         self.default_ttl = default_ttl
         self.precision = geohash_precision
+        cache_settings = getattr(settings, 'CACHE_SETTINGS', {})
+        self.indexed = namespace in cache_settings.get('INDEXED_NAMESPACES', ())
 
     def make_key(self, lat: float, lon: float, *extra: str) -> str:
         """Build cache key from coordinates and optional extra segments."""
-        gh = geohash.encode(float(lat), float(lon), self.precision)
+        return self._cell_key(geohash.encode(float(lat), float(lon), self.precision), extra)
+
+    def _cell_key(self, gh: str, extra) -> str:
         parts = [self.namespace, gh]
         if extra:
             parts.extend(str(e) for e in extra)
@@ -85,6 +102,68 @@ class ResponseCache:
             logger.warning(f"Cache read failed ({self.namespace}): {e}")
             return None
 
+    def get_nearby(
+        self,
+        lat: float,
+        lon: float,
+        *extra: str,
+        max_distance_km: float,
+        max_age: Optional[int] = None,
+    ) -> Optional[dict]:
+        """
+        Entry of the nearest of the 8 neighbouring cells, for a miss on the
+        point's own cell. Neighbours are read in one get_many; only those
+        whose cell centre is within max_distance_km of the point count and,
+        with max_age, whose entry's 'cached_at' (ISO timestamp) is at most
+        that many seconds old. Returns None if none qualifies.
+        """
+        try:
+            lat, lon = float(lat), float(lon)
+            candidates = {}
+            for cell in geohash.neighbors(geohash.encode(lat, lon, self.precision)):
+                distance = calculate_distance_km(lat, lon, *geohash.decode(cell))
+                if distance <= max_distance_km:
+                    candidates[self._cell_key(cell, extra)] = distance
+            found = cache.get_many(list(candidates)) if candidates else {}
+        except Exception as e:
+            logger.warning(f"Cache read failed ({self.namespace}): {e}")
+            return None
+
+        nearest, nearest_km = None, None
+        for key, raw in found.items():
+            try:
+                data = json.loads(raw)
+                if max_age is not None:
+                    cached_at = datetime.fromisoformat(data['cached_at']).timestamp()
+                    if time.time() - cached_at > max_age:
+                        continue
+            except (TypeError, ValueError, KeyError):
+                continue
+            if nearest_km is None or candidates[key] < nearest_km:
+                nearest, nearest_km = data, candidates[key]
+        return nearest
+
+    def get_around(self, lat: float, lon: float, *extra: str) -> list:
+        """
+        Entries of the point's cell and its 8 neighbours, in one get_many,
+        for lookups that must not stop at a cell border. Returns [] on
+        backend failure.
+        """
+        try:
+            cell = geohash.encode(float(lat), float(lon), self.precision)
+            keys = [self._cell_key(c, extra) for c in [cell, *geohash.neighbors(cell)]]
+            found = cache.get_many(keys)
+        except Exception as e:
+            logger.warning(f"Cache read failed ({self.namespace}): {e}")
+            return []
+        entries = []
+        for raw in found.values():
+            try:
+                entries.append(json.loads(raw))
+            except (TypeError, ValueError):
+                continue
+        return entries
+
     def set(
         self,
         lat: float,
@@ -101,6 +180,41 @@ class ResponseCache:
             key = self.make_key(lat, lon, *extra)
             raw = json.dumps(data, cls=_CacheEncoder)
             cache.set(key, raw, timeout=ttl or self.default_ttl)
+            if self.indexed:
+                _index_key(self.namespace, key)
+            return True
+        except Exception as e:
+            logger.warning(f"Cache write failed ({self.namespace}): {e}")
+            return False
+
+    def get_raw(self, lat: float, lon: float, *extra: str):
+        """
+        Get a value stored with set_raw, as-is (no JSON decoding).
+        Returns None on miss or backend failure.
+        """
+        try:
+            return cache.get(self.make_key(lat, lon, *extra))
+        except Exception as e:
+            logger.warning(f"Cache read failed ({self.namespace}): {e}")
+            return None
+
+    def set_raw(
+        self,
+        lat: float,
+        lon: float,
+        value,
+        *extra: str,
+        ttl: int = None,
+    ) -> bool:
+        """
+        Cache a value without JSON encoding (e.g. already encoded bytes).
+        Returns False on failure (non-fatal).
+        """
+        try:
+            key = self.make_key(lat, lon, *extra)
+            cache.set(key, value, timeout=ttl or self.default_ttl)
+            if self.indexed:
+                _index_key(self.namespace, key)
             return True
         except Exception as e:
             logger.warning(f"Cache write failed ({self.namespace}): {e}")
@@ -115,3 +229,103 @@ class ResponseCache:
         except Exception as e:
             logger.warning(f"Cache delete failed ({self.namespace}): {e}")
             return False
+
+
+def _index_precision() -> int:
+    return getattr(settings, 'CACHE_SETTINGS', {}).get('KEY_INDEX_PRECISION', 4)
+
+
+def _index_ttl() -> int:
+    return getattr(settings, 'CACHE_SETTINGS', {}).get('KEY_INDEX_TTL', 7200)
+
+
+def _index_name(namespace: str, prefix: str) -> str:
+    return f"idx:{namespace}:{prefix}"
+
+
+def _redis_connection():
+    """Raw client of the default cache if it is django_redis, else None."""
+    try:
+        from django_redis import get_redis_connection
+    except ImportError:
+        return None
+    try:
+        return get_redis_connection('default')
+    except NotImplementedError:
+        return None
+
+
+def _index_key(namespace: str, key: str):
+    """
+    List a key under its namespace's geohash-prefix index.
+
+    On Redis the index is a set updated with SADD + EXPIRE, so concurrent
+    writers cannot drop each other's keys. Other backends keep a capped
+    list with a read-modify-write, where a concurrent write may be lost
+    (that entry then simply expires on its own TTL). Raises on backend
+    failure (callers treat it like a failed write).
+    """
+    cell = key.split(':')[1]
+    name = _index_name(namespace, cell[:_index_precision()])
+    conn = _redis_connection()
+    if conn is not None:
+        raw_name = cache.make_key(name)
+        pipe = conn.pipeline()
+        pipe.sadd(raw_name, key)
+        pipe.expire(raw_name, _index_ttl())
+        pipe.execute()
+        return
+    keys = [k for k in (cache.get(name) or []) if k != key]
+    keys.append(key)
+    cache.set(name, keys[-_MAX_INDEXED_KEYS:], timeout=_index_ttl())
+
+
+def _within(key: str, lat: float, lon: float, radius_km: float) -> bool:
+    return calculate_distance_km(lat, lon, *geohash.decode(key.split(':')[1])) <= radius_km
+
+
+def invalidate_within(
+    namespaces: Iterable[str],
+    lat: float,
+    lon: float,
+    radius_km: float,
+) -> int:
+    """
+    Evict every indexed entry whose geohash cell centre is within radius_km
+    of (lat, lon), e.g. after a station nearby changed significantly.
+
+    Only namespaces in CACHE_SETTINGS INDEXED_NAMESPACES can be found.
+    Returns the number of keys evicted.
+    """
+    evicted = 0
+    conn = _redis_connection()
+    prefixes = geohash.cells_within(lat, lon, radius_km, _index_precision())
+    for namespace in namespaces:
+        for prefix in prefixes:
+            name = _index_name(namespace, prefix)
+            try:
+                if conn is not None:
+                    raw_name = cache.make_key(name)
+                    keys = [
+                        k.decode() if isinstance(k, bytes) else k
+                        for k in conn.smembers(raw_name)
+                    ]
+                else:
+                    keys = cache.get(name) or []
+                doomed = [key for key in keys if _within(key, lat, lon, radius_km)]
+                if not doomed:
+                    continue
+                cache.delete_many(doomed)
+                if conn is not None:
+                    # Only the evicted members: keys added meanwhile stay listed
+                    conn.srem(raw_name, *doomed)
+                else:
+                    remaining = [key for key in keys if key not in doomed]
+                    if remaining:
+                        cache.set(name, remaining, timeout=_index_ttl())
+                    else:
+                        cache.delete(name)
+                evicted += len(doomed)
+            except Exception as e:
+                logger.warning(f"Cache invalidation failed ({namespace}:{prefix}): {e}")
+    return evicted
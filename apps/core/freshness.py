@@ -0,0 +1,90 @@
+"""
+Cache expiry from upstream publish schedules.
+
+Sources publish new readings on known cadences: AirNow posts hourly
+averages some time after each hour ends, Open-Meteo serves hourly model
+values, PurpleAir sensors report every ~2 minutes. Rather than a fixed TTL,
+data from a source is cached until shortly after the source is next
+expected to publish (settings.PUBLISH_SCHEDULES):
+
+    next update = observed_at + LAG + INTERVAL
+
+rolled forward by whole intervals if that moment has already passed, plus
+GRACE seconds for the upstream to actually post. Without a data timestamp
+the schedule's wall-clock slots (multiples of INTERVAL, offset by LAG) are
+used. Blended data expires with the earliest of its inputs.
+"""
+import math
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from django.conf import settings
+from django.utils import timezone
+
+Timestamp = Union[datetime, str, None]
+
+
+def _schedule(source: str) -> Optional[Dict]:
+    return getattr(settings, 'PUBLISH_SCHEDULES', {}).get('SOURCES', {}).get(source)
+
+
+def _parse(observed_at: Timestamp) -> Optional[datetime]:
+    if isinstance(observed_at, str):
+        try:
+            observed_at = datetime.fromisoformat(observed_at.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if isinstance(observed_at, datetime) and timezone.is_naive(observed_at):
+        observed_at = timezone.make_aware(observed_at)
+    return observed_at if isinstance(observed_at, datetime) else None
+
+
+def next_update(source: str, observed_at: Timestamp = None, now: Optional[datetime] = None) -> Optional[float]:
+    """
+    When (epoch seconds) the source is next expected to publish data newer
+    than observed_at, or None if the source has no schedule.
+    """
+    schedule = _schedule(source)
+    if not schedule:
+        return None
+    interval = max(1, schedule.get('INTERVAL', 3600))
+    lag = schedule.get('LAG', 0)
+    now_ts = (now or timezone.now()).timestamp()
+
+    observed_at = _parse(observed_at)
+    expected = observed_at.timestamp() + lag + interval if observed_at else lag
+    if expected <= now_ts:
+        expected += (math.floor((now_ts - expected) / interval) + 1) * interval
+    return expected
+
+
+def expires_in(
+    source: str,
+    observed_at: Timestamp = None,
+    default: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> Optional[int]:
+    """
+    Seconds to cache data from a source: until GRACE after its next expected
+    update, within MIN_TTL..MAX_TTL. default for sources without a schedule.
+    """
+    expected = next_update(source, observed_at, now)
+    if expected is None:
+        return default
+    schedules = getattr(settings, 'PUBLISH_SCHEDULES', {})
+    grace = _schedule(source).get('GRACE', schedules.get('GRACE_SECONDS', 300))
+    ttl = expected + grace - (now or timezone.now()).timestamp()
+    return int(min(max(ttl, schedules.get('MIN_TTL', 60)), schedules.get('MAX_TTL', 3600)))
+
+
+def earliest_expiry(
+    readings: Iterable[Tuple[str, Timestamp]],
+    default: int,
+    now: Optional[datetime] = None,
+) -> int:
+    """
+    TTL of data blended from (source, observed_at) readings: the earliest
+    of their expiries. Sources without a schedule count as default.
+    """
+    ttls = [expires_in(source, observed_at, default, now) for source, observed_at in readings]
+    return min(ttls) if ttls else default
@@ -1,5 +1,5 @@
 """
-Pure-Python geohash encoding for spatial cache key generation.
+Pure-Python geohash encoding and decoding for spatial cache keys.
 
 Geohash encodes a (lat, lon) coordinate into a short string where
 nearby points share a common prefix. At precision 6, cells are
@@ -7,6 +7,7 @@ approximately 1.2km x 0.6km.
 
 No external dependencies required.
 """
+import math
 
 _BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
 
@@ -57,3 +58,87 @@ def encode(lat: float, lon: float, precision: int = 6) -> str:
             bit_count = 0
 
     return ''.join(result)
+
+
+def decode_bbox(gh: str) -> tuple:
+    """
+    Bounding box of a geohash cell.
+
+    Returns:
+        (lat_min, lat_max, lon_min, lon_max)
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    is_lon = True
+
+    for char in gh:
+        bits = _BASE32.index(char)
+        for shift in range(4, -1, -1):
+            bit = (bits >> shift) & 1
+            rng = lon_range if is_lon else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            rng[1 - bit] = mid
+            is_lon = not is_lon
+
+    return lat_range[0], lat_range[1], lon_range[0], lon_range[1]
+
+
+def decode(gh: str) -> tuple:
+    """Centre (lat, lon) of a geohash cell."""
+    lat_min, lat_max, lon_min, lon_max = decode_bbox(gh)
+    return (lat_min + lat_max) / 2, (lon_min + lon_max) / 2
+
+
+def cells_within(lat: float, lon: float, radius_km: float, precision: int) -> set:
+    """
+    Geohash cells of the given precision overlapping the bounding box of a
+    circle around (lat, lon). A superset of the cells within radius_km.
+    """
+    lon_bits = (5 * precision + 1) // 2
+    lat_step = 180.0 / (1 << (5 * precision - lon_bits))
+    lon_step = 360.0 / (1 << lon_bits)
+
+    lat_delta = radius_km / 111.0
+    cos_lat = max(math.cos(math.radians(lat)), 0.01)
+    lon_delta = min(radius_km / (111.0 * cos_lat), 180.0)
+
+    cells = set()
+    cell_lat = max(-90.0, lat - lat_delta)
+    while True:
+        cell_lon = lon - lon_delta
+        while True:
+            wrapped = (cell_lon + 180.0) % 360.0 - 180.0
+            cells.add(encode(min(cell_lat, 89.999999), wrapped, precision))
+            if cell_lon >= lon + lon_delta:
+                break
+            cell_lon = min(cell_lon + lon_step, lon + lon_delta)
+        if cell_lat >= min(90.0, lat + lat_delta):
+            break
+        cell_lat = min(cell_lat + lat_step, lat + lat_delta, 90.0)
+    return cells
+
+
+def neighbors(gh: str) -> list:
+    """
+    The (up to) 8 cells surrounding a geohash cell, at its precision.
+
+    Longitude wraps around the antimeridian; there are no cells beyond the
+    poles.
+    """
+    lat_min, lat_max, lon_min, lon_max = decode_bbox(gh)
+    lat_step, lon_step = lat_max - lat_min, lon_max - lon_min
+    lat, lon = (lat_min + lat_max) / 2, (lon_min + lon_max) / 2
+
+    cells = []
+    for d_lat in (1, 0, -1):
+        cell_lat = lat + d_lat * lat_step
+        if not -90.0 < cell_lat < 90.0:
+            continue
+        for d_lon in (-1, 0, 1):
+            if d_lat == 0 and d_lon == 0:
+                continue
+            cell_lon = (lon + d_lon * lon_step + 180.0) % 360.0 - 180.0
+            cell = encode(cell_lat, cell_lon, len(gh))
+            if cell != gh and cell not in cells:
+                cells.append(cell)
+    return cells
@@ -0,0 +1,39 @@
+"""
+Management command to evict cached entries around a point.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.core.cache import invalidate_within
+
+
+class Command(BaseCommand):
+    help = 'Evict indexed cache entries (aq, jaspr, ...) within a radius of a point'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lat', type=float, required=True, help='Latitude of the changed station or area')
+        parser.add_argument('--lon', type=float, required=True, help='Longitude of the changed station or area')
+        parser.add_argument(
+            '--radius-km', type=float, default=None,
+            help='Radius to evict (default: CACHE_SETTINGS INVALIDATION_RADIUS_KM)',
+        )
+        parser.add_argument(
+            '--namespace', action='append', dest='namespaces',
+            help='Namespace to evict; repeatable (default: CACHE_SETTINGS INVALIDATION_NAMESPACES)',
+        )
+
+    def handle(self, *args, **options):
+        cache_settings = getattr(settings, 'CACHE_SETTINGS', {})
+        radius_km = options['radius_km'] or cache_settings.get('INVALIDATION_RADIUS_KM', 25)
+        namespaces = options['namespaces'] or cache_settings.get('INVALIDATION_NAMESPACES', ())
+
+        unindexed = set(namespaces) - set(cache_settings.get('INDEXED_NAMESPACES', ()))
+        if unindexed:
+            self.stdout.write(self.style.WARNING(
+                f"Not indexed, nothing to find: {', '.join(sorted(unindexed))}"
+            ))
+
+        evicted = invalidate_within(namespaces, options['lat'], options['lon'], radius_km)
+        self.stdout.write(self.style.SUCCESS(
+            f"Evicted {evicted} entries within {radius_km}km of ({options['lat']}, {options['lon']})"
+        ))
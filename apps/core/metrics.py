@@ -0,0 +1,74 @@
+"""
+Lightweight operational counters kept in the shared cache.
+
+Counters are grouped per data source and bucketed per UTC day, so every
+worker increments the same Redis key and the numbers survive restarts.
+All operations are best-effort: a cache failure never affects a request.
+
+Usage::
+
+    from apps.core import metrics
+
+    metrics.increment('PURPLEAIR', 'retries')
+    metrics.get_counters('PURPLEAIR')   # {'retries': 3, ...}
+"""
+import logging
+from datetime import datetime, timezone as dt_timezone
+from typing import Dict, Iterable, Optional
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Counters are kept for two days so "today" is always complete.
+_COUNTER_TTL = 2 * 86400
+
+# Counter names reported by get_counters() when no names are given.
+KNOWN_COUNTERS = (
+    'requests',
+    'retries',
+    'retries_budget_exhausted',
+    'retries_deadline_exceeded',
+    'retry_after_honoured',
+    'quota_used',
+    'quota_exhausted',
+    'http_cache_hits',
+    'http_cache_revalidated',
+    'negative_cache_hits',
+    'station_cache_hits',
+    'station_lookups',
+    'hedge_eligible',
+    'hedges',
+    'hedge_requests',
+    'hedge_wins',
+)
+
+
+def _day() -> str:
+    return datetime.now(dt_timezone.utc).strftime('%Y%m%d')
+
+
+def _key(source: str, name: str, day: str) -> str:
+    return f"metrics:{day}:{source}:{name}"
+
+
+def increment(source: str, name: str, amount: int = 1) -> None:
+    """Increment a counter for a source (non-fatal on cache failure)."""
+    key = _key(source, name, _day())
+    try:
+        cache.add(key, 0, timeout=_COUNTER_TTL)
+        cache.incr(key, amount)
+    except Exception as e:
+        logger.debug(f"Metric increment failed ({source}:{name}): {e}")
+
+
+def get_counters(source: str, names: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """Return today's counters for a source. Missing counters read as 0."""
+    names = tuple(names or KNOWN_COUNTERS)
+    day = _day()
+    try:
+        values = cache.get_many([_key(source, n, day) for n in names])
+    except Exception as e:
+        logger.debug(f"Metric read failed ({source}): {e}")
+        values = {}
+    return {n: values.get(_key(source, n, day), 0) for n in names}
@@ -5,6 +5,8 @@ import math
 from datetime import datetime, timedelta
 from django.utils import timezone
 
+from .aqi import category
+
 
 def calculate_distance_km(lat1, lon1, lat2, lon2):
     """
@@ -125,15 +127,7 @@ def convert_aqi_to_category(aqi, scale='EPA'):
     except (TypeError, ValueError):
         return None
 
-    from .constants import EPA_AQI_CATEGORIES, AQHI_CATEGORIES
-
-    categories = EPA_AQI_CATEGORIES if scale == 'EPA' else AQHI_CATEGORIES
-
-    for category in categories:
-        if category['min_value'] <= aqi <= category['max_value']:
-            return category
-
-    return None
+    return category(aqi, scale=scale)
 
 
 def validate_coordinates(lat, lon):
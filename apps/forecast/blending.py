@@ -0,0 +1,274 @@
+"""
+Forecast fusion onto a common hourly time axis.
+
+Source forecasts arrive at different resolutions (AirNow: one AQI per day
+and pollutant; OpenWeatherMap and Open-Meteo: hourly) and horizons. Each
+record is parsed once into a ForecastPoint, then every source is laid out
+as an array over the same hourly axis starting at the current hour. Short
+gaps are interpolated per source, and each hour is a weighted mean across
+sources: trust weight (AIR_QUALITY_SETTINGS SOURCE_WEIGHTS) times a per-source
+lead-time decay, with interpolated values discounted.
+"""
+import logging
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.core.aqi import category_name
+
+logger = logging.getLogger(__name__)
+
+HOUR = timedelta(hours=1)
+
+
+@dataclass(slots=True)
+class ForecastPoint:
+    """One parsed source forecast value covering `period_hours` from `timestamp`."""
+    source: str
+    timestamp: datetime
+    aqi: Optional[float]
+    pollutants: Dict[str, float] = field(default_factory=dict)
+    period_hours: int = 1
+
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """Parse an ISO string or datetime into an aware datetime (None if invalid)."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if not timezone.is_aware(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def parse_forecasts(forecast_list: Iterable[Dict], now: datetime) -> List[ForecastPoint]:
+    """
+    Parse adapter forecast dicts once, dropping periods that have ended.
+
+    Timestamps are floored to the hour.
+    """
+    current_hour = now.replace(minute=0, second=0, microsecond=0)
+    points = []
+    for forecast in forecast_list:
+        timestamp = parse_timestamp(forecast.get('timestamp'))
+        if timestamp is None:
+            continue
+        timestamp = timestamp.replace(minute=0, second=0, microsecond=0)
+        period_hours = max(1, int(forecast.get('period_hours') or 1))
+        if timestamp + period_hours * HOUR <= current_hour:
+            continue
+        aqi = forecast.get('aqi')
+        if not isinstance(aqi, (int, float)) or aqi < 0:
+            aqi = None  # AirNow reports -1 for "no forecast"
+        pollutants = {k: v for k, v in (forecast.get('pollutants') or {}).items() if v is not None}
+        points.append(ForecastPoint(
+            source=forecast.get('source', 'UNKNOWN'),
+            timestamp=timestamp,
+            aqi=aqi,
+            pollutants=pollutants,
+            period_hours=period_hours,
+        ))
+    return points
+
+
+def interpolate_gaps(values: List[Optional[float]], max_gap: int) -> List[bool]:
+    """
+    Linearly fill interior runs of None no longer than `max_gap`, in place.
+
+    Leading and trailing gaps are never extrapolated. Returns a parallel
+    list flagging the filled positions.
+    """
+    filled = [False] * len(values)
+    previous = None
+    for i, value in enumerate(values):
+        if value is None:
+            continue
+        if previous is not None and 1 < i - previous <= max_gap + 1:
+            start = values[previous]
+            step = (value - start) / (i - previous)
+            for j in range(previous + 1, i):
+                values[j] = start + step * (j - previous)
+                filled[j] = True
+        previous = i
+    return filled
+
+
+class _SourceSeries:
+    """One source's AQI and pollutant arrays over the common axis."""
+    __slots__ = ('aqi', 'pollutants', 'aqi_filled', 'pollutants_filled')
+
+    def __init__(self, length: int):
+        self.aqi: List[Optional[float]] = [None] * length
+        self.pollutants: Dict[str, List[Optional[float]]] = {}
+        self.aqi_filled: List[bool] = []
+        self.pollutants_filled: Dict[str, List[bool]] = {}
+
+
+class ForecastBlender:
+    """
+    Blend parsed source forecasts into hourly and daily series.
+
+    Settings (FORECAST_SETTINGS):
+        HOURLY_HOURS: Length of the hourly series
+        DAILY_DAYS: Length of the daily series (also the axis horizon)
+        MAX_INTERPOLATION_GAP_HOURS: Longest gap filled per source
+        INTERPOLATED_WEIGHT: Weight multiplier for interpolated values
+        LEAD_TIME_HALF_LIFE_HOURS: Per-source hours until weight halves
+        DEFAULT_HALF_LIFE_HOURS: Half-life for unlisted sources
+    """
+
+    def __init__(self):
+        forecast_settings = getattr(settings, 'FORECAST_SETTINGS', {})
+        self.hourly_hours = forecast_settings.get('HOURLY_HOURS', 48)
+        self.daily_days = forecast_settings.get('DAILY_DAYS', 10)
+        self.max_gap = forecast_settings.get('MAX_INTERPOLATION_GAP_HOURS', 6)
+        self.interpolated_weight = forecast_settings.get('INTERPOLATED_WEIGHT', 0.5)
+        self.half_lives = forecast_settings.get('LEAD_TIME_HALF_LIFE_HOURS', {})
+        self.default_half_life = forecast_settings.get('DEFAULT_HALF_LIFE_HOURS', 48)
+        self.trust_weights = settings.AIR_QUALITY_SETTINGS.get('SOURCE_WEIGHTS', {})
+
+    def blend(self, points: List[ForecastPoint], now: datetime = None) -> Dict[str, List[Dict]]:
+        """
+        Blend forecast points.
+
+        Returns:
+            {'hourly': [...], 'daily': [...]}, each sorted by time
+        """
+        now = now or timezone.now()
+        origin = now.replace(minute=0, second=0, microsecond=0)
+        length = max(self.hourly_hours, self.daily_days * 24)
+
+        series = self._align(points, origin, length)
+        if not series:
+            return {'hourly': [], 'daily': []}
+
+        hourly = self._blend_hours(series, origin, length)
+        return {
+            'hourly': [h for h in hourly[:self.hourly_hours] if h is not None],
+            'daily': self._daily(hourly),
+        }
+
+    def _align(self, points: List[ForecastPoint], origin: datetime, length: int) -> Dict[str, _SourceSeries]:
+        """Lay each source out on the hourly axis in one pass, then fill gaps."""
+        series: Dict[str, _SourceSeries] = {}
+        for point in points:
+            offset = int((point.timestamp - origin).total_seconds() // 3600)
+            source = series.get(point.source)
+            if source is None:
+                source = series[point.source] = _SourceSeries(length)
+            for h in range(max(0, offset), min(length, offset + point.period_hours)):
+                # Several records for one hour (AirNow: one per pollutant)
+                # combine like sub-indices: the highest AQI wins
+                if point.aqi is not None and (source.aqi[h] is None or point.aqi > source.aqi[h]):
+                    source.aqi[h] = point.aqi
+                for pollutant, value in point.pollutants.items():
+                    column = source.pollutants.get(pollutant)
+                    if column is None:
+                        column = source.pollutants[pollutant] = [None] * length
+                    if column[h] is None:
+                        column[h] = value
+
+        for source in series.values():
+            source.aqi_filled = interpolate_gaps(source.aqi, self.max_gap)
+            source.pollutants_filled = {
+                pollutant: interpolate_gaps(column, self.max_gap)
+                for pollutant, column in source.pollutants.items()
+            }
+        return series
+
+    def _weights(self, source: str, length: int) -> List[float]:
+        """Trust times lead-time decay for every hour of the axis."""
+        trust = self.trust_weights.get(source, 0.5)
+        half_life = self.half_lives.get(source, self.default_half_life)
+        decay = math.exp(-math.log(2) / half_life) if half_life > 0 else 1.0
+        weights = []
+        weight = trust
+        for _ in range(length):
+            weights.append(weight)
+            weight *= decay
+        return weights
+
+    def _blend_hours(self, series: Dict[str, _SourceSeries], origin: datetime, length: int) -> List[Optional[Dict]]:
+        """Weighted mean across sources for each hour (None where no source has an AQI)."""
+        aqi_sum = [0.0] * length
+        aqi_weight = [0.0] * length
+        pollutant_sums: Dict[str, List[float]] = {}
+        pollutant_weights: Dict[str, List[float]] = {}
+        contributors: List[List[str]] = [[] for _ in range(length)]
+        discount = self.interpolated_weight
+
+        for name, source in series.items():
+            weights = self._weights(name, length)
+            for h, (value, filled, weight) in enumerate(zip(source.aqi, source.aqi_filled, weights)):
+                if value is None:
+                    continue
+                if filled:
+                    weight *= discount
+                aqi_sum[h] += value * weight
+                aqi_weight[h] += weight
+                contributors[h].append(name)
+
+            for pollutant, column in source.pollutants.items():
+                sums = pollutant_sums.setdefault(pollutant, [0.0] * length)
+                totals = pollutant_weights.setdefault(pollutant, [0.0] * length)
+                filled_flags = source.pollutants_filled[pollutant]
+                for h, (value, filled, weight) in enumerate(zip(column, filled_flags, weights)):
+                    if value is None:
+                        continue
+                    if filled:
+                        weight *= discount
+                    sums[h] += value * weight
+                    totals[h] += weight
+
+        hourly: List[Optional[Dict]] = []
+        for h in range(length):
+            if aqi_weight[h] <= 0:
+                hourly.append(None)
+                continue
+            aqi = round(aqi_sum[h] / aqi_weight[h])
+            sources = sorted(set(contributors[h]))
+            hourly.append({
+                'timestamp': (origin + h * HOUR).isoformat(),
+                'aqi': aqi,
+                'category': category_name(aqi),
+                'pollutants': {
+                    pollutant: round(sums[h] / pollutant_weights[pollutant][h], 2)
+                    for pollutant, sums in pollutant_sums.items()
+                    if pollutant_weights[pollutant][h] > 0
+                },
+                'sources': sources,
+                'source_count': len(sources),
+            })
+        return hourly
+
+    def _daily(self, hourly: List[Optional[Dict]]) -> List[Dict]:
+        """Summarize blended hours per local calendar day (AQI = daily max)."""
+        days: Dict[str, Tuple[List[int], set]] = {}
+        for hour in hourly:
+            if hour is None:
+                continue
+            day = timezone.localtime(datetime.fromisoformat(hour['timestamp'])).date().isoformat()
+            values, sources = days.setdefault(day, ([], set()))
+            values.append(hour['aqi'])
+            sources.update(hour['sources'])
+
+        daily = []
+        for day, (values, sources) in sorted(days.items())[:self.daily_days]:
+            aqi_max = max(values)
+            daily.append({
+                'date': day,
+                'aqi': aqi_max,
+                'aqi_avg': round(sum(values) / len(values)),
+                'category': category_name(aqi_max),
+                'hours': len(values),
+                'sources': sorted(sources),
+            })
+        return daily
@@ -2,14 +2,15 @@
 Forecast aggregation service.
 """
 import logging
-from typing import List, Dict
-from collections import defaultdict
+import time
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import timedelta
 
 from django.utils import timezone
 from django.conf import settings
 
-from apps.core.utils import convert_aqi_to_category
+from apps.core.aqi import category_name
+from .blending import ForecastBlender, ForecastPoint, parse_forecasts, parse_timestamp
 from .models import ForecastData, AggregatedForecast
 
 logger = logging.getLogger(__name__)
@@ -18,6 +19,11 @@ logger = logging.getLogger(__name__)
 class ForecastAggregator:
     """
     Service for aggregating forecast data from multiple sources.
+
+    Besides the blended result, each source's series is cached on its own
+    for the source's current run window (FORECAST_SETTINGS
+    SOURCE_REFRESH_SECONDS), so when the blend expires only sources with a
+    newer run are fetched again.
     """
     
     def __init__(self):
@@ -26,14 +32,42 @@ class ForecastAggregator:
         from apps.core.cache import ResponseCache
         precision = getattr(settings, 'CACHE_SETTINGS', {}).get('GEOHASH_PRECISION', 6)
         self._cache = ResponseCache(namespace='fcst', default_ttl=self.cache_ttl, geohash_precision=precision)
+        self._source_cache = ResponseCache(namespace='fcst_src', geohash_precision=precision)
+        forecast_settings = getattr(settings, 'FORECAST_SETTINGS', {})
+        self.source_refresh = forecast_settings.get('SOURCE_REFRESH_SECONDS', {})
+        self.default_source_refresh = forecast_settings.get('DEFAULT_SOURCE_REFRESH_SECONDS', 3600)
+        self.blender = ForecastBlender()
+
+    def get_cached(self, lat: float, lon: float) -> Optional[Dict[str, List[Dict]]]:
+        """Return the cached blended forecast, or None."""
+        cached = self._get_from_cache(lat, lon)
+        return cached if isinstance(cached, dict) else None
+
+    def _run_window(self, source: str) -> Tuple[int, int]:
+        """Current run window of a source and seconds until the next one."""
+        refresh = max(1, self.source_refresh.get(source, self.default_source_refresh))
+        now = time.time()
+        run = int(now // refresh)
+        return run, max(1, int((run + 1) * refresh - now))
+
+    def get_source_forecast(self, lat: float, lon: float, source: str) -> Optional[List[Dict]]:
+        """Cached series for one source from its current run, or None."""
+        run, _ = self._run_window(source)
+        return self._source_cache.get(lat, lon, source, run)
+
+    def save_source_forecast(self, lat: float, lon: float, source: str, forecasts: List[Dict]):
+        """Cache one source's series until its next run is expected."""
+        run, ttl = self._run_window(source)
+        self._source_cache.set(lat, lon, forecasts, source, run, ttl=ttl)
     
     def aggregate_forecasts(
         self,
         lat: float,
         lon: float,
         forecast_list: List[Dict],
-        use_cache: bool = True
-    ) -> List[Dict]:
+        use_cache: bool = True,
+        fresh_sources: Optional[Set[str]] = None,
+    ) -> Dict[str, List[Dict]]:
         """
         Aggregate forecast data from multiple sources.
         
@@ -42,174 +76,84 @@ class ForecastAggregator:
             lon: Query longitude
             forecast_list: List of forecast dicts from adapters
             use_cache: Whether to use cached results
+            fresh_sources: Sources fetched for this call; only their
+                records are stored (None stores all)
             
         Returns:
-            List of aggregated forecast dicts, sorted by timestamp
+            {'hourly': [...], 'daily': [...]} blended series, sorted by time
         """
         if not forecast_list:
-            return []
+            return {'hourly': [], 'daily': []}
         
         # Check cache
         if use_cache:
             cached = self._get_from_cache(lat, lon)
-            if cached:
+            if isinstance(cached, dict):
                 return cached
         
-        # Parse and store individual forecasts
-        self._store_forecasts(lat, lon, forecast_list)
+        # Parse every record once; storing and blending share the result
+        now = timezone.now()
+        points = parse_forecasts(forecast_list, now)
         
-        # Group forecasts by hour
-        grouped_forecasts = self._group_by_hour(forecast_list)
+        # Store individual forecasts (reused series were stored when fetched)
+        if fresh_sources is None:
+            self._store_forecasts(lat, lon, points)
+        elif fresh_sources:
+            self._store_forecasts(lat, lon, [p for p in points if p.source in fresh_sources])
         
-        # Aggregate each hour
-        aggregated = []
-        for hour_key, forecasts in sorted(grouped_forecasts.items()):
-            agg_forecast = self._aggregate_hour(forecasts)
-            if agg_forecast:
-                aggregated.append(agg_forecast)
+        # Blend onto the common hourly axis
+        aggregated = self.blender.blend(points, now=now)
         
         # Cache the result
         self._save_to_cache(lat, lon, aggregated)
         
         return aggregated
     
-    def _store_forecasts(self, lat: float, lon: float, forecast_list: List[Dict]):
+    def _store_forecasts(self, lat: float, lon: float, points: List[ForecastPoint]):
         """Store individual forecast data points."""
         from decimal import Decimal
-        from datetime import datetime
-        
-        for forecast in forecast_list:
-            try:
-                timestamp_str = forecast.get('timestamp')
-                if not timestamp_str:
-                    continue
-                
-                # Parse timestamp
-                if isinstance(timestamp_str, str):
-                    timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                    if not timezone.is_aware(timestamp):
-                        timestamp = timezone.make_aware(timestamp)
-                else:
-                    timestamp = timestamp_str
-                
-                # Skip past timestamps
-                if timestamp < timezone.now():
-                    continue
-                
-                category_info = convert_aqi_to_category(forecast.get('aqi', 0), scale='EPA')
-                category = category_info['category'] if category_info else 'Unknown'
-                
-                ForecastData.objects.create(
-                    lat=Decimal(str(lat)),
-                    lon=Decimal(str(lon)),
-                    forecast_timestamp=timestamp,
-                    aqi=forecast.get('aqi', 0),
-                    category=category,
-                    pollutants=forecast.get('pollutants', {}),
-                    source=forecast.get('source', 'UNKNOWN'),
-                    confidence_level='medium',
-                )
-                
-            except Exception as e:
-                logger.error(f"Error storing forecast: {e}")
-                continue
-    
-    def _group_by_hour(self, forecast_list: List[Dict]) -> Dict:
-        """Group forecasts by hour."""
-        from datetime import datetime
-        
-        grouped = defaultdict(list)
-        
-        for forecast in forecast_list:
-            try:
-                timestamp_str = forecast.get('timestamp')
-                if not timestamp_str:
-                    continue
-                
-                # Parse timestamp
-                if isinstance(timestamp_str, str):
-                    timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                else:
-                    timestamp = timestamp_str
-                
-                # Round to nearest hour
-                hour_key = timestamp.replace(minute=0, second=0, microsecond=0)
-                grouped[hour_key].append(forecast)
-                
-            except Exception as e:
-                logger.error(f"Error grouping forecast: {e}")
-                continue
-        
-        return grouped
-    
-    def _aggregate_hour(self, forecasts: List[Dict]) -> Dict:
-        """Aggregate forecasts for a single hour using simple averaging."""
-        if not forecasts:
-            return None
-        
-        # Calculate average AQI
-        aqi_values = [f.get('aqi') for f in forecasts if f.get('aqi') is not None]
-        if not aqi_values:
-            return None
-        
-        avg_aqi = round(sum(aqi_values) / len(aqi_values))
-        
-        # Aggregate pollutants
-        pollutant_data = defaultdict(list)
-        for forecast in forecasts:
-            for pollutant, value in forecast.get('pollutants', {}).items():
-                if value is not None:
-                    pollutant_data[pollutant].append(value)
-        
-        aggregated_pollutants = {}
-        for pollutant, values in pollutant_data.items():
-            if values:
-                aggregated_pollutants[pollutant] = round(sum(values) / len(values), 2)
-        
-        # Get category
-        category_info = convert_aqi_to_category(avg_aqi, scale='EPA')
-        category = category_info['category'] if category_info else 'Unknown'
-        
-        # Get sources
-        sources = list(set([f.get('source') for f in forecasts if f.get('source')]))
-        
-        # Get timestamp (use first forecast's timestamp)
-        timestamp = forecasts[0].get('timestamp')
         
-        return {
-            'timestamp': timestamp,
-            'aqi': avg_aqi,
-            'category': category,
-            'pollutants': aggregated_pollutants,
-            'sources': sources,
-            'source_count': len(sources),
-        }
+        now = timezone.now()
+        lat_decimal = Decimal(str(lat))
+        lon_decimal = Decimal(str(lon))
+        records = [
+            ForecastData(
+                lat=lat_decimal,
+                lon=lon_decimal,
+                forecast_timestamp=point.timestamp,
+                aqi=round(point.aqi),
+                category=category_name(point.aqi),
+                pollutants=point.pollutants,
+                source=point.source,
+                confidence_level='medium',
+            )
+            for point in points
+            # Skip past timestamps
+            if point.aqi is not None and point.timestamp >= now
+        ]
+        try:
+            ForecastData.objects.bulk_create(records)
+        except Exception as e:
+            logger.error(f"Error storing forecasts: {e}")
     
-    def _get_from_cache(self, lat: float, lon: float) -> List[Dict]:
+    def _get_from_cache(self, lat: float, lon: float) -> Dict[str, List[Dict]]:
         """Get aggregated forecasts from Redis cache (geohash-based key)."""
         return self._cache.get(lat, lon)
 
-    def _save_to_cache(self, lat: float, lon: float, aggregated: List[Dict]):
+    def _save_to_cache(self, lat: float, lon: float, aggregated: Dict[str, List[Dict]]):
         """Save aggregated forecasts to Redis cache, with optional DB write-through."""
         self._cache.set(lat, lon, aggregated)
 
         if getattr(settings, 'CACHE_SETTINGS', {}).get('WRITE_THROUGH_TO_DB', False):
             try:
                 from decimal import Decimal
-                from datetime import datetime
 
                 lat_rounded = round(Decimal(str(lat)), 3)
                 lon_rounded = round(Decimal(str(lon)), 3)
                 cached_until = timezone.now() + timedelta(seconds=self.cache_ttl)
 
-                for forecast in aggregated:
-                    timestamp_str = forecast.get('timestamp')
-                    if isinstance(timestamp_str, str):
-                        timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                        if not timezone.is_aware(timestamp):
-                            timestamp = timezone.make_aware(timestamp)
-                    else:
-                        timestamp = timestamp_str
+                for forecast in aggregated['hourly']:
+                    timestamp = parse_timestamp(forecast.get('timestamp'))
 
                     AggregatedForecast.objects.update_or_create(
                         lat=lat_rounded, lon=lon_rounded,
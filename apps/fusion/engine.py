@@ -11,9 +11,12 @@ from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
 
+from apps.core.freshness import earliest_expiry
 from apps.core.utils import calculate_time_decay_weight, is_data_fresh, convert_aqi_to_category
-from apps.adapters.models import SourceData
+from apps.adapters.observation import Observation
+from .invalidation import evict_around_changes
 from .models import BlendedData, SourceWeight, FusionLog
+from .volatility import adaptive_ttl, create_aqi_history
 
 logger = logging.getLogger(__name__)
 
@@ -35,12 +38,70 @@ class FusionEngine:
         from apps.core.cache import ResponseCache
         precision = getattr(settings, 'CACHE_SETTINGS', {}).get('GEOHASH_PRECISION', 6)
         self._cache = ResponseCache(namespace='aq', default_ttl=self.cache_ttl, geohash_precision=precision)
+        # One level coarser (~5km at precision 5); only read when upstream quota is low
+        self._wide_cache = ResponseCache(
+            namespace='aq_wide', default_ttl=self.cache_ttl, geohash_precision=max(1, precision - 1)
+        )
+        self._aqi_history = create_aqi_history()
+        cache_settings = getattr(settings, 'CACHE_SETTINGS', {})
+        self.neighbor_distance_km = cache_settings.get('NEIGHBOR_MAX_DISTANCE_KM', 0)
+        self.neighbor_max_age = cache_settings.get('NEIGHBOR_MAX_AGE', 300)
+        # Whether the last get_cached hit was served from a neighbouring cell
+        self.neighbor_hit = False
+
+    def get_cached(self, lat: float, lon: float) -> Optional[Dict]:
+        """
+        Return a cached blended result for coordinates, or None.
+
+        Lets callers serve from cache before fetching any source data.
+        A miss falls back to a recent entry of a neighbouring cell within
+        NEIGHBOR_MAX_DISTANCE_KM (sets neighbor_hit; the caller should
+        refresh the cell).
+        """
+        start_time = time.time()
+        self.neighbor_hit = False
+        cached = self._get_from_cache(lat, lon)
+        if cached is None and self.neighbor_distance_km:
+            cached = self._cache.get_nearby(
+                lat, lon, max_distance_km=self.neighbor_distance_km, max_age=self.neighbor_max_age
+            )
+            if cached is not None:
+                self.neighbor_hit = True
+                cached['lat'] = float(lat)
+                cached['lon'] = float(lon)
+        return self._served_from_cache(lat, lon, cached, start_time)
+
+    def get_cached_wide(self, lat: float, lon: float) -> Optional[Dict]:
+        """
+        Return the blended result of the coarser shared cell, or None.
+
+        For misses while upstream quota is low, after get_cached.
+        """
+        start_time = time.time()
+        cached = self._wide_cache.get(lat, lon)
+        if cached is not None:
+            cached['lat'] = float(lat)
+            cached['lon'] = float(lon)
+        return self._served_from_cache(lat, lon, cached, start_time)
+
+    def _served_from_cache(self, lat: float, lon: float, cached: Optional[Dict], start_time: float) -> Optional[Dict]:
+        if cached is None:
+            return None
+
+        self._log_fusion(
+            lat, lon,
+            result_aqi=cached['current']['aqi'],
+            sources_used=cached['current']['sources'],
+            execution_time_ms=int((time.time() - start_time) * 1000),
+            cache_hit=True
+        )
+        return cached
     
     def blend(
         self, 
         lat: float, 
         lon: float, 
-        source_data_list: List[SourceData],
+        source_data_list: List[Observation],
         region_code: str = 'DEFAULT',
         use_cache: bool = True
     ) -> Dict:
@@ -50,7 +111,7 @@ class FusionEngine:
         Args:
             lat: Query latitude
             lon: Query longitude
-            source_data_list: List of SourceData objects from various adapters
+            source_data_list: List of Observation records from various adapters
             region_code: Region code for source prioritization
             use_cache: Whether to use cached results
             
@@ -119,8 +180,17 @@ class FusionEngine:
             'source_details': self._get_source_details(weighted_sources),
         }
         
-        # Cache the result
-        self._save_to_cache(lat, lon, result)
+        # Cells around stations that just changed category are stale now
+        evict_around_changes(sd for sd, _ in weighted_sources)
+        
+        # Cache the result until its first source is due to publish again,
+        # longer while the cell's AQI is stable and shorter while it swings
+        ttl = earliest_expiry(
+            ((sd.source, sd.timestamp) for sd, _ in weighted_sources), default=self.cache_ttl
+        )
+        if self._aqi_history is not None:
+            ttl = adaptive_ttl(ttl, self._aqi_history.record(lat, lon, blended_aqi))
+        self._save_to_cache(lat, lon, result, ttl=ttl)
         
         # Log fusion operation
         execution_time = int((time.time() - start_time) * 1000)
@@ -138,7 +208,7 @@ class FusionEngine:
     
     def _calculate_weight(
         self,
-        source_data: SourceData,
+        source_data: Observation,
         region_code: str,
         query_lat: float,
         query_lon: float
@@ -216,7 +286,7 @@ class FusionEngine:
         Blend AQI values using weighted average.
 
         Args:
-            weighted_sources: List of (SourceData, weight) tuples
+            weighted_sources: List of (Observation, weight) tuples
 
         Returns:
             Blended AQI value (0-500 range), or 0 if no valid data
@@ -256,7 +326,7 @@ class FusionEngine:
         Blend pollutant concentrations using weighted average.
 
         Args:
-            weighted_sources: List of (SourceData, weight) tuples
+            weighted_sources: List of (Observation, weight) tuples
 
         Returns:
             Dict of blended pollutant values
@@ -311,9 +381,12 @@ class FusionEngine:
         """Get blended data from Redis cache (geohash-based key)."""
         return self._cache.get(lat, lon)
     
-    def _save_to_cache(self, lat: float, lon: float, result: Dict):
+    def _save_to_cache(self, lat: float, lon: float, result: Dict, ttl: Optional[int] = None):
         """Save blended result to Redis cache, with optional DB write-through."""
-        self._cache.set(lat, lon, result)
+        ttl = ttl or self.cache_ttl
+        # cached_at lets neighbouring cells judge the entry's age
+        self._cache.set(lat, lon, {**result, 'cached_at': timezone.now().isoformat()}, ttl=ttl)
+        self._wide_cache.set(lat, lon, result, ttl=ttl)
 
         # Optional DB write-through for analytics
         if getattr(settings, 'CACHE_SETTINGS', {}).get('WRITE_THROUGH_TO_DB', False):
@@ -321,7 +394,7 @@ class FusionEngine:
                 from decimal import Decimal
                 lat_rounded = round(Decimal(str(lat)), 3)
                 lon_rounded = round(Decimal(str(lon)), 3)
-                cached_until = timezone.now() + timedelta(seconds=self.cache_ttl)
+                cached_until = timezone.now() + timedelta(seconds=ttl)
                 BlendedData.objects.update_or_create(
                     lat=lat_rounded, lon=lon_rounded,
                     defaults={
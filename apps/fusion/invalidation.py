@@ -0,0 +1,109 @@
+"""
+Event-driven eviction of cached entries around significantly changed stations.
+
+Every blend passes its station readings through evict_around_changes: each
+station's last EPA category is kept in the shared cache, and when a
+station moves to another category every indexed entry (CACHE_SETTINGS
+INVALIDATION_NAMESPACES) within INVALIDATION_RADIUS_KM of it is evicted,
+instead of serving the old picture until those entries expire. The next
+request for each of those cells blends fresh data.
+
+Stations are told apart by their station_id, or by source and position
+where a source has no ids (names such as "Outside" are not unique). A
+move counts only once the AQI is INVALIDATION_AQI_MARGIN past the old
+category's range, so readings hovering at a boundary do not evict on
+every swing.
+"""
+import logging
+from typing import Iterable, List, Optional
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.adapters.observation import Observation
+from apps.core.aqi import category_name
+from apps.core.cache import invalidate_within
+from apps.core.constants import EPA_AQI_CATEGORIES
+
+logger = logging.getLogger(__name__)
+
+# Last categories are kept a little longer than data may be blended
+_CATEGORY_TTL = 4 * 3600
+
+
+_CATEGORIES = {c['category']: c for c in EPA_AQI_CATEGORIES}
+
+
+def _station(observation: Observation) -> Optional[str]:
+    """A station's identity within its source, or None for non-station readings."""
+    if observation.station_id:
+        return observation.station_id
+    if not observation.station_name or observation.lat is None or observation.lon is None:
+        return None
+    # Sensor and city names repeat; ~10m of position does not
+    return f"{float(observation.lat):.4f},{float(observation.lon):.4f}"
+
+
+def _category_key(observation: Observation, station: str) -> str:
+    return f"stn_cat:{observation.source}:{quote(station, safe='')}"
+
+
+def _left(previous: str, aqi: float, margin: float) -> bool:
+    """Whether aqi is beyond the previous category's range by at least margin."""
+    bounds = _CATEGORIES.get(previous)
+    if bounds is None:
+        return True
+    return aqi < bounds['min_value'] - margin or aqi > bounds['max_value'] + margin
+
+
+def changed_stations(observations: Iterable[Observation]) -> List[Observation]:
+    """
+    Record each station reading's category; return the readings whose
+    station has clearly left the category it was last recorded in.
+    Readings without a station (model grids) are ignored.
+    """
+    margin = getattr(settings, 'CACHE_SETTINGS', {}).get('INVALIDATION_AQI_MARGIN', 10)
+    current = {}
+    for o in observations:
+        station = _station(o)
+        if station is not None and o.aqi is not None:
+            current[_category_key(o, station)] = (o, category_name(o.aqi))
+    if not current:
+        return []
+    try:
+        previous = cache.get_many(list(current))
+        changed = {
+            key: (o, name) for key, (o, name) in current.items()
+            if previous.get(key) not in (None, name) and _left(previous[key], o.aqi, margin)
+        }
+        # A reading within the margin keeps its station's recorded category
+        cache.set_many({
+            key: name if key in changed or key not in previous else previous[key]
+            for key, (_, name) in current.items()
+        }, timeout=_CATEGORY_TTL)
+    except Exception as e:
+        logger.warning(f"Station category tracking failed: {e}")
+        return []
+    return [o for o, _ in changed.values()]
+
+
+def evict_around_changes(observations: Iterable[Observation]) -> int:
+    """Evict cached entries around stations that changed category; returns keys evicted."""
+    cache_settings = getattr(settings, 'CACHE_SETTINGS', {})
+    namespaces = cache_settings.get('INVALIDATION_NAMESPACES', ())
+    if not namespaces:
+        return 0
+    radius_km = cache_settings.get('INVALIDATION_RADIUS_KM', 25)
+
+    evicted = 0
+    for observation in changed_stations(observations):
+        count = invalidate_within(
+            namespaces, float(observation.lat), float(observation.lon), radius_km
+        )
+        logger.info(
+            f"{observation.source} station {observation.station_id or observation.station_name} "
+            f"changed category; evicted {count} cached entries within {radius_km}km"
+        )
+        evicted += count
+    return evicted
@@ -0,0 +1,80 @@
+"""
+Volatility-adaptive cache TTLs for blended AQ results.
+
+Each blend's AQI is appended to a short per-cell history in the shared
+cache. The spread (standard deviation) of the recent readings scales the
+TTL the sources' publish schedules give (apps.core.freshness): a cell whose
+AQI has barely moved keeps its result up to STABLE_MULTIPLIER times as
+long, one swinging during e.g. a smoke event only VOLATILE_MULTIPLIER
+times as long, interpolated in between. Configured by
+settings.ADAPTIVE_TTL_SETTINGS.
+"""
+import statistics
+import time
+from typing import List, Optional
+
+from django.conf import settings
+
+from apps.core.cache import ResponseCache
+
+# Readings needed before the spread is trusted
+_MIN_SAMPLES = 3
+
+
+class AQIHistory:
+    """Recent blended AQI readings per geohash cell."""
+
+    def __init__(self, size: int = 12, window: int = 21600, geohash_precision: int = 6):
+        self.size = size
+        self.window = window
+        self._cache = ResponseCache(namespace='aq_hist', default_ttl=window, geohash_precision=geohash_precision)
+
+    def record(self, lat: float, lon: float, aqi: Optional[float]) -> List[float]:
+        """Add a reading; returns the cell's readings within the window, oldest first."""
+        now = time.time()
+        samples = [
+            s for s in (self._cache.get(lat, lon) or [])
+            if isinstance(s, list) and len(s) == 2 and now - s[0] <= self.window
+        ]
+        if aqi is not None:
+            samples.append([now, aqi])
+            samples = samples[-self.size:]
+            self._cache.set(lat, lon, samples)
+        return [aqi for _, aqi in samples]
+
+
+def volatility_multiplier(readings: List[float]) -> float:
+    """TTL multiplier for a cell's recent readings (1.0 with too few)."""
+    ttl_settings = getattr(settings, 'ADAPTIVE_TTL_SETTINGS', {})
+    if len(readings) < _MIN_SAMPLES:
+        return 1.0
+    spread = statistics.pstdev(readings)
+    stable = ttl_settings.get('STABLE_STDEV', 5)
+    volatile = ttl_settings.get('VOLATILE_STDEV', 25)
+    stable_multiplier = ttl_settings.get('STABLE_MULTIPLIER', 2.0)
+    volatile_multiplier = ttl_settings.get('VOLATILE_MULTIPLIER', 0.25)
+    if spread <= stable:
+        return stable_multiplier
+    if spread >= volatile:
+        return volatile_multiplier
+    position = (spread - stable) / (volatile - stable)
+    return stable_multiplier + position * (volatile_multiplier - stable_multiplier)
+
+
+def adaptive_ttl(base_ttl: int, readings: List[float]) -> int:
+    """base_ttl scaled by the readings' volatility, within MIN_TTL..MAX_TTL."""
+    ttl_settings = getattr(settings, 'ADAPTIVE_TTL_SETTINGS', {})
+    ttl = base_ttl * volatility_multiplier(readings)
+    return int(min(max(ttl, ttl_settings.get('MIN_TTL', 60)), ttl_settings.get('MAX_TTL', 7200)))
+
+
+def create_aqi_history() -> Optional[AQIHistory]:
+    """The per-cell AQI history, or None if adaptive TTLs are disabled."""
+    ttl_settings = getattr(settings, 'ADAPTIVE_TTL_SETTINGS', {})
+    if not ttl_settings.get('ENABLED', False):
+        return None
+    return AQIHistory(
+        size=ttl_settings.get('HISTORY_SIZE', 12),
+        window=ttl_settings.get('HISTORY_WINDOW', 21600),
+        geohash_precision=getattr(settings, 'CACHE_SETTINGS', {}).get('GEOHASH_PRECISION', 6),
+    )
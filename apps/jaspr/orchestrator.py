@@ -5,7 +5,7 @@ in a single call optimized for the JASPR Weather iOS app.
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 from django.conf import settings
 from django.utils import timezone
@@ -13,6 +13,7 @@ from django.utils import timezone
 from apps.adapters.open_meteo_air_quality import OpenMeteoAirQualityAdapter
 from apps.api.orchestrator import AirQualityOrchestrator
 from apps.core.cache import ResponseCache
+from apps.core.freshness import earliest_expiry
 from apps.location.services import LocationService
 from apps.weather.orchestrator import WeatherOrchestrator
 
@@ -52,40 +53,38 @@ class JasprOrchestrator:
         Fetch and assemble all data for the JASPR Weather app.
 
         Returns a combined dict with weather, AQ, pollen, hourly, daily,
-        and optionally historical data.
+        and optionally historical data. Weather values are metric; 'units'
+        is applied when the response is serialized.
         """
         # Check combined cache
         if use_cache:
             cache_extra = ('hist',) if include_historical else ()
             cached = self._cache.get(lat, lon, *cache_extra)
             if cached:
-                return cached
+                # Cached in metric; units are applied when serialized
+                return {**cached, 'units': units}
 
-        # Parallel data fetch
+        # Parallel data fetch. One Open-Meteo AQ call serves pollen, hourly
+        # AQI and history, and the AQ orchestrator blends its current reading.
         weather_result = None
         aq_result = None
         pollen_result = None
         historical_stats = None
 
-        with ThreadPoolExecutor(max_workers=4) as executor:
+        with ThreadPoolExecutor(max_workers=3) as executor:
             futures = {}
 
             futures[executor.submit(
                 self.weather_orch.get_weather, lat, lon, units=units, use_cache=use_cache
             )] = 'weather'
 
-            futures[executor.submit(
-                self.aq_orch.get_air_quality, lat, lon, include_forecast=True, use_cache=use_cache
-            )] = 'aq'
+            om_aq = executor.submit(self._get_om_aq, lat, lon, include_historical)
+            futures[om_aq] = 'pollen'
 
             futures[executor.submit(
-                self.om_aq_adapter.fetch_current, lat, lon, forecast_days=2
-            )] = 'pollen'
-
-            if include_historical:
-                futures[executor.submit(
-                    self._get_historical, lat, lon
-                )] = 'historical'
+                self.aq_orch.get_air_quality, lat, lon, include_forecast=True,
+                use_cache=use_cache, om_aq=om_aq,
+            )] = 'aq'
 
             for future in as_completed(futures, timeout=_THREAD_TIMEOUT):
                 key = futures[future]
@@ -97,8 +96,8 @@ class JasprOrchestrator:
                         aq_result = result
                     elif key == 'pollen':
                         pollen_result = result
-                    elif key == 'historical':
-                        historical_stats = result
+                        if include_historical and result:
+                            historical_stats = result.get('historical')
                 except Exception as e:
                     logger.warning(f"JASPR {key} fetch failed: {e}")
 
@@ -112,22 +111,47 @@ class JasprOrchestrator:
             units=units,
         )
 
-        # Cache the combined result
+        # Cache the combined result until one of its parts is due an update
         if use_cache:
             cache_extra = ('hist',) if include_historical else ()
-            self._cache.set(lat, lon, response, *cache_extra)
+            ttl = earliest_expiry(
+                self._readings(weather_result, aq_result, pollen_result), default=self._cache.default_ttl
+            )
+            self._cache.set(lat, lon, response, *cache_extra, ttl=ttl)
 
         return response
 
-    def _get_historical(self, lat: float, lon: float) -> Optional[Dict]:
-        """Fetch historical AQ data, with its own longer cache."""
-        cached = self._hist_cache.get(lat, lon)
-        if cached:
-            return cached
-        stats = self.om_aq_adapter.fetch_historical(lat, lon, past_days=30)
-        if stats:
-            self._hist_cache.set(lat, lon, stats)
-        return stats
+    @staticmethod
+    def _readings(weather: Optional[Dict], aq: Optional[Dict], pollen: Optional[Dict]) -> List[Tuple]:
+        """(source, observed_at) of every input of the combined response."""
+        readings = [
+            (detail.get('source'), detail.get('timestamp'))
+            for detail in (aq or {}).get('source_details', [])
+        ]
+        if weather and weather.get('source'):
+            readings.append((weather['source'], None))
+        if pollen:
+            readings.append((OpenMeteoAirQualityAdapter.SOURCE_CODE, None))
+        return readings
+
+    def _get_om_aq(self, lat: float, lon: float, include_historical: bool) -> Optional[Dict]:
+        """
+        Open-Meteo AQ current, pollen and hourly data in one call.
+
+        With include_historical, 30 days of history are requested in the
+        same call unless the summary is in its own longer cache.
+        """
+        historical = self._hist_cache.get(lat, lon) if include_historical else None
+        past_days = 30 if include_historical and not historical else 0
+
+        result = self.om_aq_adapter.fetch_combined(lat, lon, past_days=past_days, forecast_days=2)
+        if result is None:
+            return None
+        if historical:
+            result['historical'] = historical
+        elif result.get('historical'):
+            self._hist_cache.set(lat, lon, result['historical'])
+        return result
 
     def _assemble(
         self,
@@ -166,7 +190,7 @@ class JasprOrchestrator:
         aq_hourly = pollen_data.get('hourly', [])
         hourly_forecast = self._merge_hourly(wx_hourly, aq_hourly)
 
-        # Daily forecast from weather (already has moon_phase + golden_hour)
+        # Daily forecast from weather (already has moon_phase, golden/blue hour)
         daily_forecast = weather.get('daily_forecast', [])
 
         # Historical analysis
@@ -192,7 +216,7 @@ class JasprOrchestrator:
             'historical': historical,
             'hidden_gems': hidden_gems,
             'source': weather.get('source', ''),
-            'units': weather.get('units', units),
+            'units': units,
             'generated_at': timezone.now().isoformat(),
         }
 
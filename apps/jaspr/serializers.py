@@ -3,6 +3,7 @@ DRF serializers for the JASPR combined endpoint response.
 """
 from rest_framework import serializers
 from apps.api.serializers import LocationSerializer, PollutantSerializer
+from apps.weather.serializers import MeasurementField
 
 
 class PollenLevelSerializer(serializers.Serializer):
@@ -19,17 +20,17 @@ class PollenSerializer(serializers.Serializer):
 
 class JasprCurrentSerializer(serializers.Serializer):
     # Weather
-    temperature = serializers.FloatField(allow_null=True)
-    feels_like = serializers.FloatField(allow_null=True)
-    dew_point = serializers.FloatField(allow_null=True)
+    temperature = MeasurementField('temperature', allow_null=True)
+    feels_like = MeasurementField('temperature', allow_null=True)
+    dew_point = MeasurementField('temperature', allow_null=True)
     humidity = serializers.IntegerField(allow_null=True)
-    pressure = serializers.FloatField(allow_null=True)
-    visibility = serializers.FloatField(allow_null=True)
+    pressure = MeasurementField('pressure', allow_null=True)
+    visibility = MeasurementField('distance', allow_null=True)
     cloud_cover = serializers.IntegerField(allow_null=True)
     uv_index = serializers.FloatField(allow_null=True)
-    wind_speed = serializers.FloatField(allow_null=True)
+    wind_speed = MeasurementField('speed', allow_null=True)
     wind_direction = serializers.IntegerField(allow_null=True)
-    wind_gusts = serializers.FloatField(allow_null=True)
+    wind_gusts = MeasurementField('speed', allow_null=True)
     weather_code = serializers.IntegerField(allow_null=True, required=False)
     weather_description = serializers.CharField(default='')
     weather_icon = serializers.CharField(default='')
@@ -48,20 +49,20 @@ class JasprCurrentSerializer(serializers.Serializer):
 class JasprHourlySerializer(serializers.Serializer):
     # Weather
     time = serializers.CharField()
-    temperature = serializers.FloatField(allow_null=True)
-    feels_like = serializers.FloatField(allow_null=True)
-    dew_point = serializers.FloatField(allow_null=True)
+    temperature = MeasurementField('temperature', allow_null=True)
+    feels_like = MeasurementField('temperature', allow_null=True)
+    dew_point = MeasurementField('temperature', allow_null=True)
     humidity = serializers.IntegerField(allow_null=True)
-    precipitation = serializers.FloatField(allow_null=True)
+    precipitation = MeasurementField('precipitation', allow_null=True)
     precipitation_probability = serializers.IntegerField(allow_null=True)
     weather_code = serializers.IntegerField(allow_null=True)
     weather_description = serializers.CharField(default='')
     weather_icon = serializers.CharField(default='')
     cloud_cover = serializers.IntegerField(allow_null=True)
-    visibility = serializers.FloatField(allow_null=True)
-    wind_speed = serializers.FloatField(allow_null=True)
+    visibility = MeasurementField('distance', allow_null=True)
+    wind_speed = MeasurementField('speed', allow_null=True)
     wind_direction = serializers.IntegerField(allow_null=True)
-    wind_gusts = serializers.FloatField(allow_null=True)
+    wind_gusts = MeasurementField('speed', allow_null=True)
     is_day = serializers.IntegerField(allow_null=True)
     uv_index = serializers.FloatField(allow_null=True)
     # Air quality
@@ -88,23 +89,24 @@ class HiddenGemSerializer(serializers.Serializer):
 
 class JasprDailySerializer(serializers.Serializer):
     date = serializers.CharField()
-    temp_high = serializers.FloatField(allow_null=True)
-    temp_low = serializers.FloatField(allow_null=True)
-    feels_like_high = serializers.FloatField(allow_null=True)
-    feels_like_low = serializers.FloatField(allow_null=True)
+    temp_high = MeasurementField('temperature', allow_null=True)
+    temp_low = MeasurementField('temperature', allow_null=True)
+    feels_like_high = MeasurementField('temperature', allow_null=True)
+    feels_like_low = MeasurementField('temperature', allow_null=True)
     weather_code = serializers.IntegerField(allow_null=True, required=False)
     weather_description = serializers.CharField()
     weather_icon = serializers.CharField()
-    precipitation_sum = serializers.FloatField(allow_null=True)
+    precipitation_sum = MeasurementField('precipitation', allow_null=True)
     precipitation_probability = serializers.IntegerField(allow_null=True)
-    wind_speed_max = serializers.FloatField(allow_null=True)
-    wind_gusts_max = serializers.FloatField(allow_null=True)
+    wind_speed_max = MeasurementField('speed', allow_null=True)
+    wind_gusts_max = MeasurementField('speed', allow_null=True)
     wind_direction_dominant = serializers.IntegerField(allow_null=True)
     uv_index_max = serializers.FloatField(allow_null=True)
     sunrise = serializers.CharField(allow_null=True)
     sunset = serializers.CharField(allow_null=True)
     moon_phase = serializers.DictField(allow_null=True, required=False)
     golden_hour = serializers.DictField(allow_null=True, required=False)
+    blue_hour = serializers.DictField(allow_null=True, required=False)
 
 
 class JasprResponseSerializer(serializers.Serializer):
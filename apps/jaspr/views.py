@@ -6,14 +6,26 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
+from apps.api.rendering import RenderedResponseMixin, has_current_aqi, parse_coordinates, render_json
 from apps.core.utils import validate_coordinates
+from apps.weather.utils import UNITS, convert_response, requested_units
 from .orchestrator import JasprOrchestrator
 from .serializers import JasprResponseSerializer
 
 logger = logging.getLogger(__name__)
 
 
-class JasprWeatherView(APIView):
+def jaspr_key(params):
+    """RenderedCache key of a JASPR request: (lat, lon, units, include_historical)."""
+    coordinates = parse_coordinates(params)
+    units = requested_units(params)
+    if coordinates is None or units not in UNITS or params.get('no_cache', 'false').lower() == 'true':
+        return None
+    include_historical = params.get('include_historical', 'false').lower() == 'true'
+    return (*coordinates, units, include_historical)
+
+
+class JasprWeatherView(RenderedResponseMixin, APIView):
     """
     Combined weather + air quality + pollen endpoint for JASPR Weather iOS app.
 
@@ -22,6 +34,8 @@ class JasprWeatherView(APIView):
 
     GET /api/v1/jaspr/?lat=34.05&lon=-118.24&units=imperial&include_historical=true
     """
+    rendered_view = 'jaspr'
+    rendered_key = staticmethod(jaspr_key)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -61,10 +75,8 @@ class JasprWeatherView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        from django.conf import settings as django_settings
-        default_units = django_settings.WEATHER_SETTINGS.get('DEFAULT_UNITS', 'imperial')
-        units = request.query_params.get('units', default_units).lower()
-        if units not in ('metric', 'imperial'):
+        units = requested_units(request.query_params)
+        if units not in UNITS:
             return Response(
                 {'error': "units must be 'metric' or 'imperial'"},
                 status=status.HTTP_400_BAD_REQUEST
@@ -82,12 +94,11 @@ class JasprWeatherView(APIView):
                 use_cache=not no_cache,
             )
 
-            serializer = JasprResponseSerializer(data=result)
-            if serializer.is_valid():
-                return Response(serializer.data, status=status.HTTP_200_OK)
-            else:
-                logger.warning(f"JASPR serializer errors: {serializer.errors}")
-                return Response(result, status=status.HTTP_200_OK)
+            content = render_json(JasprResponseSerializer, result, context={'units': units})
+            if content is None:
+                return Response(convert_response(result, units), status=status.HTTP_200_OK)
+            key = jaspr_key(request.query_params) if has_current_aqi(result) else None
+            return self.rendered_response(request, content, key)
 
         except Exception as e:
             logger.error(f"Error in JASPR endpoint: {e}", exc_info=True)
@@ -1,10 +1,16 @@
 """
 Astronomical calculations for JASPR Weather.
-Moon phase computation and golden hour estimation.
+Moon phase and solar events (sunrise/sunset, golden and blue hour).
+
+Everything that depends only on the date is precomputed once at import
+into tables indexed by day (TABLE_START..TABLE_END): the moon phase and
+the sun's declination and Greenwich transit time. A request then only
+looks rows up and solves the hour angle for its latitude and a handful of
+solar elevations; dates outside the tables are computed directly.
 """
 import math
-from datetime import date, datetime, timedelta
-from typing import Dict, Optional
+from datetime import date, datetime, timedelta, timezone as dt_timezone, tzinfo
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
 # Named moon phases mapped to 0-based index out of 8 segments
@@ -25,85 +31,180 @@ _KNOWN_NEW_MOON_JD = 2451550.26
 # Synodic period (mean lunation) in days
 _SYNODIC_PERIOD = 29.53058867
 
+# Julian Date of noon UTC is the proleptic Gregorian ordinal plus this
+_ORDINAL_TO_NOON_JD = 1721425
 
-def compute_moon_phase(d: date) -> Dict:
-    """
-    Compute the moon phase for a given date.
+# J2000.0 epoch: 2000-01-01 12:00 UTC
+_J2000_JD = 2451545.0
+_J2000 = datetime(2000, 1, 1, 12, tzinfo=dt_timezone.utc)
 
-    Uses the synodic period method: days since a known new moon,
-    modulo the lunation period.
+_OBLIQUITY = math.radians(23.4397)
 
-    Returns:
-        {
-            'name': str,           # e.g. 'Waxing Crescent'
-            'value': float,        # 0.0 (new) to ~1.0 (next new)
-            'illumination': int,   # 0-100 percentage
-        }
-    """
-    # Julian Date for noon on the given date
-    if isinstance(d, datetime):
-        d = d.date()
-    a = (14 - d.month) // 12
-    y = d.year + 4800 - a
-    m = d.month + 12 * a - 3
-    jd = d.day + (153 * m + 2) // 5 + 365 * y + y // 4 - y // 100 + y // 400 - 32045 + 0.5
+# Solar elevations (degrees) bounding each event
+SUNRISE_ELEVATION = -0.833  # upper limb on the horizon, with refraction
+GOLDEN_HOUR_LOW = -4.0
+GOLDEN_HOUR_HIGH = 6.0
+BLUE_HOUR_LOW = -6.0
 
-    days_since = jd - _KNOWN_NEW_MOON_JD
+_ELEVATIONS = (SUNRISE_ELEVATION, GOLDEN_HOUR_LOW, GOLDEN_HOUR_HIGH, BLUE_HOUR_LOW)
+_SIN_ELEVATIONS = tuple(math.sin(math.radians(e)) for e in _ELEVATIONS)
+
+# Range covered by the precomputed tables
+TABLE_START = date(1990, 1, 1)
+TABLE_END = date(2060, 12, 31)
+
+
+def _moon_row(ordinal: int) -> Tuple[str, float, int]:
+    """Moon phase for a date ordinal (synodic period method)."""
+    days_since = ordinal + _ORDINAL_TO_NOON_JD + 0.5 - _KNOWN_NEW_MOON_JD
     cycles = days_since / _SYNODIC_PERIOD
     phase_value = cycles - math.floor(cycles)  # 0.0 to ~1.0
 
     # Map to 8 segments
     segment = int(phase_value * 8) % 8
-    phase_name = _PHASE_NAMES[segment]
 
     # Illumination: 0% at new, 100% at full, using cosine
     illumination = round((1 - math.cos(phase_value * 2 * math.pi)) / 2 * 100)
 
-    return {
-        'name': phase_name,
-        'value': round(phase_value, 4),
-        'illumination': illumination,
-    }
+    return _PHASE_NAMES[segment], round(phase_value, 4), illumination
 
 
-def compute_golden_hour(sunrise: Optional[str], sunset: Optional[str]) -> Optional[Dict]:
+def _solar_row(ordinal: int) -> Tuple[float, float, float]:
     """
-    Estimate golden hour windows from sunrise/sunset ISO strings.
+    Sun declination and Greenwich transit for a date ordinal.
+
+    Returns (sin declination, cos declination, transit in days since
+    J2000.0 at longitude 0). The transit at another longitude is this
+    minus lon / 360; the mean anomaly shift that ignores is a few seconds.
+    """
+    n = ordinal + _ORDINAL_TO_NOON_JD - _J2000_JD
+    mean_anomaly = math.radians((357.5291 + 0.98560028 * n) % 360)
+    center = (
+        1.9148 * math.sin(mean_anomaly)
+        + 0.0200 * math.sin(2 * mean_anomaly)
+        + 0.0003 * math.sin(3 * mean_anomaly)
+    )
+    ecliptic_longitude = math.radians((math.degrees(mean_anomaly) + center + 180 + 102.9372) % 360)
+    transit = n + 0.0053 * math.sin(mean_anomaly) - 0.0069 * math.sin(2 * ecliptic_longitude)
+    sin_declination = math.sin(ecliptic_longitude) * math.sin(_OBLIQUITY)
+    return sin_declination, math.sqrt(1 - sin_declination * sin_declination), transit
+
+
+_TABLE_OFFSET = TABLE_START.toordinal()
+_TABLE_ORDINALS = range(_TABLE_OFFSET, TABLE_END.toordinal() + 1)
+_MOON_TABLE = tuple(_moon_row(o) for o in _TABLE_ORDINALS)
+_SOLAR_TABLE = tuple(_solar_row(o) for o in _TABLE_ORDINALS)
+
+
+def _lookup(table: tuple, build, ordinal: int):
+    index = ordinal - _TABLE_OFFSET
+    if 0 <= index < len(table):
+        return table[index]
+    return build(ordinal)
 
-    Golden hour is approximately the first/last ~45 minutes of sunlight,
-    though this varies by latitude and season.
+
+def compute_moon_phase(d: date) -> Dict:
+    """
+    Moon phase for a given date.
 
     Returns:
         {
-            'morning': { 'start': ISO str, 'end': ISO str },
-            'evening': { 'start': ISO str, 'end': ISO str },
+            'name': str,           # e.g. 'Waxing Crescent'
+            'value': float,        # 0.0 (new) to ~1.0 (next new)
+            'illumination': int,   # 0-100 percentage
         }
-        or None if sunrise/sunset data is missing.
     """
-    if not sunrise or not sunset:
-        return None
+    if isinstance(d, datetime):
+        d = d.date()
+    name, value, illumination = _lookup(_MOON_TABLE, _moon_row, d.toordinal())
+    return {'name': name, 'value': value, 'illumination': illumination}
 
-    try:
-        sr = _parse_iso(sunrise)
-        ss = _parse_iso(sunset)
-    except (ValueError, TypeError):
-        return None
 
-    golden_duration = timedelta(minutes=45)
+def compute_sun_events(lat: float, lon: float, dates: Iterable[date], tz: tzinfo) -> List[Dict]:
+    """
+    Sunrise, sunset, golden hour and blue hour for each date at a location.
 
-    return {
-        'morning': {
-            'start': sr.isoformat(),
-            'end': (sr + golden_duration).isoformat(),
-        },
-        'evening': {
-            'start': (ss - golden_duration).isoformat(),
-            'end': ss.isoformat(),
-        },
-    }
+    Golden hour is the sun between -4° and +6° elevation, blue hour between
+    -6° and -4°. Times are naive local ISO strings to the minute (the
+    format Open-Meteo uses). An event the sun never reaches that day
+    (polar day/night) is None, as is a window missing either bound.
 
+    Args:
+        lat: Latitude
+        lon: Longitude
+        dates: Local calendar dates
+        tz: Timezone the times are reported in
 
-def _parse_iso(value: str) -> datetime:
-    """Parse an ISO datetime string, handling Open-Meteo's format."""
-    value = str(value).replace('Z', '+00:00')
-    return datetime.fromisoformat(value)
+    Returns:
+        One dict per date:
+        {
+            'sunrise': str | None,
+            'sunset': str | None,
+            'golden_hour': {'morning': {start, end}, 'evening': {start, end}} | None,
+            'blue_hour': same shape | None,
+        }
+    """
+    phi = math.radians(lat)
+    sin_phi, cos_phi = math.sin(phi), math.cos(phi)
+    lon_days = lon / 360
+
+    def local(days: float) -> str:
+        moment = (_J2000 + timedelta(days=days)).astimezone(tz)
+        return moment.replace(tzinfo=None).isoformat(timespec='minutes')
+
+    def solar_noon(d: date) -> Tuple[float, float, float]:
+        # The transit after Greenwich noon of d can fall on another local
+        # date where the zone's offset differs from lon/15 by ~12h (e.g.
+        # Tonga, Samoa); step a day until it is d's local noon.
+        ordinal = d.toordinal()
+        for _ in range(3):
+            sin_decl, cos_decl, transit = _lookup(_SOLAR_TABLE, _solar_row, ordinal)
+            transit -= lon_days
+            local_date = (_J2000 + timedelta(days=transit)).astimezone(tz).date()
+            if local_date == d:
+                break
+            ordinal += 1 if local_date < d else -1
+        return sin_decl, cos_decl, transit
+
+    events = []
+    for d in dates:
+        sin_decl, cos_decl, transit = solar_noon(d)
+        denominator = cos_phi * cos_decl
+        # (rising, setting) for each elevation in _ELEVATIONS order
+        times = []
+        for sin_h in _SIN_ELEVATIONS:
+            if denominator == 0:
+                times.append((None, None))
+                continue
+            cos_omega = (sin_h - sin_phi * sin_decl) / denominator
+            if not -1 <= cos_omega <= 1:
+                times.append((None, None))
+                continue
+            half_day = math.degrees(math.acos(cos_omega)) / 360
+            times.append((local(transit - half_day), local(transit + half_day)))
+
+        (sunrise, sunset), golden_low, golden_high, blue_low = times
+        events.append({
+            'sunrise': sunrise,
+            'sunset': sunset,
+            'golden_hour': _windows(golden_low, golden_high),
+            'blue_hour': _windows(blue_low, golden_low),
+        })
+    return events
+
+
+def _windows(lower: Tuple, upper: Tuple) -> Optional[Dict]:
+    """
+    Morning and evening windows between two elevations.
+
+    In the morning the sun rises through `lower` then `upper`; in the
+    evening it sets through them in reverse.
+    """
+    lower_rise, lower_set = lower
+    upper_rise, upper_set = upper
+    if None in (lower_rise, lower_set, upper_rise, upper_set):
+        return None
+    return {
+        'morning': {'start': lower_rise, 'end': upper_rise},
+        'evening': {'start': upper_set, 'end': lower_set},
+    }
@@ -0,0 +1,66 @@
+"""
+Latency tracking for hedged weather requests.
+
+WeatherOrchestrator races the fallback provider against the primary once
+the primary has been slower than its usual (WEATHER_SETTINGS
+HEDGE_PERCENTILE, p90 by default) latency. The percentile comes from the
+last few hundred successful calls in this process.
+"""
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+from django.conf import settings
+
+
+class LatencyTracker:
+    """Recent successful call durations (seconds) of one provider."""
+
+    def __init__(self, size: int = 256):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float, min_samples: int = 1) -> Optional[float]:
+        """The q-quantile (0-1) of recent durations, or None with too few samples."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples or len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+_trackers: Dict[str, LatencyTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def get_latency_tracker(source: str) -> LatencyTracker:
+    """Return the process-wide latency tracker for a source."""
+    with _trackers_lock:
+        tracker = _trackers.get(source)
+        if tracker is None:
+            tracker = _trackers[source] = LatencyTracker()
+        return tracker
+
+
+def hedge_delay(source: str) -> float:
+    """
+    Seconds to wait for a source before racing the fallback.
+
+    Its HEDGE_PERCENTILE latency, clamped to HEDGE_MIN_DELAY..HEDGE_MAX_DELAY,
+    or HEDGE_DEFAULT_DELAY until HEDGE_MIN_SAMPLES calls have been timed.
+    """
+    weather_settings = getattr(settings, 'WEATHER_SETTINGS', {})
+    observed = get_latency_tracker(source).percentile(
+        weather_settings.get('HEDGE_PERCENTILE', 0.9),
+        min_samples=weather_settings.get('HEDGE_MIN_SAMPLES', 20),
+    )
+    if observed is None:
+        return weather_settings.get('HEDGE_DEFAULT_DELAY', 2.0)
+    return min(
+        max(observed, weather_settings.get('HEDGE_MIN_DELAY', 0.2)),
+        weather_settings.get('HEDGE_MAX_DELAY', 5.0),
+    )
@@ -2,19 +2,22 @@
 Weather orchestrator with primary/fallback provider pattern.
 """
 import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from django.conf import settings
 from django.utils import timezone
 
 from apps.adapters.open_meteo import OpenMeteoWeatherAdapter
 from apps.adapters.openweathermap_weather import OWMWeatherAdapter
+from apps.core import metrics
 from apps.location.services import LocationService
 
+from .hedging import get_latency_tracker, hedge_delay
 from .models import WeatherObservation, DailyForecast
-from .utils import convert_current_to_imperial, convert_forecast_to_imperial, convert_hourly_to_imperial
 
 logger = logging.getLogger(__name__)
 
@@ -23,10 +26,15 @@ class WeatherOrchestrator:
     """
     Coordinates weather data fetching with primary/fallback strategy.
 
-    1. Check DB cache
+    1. Check cache (current conditions and forecast separately)
     2. Try primary adapter (Open-Meteo)
     3. If primary fails, try fallback adapter (OpenWeatherMap)
     4. Cache result and return
+
+    Current conditions are cached for CURRENT_CACHE_TTL and the hourly and
+    daily forecast for FORECAST_CACHE_TTL. While the forecast is cached,
+    expired current conditions are refreshed on their own from the primary
+    (fetch_conditions) instead of refetching the whole forecast.
     """
 
     def __init__(self):
@@ -36,11 +44,16 @@ class WeatherOrchestrator:
         self.settings = settings.WEATHER_SETTINGS
         from apps.core.cache import ResponseCache
         precision = getattr(settings, 'CACHE_SETTINGS', {}).get('GEOHASH_PRECISION', 6)
-        self._cache = ResponseCache(
-            namespace='wx',
+        self._current_cache = ResponseCache(
+            namespace='wx_cur',
             default_ttl=self.settings.get('CURRENT_CACHE_TTL', 300),
             geohash_precision=precision,
         )
+        self._forecast_cache = ResponseCache(
+            namespace='wx_fc',
+            default_ttl=self.settings.get('FORECAST_CACHE_TTL', 1800),
+            geohash_precision=precision,
+        )
 
     def get_weather(
         self,
@@ -59,74 +72,175 @@ class WeatherOrchestrator:
             use_cache: Whether to use cached data
 
         Returns:
-            Complete weather response dict
+            Complete weather response dict. Values are always metric;
+            'units' records the requested units, applied when the response
+            is serialized (MeasurementField), so cached payloads are shared
+            rather than converted per request.
         """
         # Resolve location
         location_info = self.location_service.reverse_geocode(lat, lon, use_cache=use_cache)
 
         # Check cache
+        cached_current = cached_forecast = None
         if use_cache:
-            cached = self._get_from_cache(lat, lon)
-            if cached:
-                if units == 'imperial':
-                    cached['current'] = convert_current_to_imperial(cached['current'])
-                    cached['hourly_forecast'] = convert_hourly_to_imperial(cached.get('hourly_forecast', []))
-                    cached['daily_forecast'] = convert_forecast_to_imperial(cached['daily_forecast'])
-                    cached['units'] = 'imperial'
-                cached['location'] = location_info
-                return cached
-
-        # Fetch from providers (primary then fallback)
-        forecast_days = self.settings.get('FORECAST_DAYS', 10)
-        result = None
-
-        if self.primary.is_available():
-            try:
-                result = self.primary.fetch_current(lat, lon, forecast_days=forecast_days)
-            except Exception as e:
-                logger.error(f"Primary weather adapter failed: {e}")
-
-        if result is None and self.fallback.is_available():
-            try:
-                result = self.fallback.fetch_current(lat, lon)
-            except Exception as e:
-                logger.error(f"Fallback weather adapter failed: {e}")
+            cached_current, cached_forecast = self._get_from_cache(lat, lon)
+            if cached_current and cached_forecast:
+                return self._build_response(cached_current, cached_forecast, location_info, units)
+
+        # Only current conditions expired: refresh them alone
+        if cached_forecast:
+            current = self._fetch_conditions(lat, lon, cached_forecast)
+            if current is not None:
+                self._save_current(lat, lon, current)
+                return self._build_response(current, cached_forecast, location_info, units)
+
+        # Fetch from providers (primary, with the fallback hedged or after it)
+        result = self._fetch(lat, lon)
 
         if result is None:
             return self._get_unavailable_response(lat, lon, location_info, units)
 
         # Cache the result (always in metric)
-        self._save_to_cache(lat, lon, result)
-
-        # Build response
-        response = {
-            'location': location_info,
-            'current': result['current'],
+        current = {'current': result['current'], 'source': result['source']}
+        forecast = {
             'hourly_forecast': result.get('hourly_forecast', []),
             'daily_forecast': result.get('daily_forecast', []),
             'source': result['source'],
-            'units': 'metric',
         }
+        self._save_to_cache(lat, lon, current, forecast)
+
+        return self._build_response(current, forecast, location_info, units)
 
-        # Convert if imperial requested
-        if units == 'imperial':
-            response['current'] = convert_current_to_imperial(response['current'])
-            response['hourly_forecast'] = convert_hourly_to_imperial(response['hourly_forecast'])
-            response['daily_forecast'] = convert_forecast_to_imperial(response['daily_forecast'])
-            response['units'] = 'imperial'
+    def _fetch(self, lat: float, lon: float) -> Optional[Dict]:
+        """
+        Full result from the primary, or from the fallback.
+
+        With HEDGE_FALLBACK, the fallback is started as soon as the primary
+        has taken longer than its usual latency (hedging.hedge_delay) and the
+        first valid result wins; the other adapter is cancelled. Otherwise
+        the fallback only runs after the primary has failed.
+        """
+        primary = self.primary if self.primary.is_available() else None
+        fallback = self.fallback if self.fallback.is_available() else None
+        if primary is not None and fallback is not None and self.settings.get('HEDGE_FALLBACK', True):
+            return self._fetch_hedged(lat, lon)
 
-        return response
+        for adapter in (primary, fallback):
+            if adapter is not None:
+                result = self._fetch_from(adapter, lat, lon)
+                if result is not None:
+                    return result
+        return None
 
-    def _get_from_cache(self, lat: float, lon: float) -> Optional[Dict]:
-        """Get weather data from Redis cache (geohash-based key)."""
-        return self._cache.get(lat, lon)
+    def _fetch_hedged(self, lat: float, lon: float) -> Optional[Dict]:
+        """Race the fallback against a slow primary; first valid result wins."""
+        metrics.increment(self.primary.SOURCE_CODE, 'hedge_eligible')
+        executor = ThreadPoolExecutor(max_workers=2)
+        try:
+            futures = {executor.submit(self._fetch_from, self.primary, lat, lon): self.primary}
+            timeout = hedge_delay(self.primary.SOURCE_CODE)
+            hedged = fallback_started = False
+            while futures:
+                done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    adapter = futures.pop(future)
+                    result = future.result()
+                    if result is not None:
+                        for loser in futures.values():
+                            loser.cancel()
+                        if hedged:
+                            metrics.increment(adapter.SOURCE_CODE, 'hedge_wins')
+                        return result
+
+                if fallback_started:
+                    continue
+                if not done:
+                    # Primary slower than usual: race the fallback against it
+                    hedged = True
+                    metrics.increment(self.primary.SOURCE_CODE, 'hedges')
+                    metrics.increment(self.fallback.SOURCE_CODE, 'hedge_requests')
+                futures[executor.submit(self._fetch_from, self.fallback, lat, lon)] = self.fallback
+                fallback_started = True
+                timeout = None
+            return None
+        finally:
+            # Don't wait for a cancelled loser's request in flight
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch_from(self, adapter, lat: float, lon: float) -> Optional[Dict]:
+        """
+        One adapter's full result (None on failure). Successes that went
+        upstream are timed; cache hits would drag the hedge delay down.
+        """
+        started = time.monotonic()
+        try:
+            if adapter is self.primary:
+                result = adapter.fetch_current(
+                    lat, lon, forecast_days=self.settings.get('FORECAST_DAYS', 10)
+                )
+            else:
+                result = adapter.fetch_current(lat, lon)
+        except Exception as e:
+            role = 'Primary' if adapter is self.primary else 'Fallback'
+            logger.error(f"{role} weather adapter failed: {e}")
+            return None
+        if result is not None and adapter.last_request_upstream:
+            get_latency_tracker(adapter.SOURCE_CODE).record(time.monotonic() - started)
+        return result
+
+    def _fetch_conditions(self, lat: float, lon: float, forecast: Dict) -> Optional[Dict]:
+        """
+        Fresh current conditions from the primary to go with a cached forecast.
+
+        Returns None (refetch everything) if the forecast came from another
+        source or the primary fails.
+        """
+        if forecast.get('source') != self.primary.SOURCE_CODE or not self.primary.is_available():
+            return None
+        try:
+            current = self.primary.fetch_conditions(lat, lon)
+        except Exception as e:
+            logger.error(f"Primary weather adapter failed: {e}")
+            return None
+        if current is None:
+            return None
+
+        # Open-Meteo's current UV index is today's daily maximum
+        daily = forecast.get('daily_forecast') or [{}]
+        if current.get('uv_index') is None:
+            current['uv_index'] = daily[0].get('uv_index_max')
+        return {'current': current, 'source': self.primary.SOURCE_CODE}
+
+    @staticmethod
+    def _build_response(current: Dict, forecast: Dict, location_info: Dict, units: str) -> Dict:
+        """Response from the current and forecast components (shared, not copied)."""
+        return {
+            'location': location_info,
+            'current': current['current'],
+            'hourly_forecast': forecast.get('hourly_forecast', []),
+            'daily_forecast': forecast.get('daily_forecast', []),
+            'source': current['source'],
+            'units': units,
+        }
+
+    def _get_from_cache(self, lat: float, lon: float) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """Get (current, forecast) components from Redis cache (geohash-based keys)."""
+        return self._current_cache.get(lat, lon), self._forecast_cache.get(lat, lon)
+
+    def _save_current(self, lat: float, lon: float, current: Dict):
+        """Save refreshed current conditions, with optional DB write-through."""
+        self._current_cache.set(lat, lon, current)
+
+        if getattr(settings, 'CACHE_SETTINGS', {}).get('WRITE_THROUGH_TO_DB', False):
+            self._write_through_to_db(lat, lon, current)
 
-    def _save_to_cache(self, lat: float, lon: float, result: Dict):
-        """Save weather data to Redis cache, with optional DB write-through."""
-        self._cache.set(lat, lon, result)
+    def _save_to_cache(self, lat: float, lon: float, current: Dict, forecast: Dict):
+        """Save both components to Redis cache, with optional DB write-through."""
+        self._current_cache.set(lat, lon, current)
+        self._forecast_cache.set(lat, lon, forecast)
 
         if getattr(settings, 'CACHE_SETTINGS', {}).get('WRITE_THROUGH_TO_DB', False):
-            self._write_through_to_db(lat, lon, result)
+            self._write_through_to_db(lat, lon, {**current, **forecast})
 
     def _write_through_to_db(self, lat: float, lon: float, result: Dict):
         """Write weather data to DB models for analytics (non-fatal)."""
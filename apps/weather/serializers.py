@@ -4,19 +4,47 @@ DRF serializers for weather API responses.
 from rest_framework import serializers
 from apps.api.serializers import LocationSerializer
 
+from .utils import IMPERIAL_CONVERTERS
+
+
+class MeasurementField(serializers.FloatField):
+    """
+    Float stored in metric and rendered in the serializer context's 'units'.
+
+    Conversion happens as each value is written out, so the metric payload
+    (often shared with the cache) is never copied or modified.
+    """
+
+    def __init__(self, quantity: str, **kwargs):
+        self.convert = IMPERIAL_CONVERTERS[quantity]
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        value = super().to_representation(value)
+        if self.context.get('units') == 'imperial':
+            return self.convert(value)
+        return value
+
+    def project(self, value, context):
+        """to_representation for apps.api.rendering projections."""
+        value = float(value)
+        if context.get('units') == 'imperial':
+            return self.convert(value)
+        return value
+
 
 class CurrentWeatherSerializer(serializers.Serializer):
-    temperature = serializers.FloatField(allow_null=True)
-    feels_like = serializers.FloatField(allow_null=True)
-    dew_point = serializers.FloatField(allow_null=True)
+    temperature = MeasurementField('temperature', allow_null=True)
+    feels_like = MeasurementField('temperature', allow_null=True)
+    dew_point = MeasurementField('temperature', allow_null=True)
     humidity = serializers.IntegerField(allow_null=True)
-    pressure = serializers.FloatField(allow_null=True)
-    visibility = serializers.FloatField(allow_null=True)
+    pressure = MeasurementField('pressure', allow_null=True)
+    visibility = MeasurementField('distance', allow_null=True)
     cloud_cover = serializers.IntegerField(allow_null=True)
     uv_index = serializers.FloatField(allow_null=True)
-    wind_speed = serializers.FloatField(allow_null=True)
+    wind_speed = MeasurementField('speed', allow_null=True)
     wind_direction = serializers.IntegerField(allow_null=True)
-    wind_gusts = serializers.FloatField(allow_null=True)
+    wind_gusts = MeasurementField('speed', allow_null=True)
     weather_code = serializers.IntegerField(allow_null=True, required=False)
     weather_description = serializers.CharField()
     weather_icon = serializers.CharField()
@@ -27,20 +55,20 @@ class CurrentWeatherSerializer(serializers.Serializer):
 
 class HourlyForecastSerializer(serializers.Serializer):
     time = serializers.CharField()
-    temperature = serializers.FloatField(allow_null=True)
-    feels_like = serializers.FloatField(allow_null=True)
-    dew_point = serializers.FloatField(allow_null=True)
+    temperature = MeasurementField('temperature', allow_null=True)
+    feels_like = MeasurementField('temperature', allow_null=True)
+    dew_point = MeasurementField('temperature', allow_null=True)
     humidity = serializers.IntegerField(allow_null=True)
-    precipitation = serializers.FloatField(allow_null=True)
+    precipitation = MeasurementField('precipitation', allow_null=True)
     precipitation_probability = serializers.IntegerField(allow_null=True)
     weather_code = serializers.IntegerField(allow_null=True)
     weather_description = serializers.CharField()
     weather_icon = serializers.CharField()
     cloud_cover = serializers.IntegerField(allow_null=True)
-    visibility = serializers.FloatField(allow_null=True)
-    wind_speed = serializers.FloatField(allow_null=True)
+    visibility = MeasurementField('distance', allow_null=True)
+    wind_speed = MeasurementField('speed', allow_null=True)
     wind_direction = serializers.IntegerField(allow_null=True)
-    wind_gusts = serializers.FloatField(allow_null=True)
+    wind_gusts = MeasurementField('speed', allow_null=True)
     is_day = serializers.IntegerField(allow_null=True)
     uv_index = serializers.FloatField(allow_null=True)
 
@@ -63,23 +91,24 @@ class GoldenHourSerializer(serializers.Serializer):
 
 class DailyForecastSerializer(serializers.Serializer):
     date = serializers.CharField()
-    temp_high = serializers.FloatField(allow_null=True)
-    temp_low = serializers.FloatField(allow_null=True)
-    feels_like_high = serializers.FloatField(allow_null=True)
-    feels_like_low = serializers.FloatField(allow_null=True)
+    temp_high = MeasurementField('temperature', allow_null=True)
+    temp_low = MeasurementField('temperature', allow_null=True)
+    feels_like_high = MeasurementField('temperature', allow_null=True)
+    feels_like_low = MeasurementField('temperature', allow_null=True)
     weather_code = serializers.IntegerField(allow_null=True, required=False)
     weather_description = serializers.CharField()
     weather_icon = serializers.CharField()
-    precipitation_sum = serializers.FloatField(allow_null=True)
+    precipitation_sum = MeasurementField('precipitation', allow_null=True)
     precipitation_probability = serializers.IntegerField(allow_null=True)
-    wind_speed_max = serializers.FloatField(allow_null=True)
-    wind_gusts_max = serializers.FloatField(allow_null=True)
+    wind_speed_max = MeasurementField('speed', allow_null=True)
+    wind_gusts_max = MeasurementField('speed', allow_null=True)
     wind_direction_dominant = serializers.IntegerField(allow_null=True)
     uv_index_max = serializers.FloatField(allow_null=True)
     sunrise = serializers.CharField(allow_null=True)
     sunset = serializers.CharField(allow_null=True)
     moon_phase = MoonPhaseSerializer(allow_null=True, required=False)
     golden_hour = GoldenHourSerializer(allow_null=True, required=False)
+    blue_hour = GoldenHourSerializer(allow_null=True, required=False)
 
 
 class WeatherResponseSerializer(serializers.Serializer):
@@ -1,8 +1,20 @@
 """
 Unit conversion utilities for weather data.
 Internal storage is always metric; convert at response time if needed.
+Responses are converted while serializing (see MeasurementField in
+apps.weather.serializers), so cached metric payloads are never copied or
+modified per request.
 """
 
+UNITS = ('metric', 'imperial')
+
+
+def requested_units(params) -> str:
+    """Lowercased 'units' query parameter (WEATHER_SETTINGS DEFAULT_UNITS if absent)."""
+    from django.conf import settings
+    default_units = settings.WEATHER_SETTINGS.get('DEFAULT_UNITS', 'imperial')
+    return params.get('units', default_units).lower()
+
 
 def celsius_to_fahrenheit(c):
     """Convert Celsius to Fahrenheit."""
@@ -39,49 +51,82 @@ def hpa_to_inhg(hpa):
     return round(hpa * 0.02953, 2)
 
 
+# Metric -> imperial converter per physical quantity
+IMPERIAL_CONVERTERS = {
+    'temperature': celsius_to_fahrenheit,
+    'speed': mps_to_mph,
+    'precipitation': mm_to_inches,
+    'distance': meters_to_miles,
+    'pressure': hpa_to_inhg,
+}
+
+# Unit-bearing fields of each response section and their quantity
+CURRENT_QUANTITIES = {
+    'temperature': 'temperature',
+    'feels_like': 'temperature',
+    'dew_point': 'temperature',
+    'pressure': 'pressure',
+    'visibility': 'distance',
+    'wind_speed': 'speed',
+    'wind_gusts': 'speed',
+}
+
+HOURLY_QUANTITIES = {
+    'temperature': 'temperature',
+    'feels_like': 'temperature',
+    'dew_point': 'temperature',
+    'precipitation': 'precipitation',
+    'visibility': 'distance',
+    'wind_speed': 'speed',
+    'wind_gusts': 'speed',
+}
+
+DAILY_QUANTITIES = {
+    'temp_high': 'temperature',
+    'temp_low': 'temperature',
+    'feels_like_high': 'temperature',
+    'feels_like_low': 'temperature',
+    'precipitation_sum': 'precipitation',
+    'wind_speed_max': 'speed',
+    'wind_gusts_max': 'speed',
+}
+
+
+def _convert(row: dict, quantities: dict) -> dict:
+    converted = dict(row)
+    for field, quantity in quantities.items():
+        converted[field] = IMPERIAL_CONVERTERS[quantity](row.get(field))
+    return converted
+
+
 def convert_current_to_imperial(current: dict) -> dict:
     """Convert a current weather dict from metric to imperial units."""
-    return {
-        **current,
-        'temperature': celsius_to_fahrenheit(current.get('temperature')),
-        'feels_like': celsius_to_fahrenheit(current.get('feels_like')),
-        'dew_point': celsius_to_fahrenheit(current.get('dew_point')),
-        'pressure': hpa_to_inhg(current.get('pressure')),
-        'visibility': meters_to_miles(current.get('visibility')),
-        'wind_speed': mps_to_mph(current.get('wind_speed')),
-        'wind_gusts': mps_to_mph(current.get('wind_gusts')),
-    }
+    return _convert(current, CURRENT_QUANTITIES)
 
 
 def convert_forecast_to_imperial(forecast: list) -> list:
     """Convert a list of daily forecast dicts from metric to imperial units."""
-    converted = []
-    for day in forecast:
-        converted.append({
-            **day,
-            'temp_high': celsius_to_fahrenheit(day.get('temp_high')),
-            'temp_low': celsius_to_fahrenheit(day.get('temp_low')),
-            'feels_like_high': celsius_to_fahrenheit(day.get('feels_like_high')),
-            'feels_like_low': celsius_to_fahrenheit(day.get('feels_like_low')),
-            'precipitation_sum': mm_to_inches(day.get('precipitation_sum')),
-            'wind_speed_max': mps_to_mph(day.get('wind_speed_max')),
-            'wind_gusts_max': mps_to_mph(day.get('wind_gusts_max')),
-        })
-    return converted
+    return [_convert(day, DAILY_QUANTITIES) for day in forecast]
 
 
 def convert_hourly_to_imperial(hourly: list) -> list:
     """Convert a list of hourly forecast dicts from metric to imperial units."""
-    converted = []
-    for h in hourly:
-        converted.append({
-            **h,
-            'temperature': celsius_to_fahrenheit(h.get('temperature')),
-            'feels_like': celsius_to_fahrenheit(h.get('feels_like')),
-            'dew_point': celsius_to_fahrenheit(h.get('dew_point')),
-            'precipitation': mm_to_inches(h.get('precipitation')),
-            'visibility': meters_to_miles(h.get('visibility')),
-            'wind_speed': mps_to_mph(h.get('wind_speed')),
-            'wind_gusts': mps_to_mph(h.get('wind_gusts')),
-        })
-    return converted
+    return [_convert(h, HOURLY_QUANTITIES) for h in hourly]
+
+
+def convert_response(response: dict, units: str) -> dict:
+    """
+    Copy of a metric weather/JASPR response in the requested units.
+
+    Serializers convert field by field with MeasurementField; this is for
+    returning a payload that could not be serialized.
+    """
+    if units != 'imperial':
+        return response
+    current = response.get('current')
+    return {
+        **response,
+        'current': convert_current_to_imperial(current) if current else current,
+        'hourly_forecast': convert_hourly_to_imperial(response.get('hourly_forecast') or []),
+        'daily_forecast': convert_forecast_to_imperial(response.get('daily_forecast') or []),
+    }
@@ -6,19 +6,32 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
+from apps.api.rendering import RenderedResponseMixin, parse_coordinates, render_json
 from apps.core.utils import validate_coordinates
 from .orchestrator import WeatherOrchestrator
 from .serializers import WeatherResponseSerializer
+from .utils import UNITS, convert_response, requested_units
 
 logger = logging.getLogger(__name__)
 
 
-class WeatherView(APIView):
+def weather_key(params):
+    """RenderedCache key of a weather request: (lat, lon, units)."""
+    coordinates = parse_coordinates(params)
+    units = requested_units(params)
+    if coordinates is None or units not in UNITS or params.get('no_cache', 'false').lower() == 'true':
+        return None
+    return (*coordinates, units)
+
+
+class WeatherView(RenderedResponseMixin, APIView):
     """
     Get current weather and 10-day daily forecast.
 
     GET /api/v1/weather/?lat=34.05&lon=-118.24&units=metric
     """
+    rendered_view = 'weather'
+    rendered_key = staticmethod(weather_key)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -57,10 +70,8 @@ class WeatherView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        from django.conf import settings as django_settings
-        default_units = django_settings.WEATHER_SETTINGS.get('DEFAULT_UNITS', 'imperial')
-        units = request.query_params.get('units', default_units).lower()
-        if units not in ('metric', 'imperial'):
+        units = requested_units(request.query_params)
+        if units not in UNITS:
             return Response(
                 {'error': "units must be 'metric' or 'imperial'"},
                 status=status.HTTP_400_BAD_REQUEST
@@ -76,11 +87,11 @@ class WeatherView(APIView):
                 use_cache=not no_cache,
             )
 
-            serializer = WeatherResponseSerializer(data=result)
-            if serializer.is_valid():
-                return Response(serializer.data, status=status.HTTP_200_OK)
-            else:
-                return Response(result, status=status.HTTP_200_OK)
+            content = render_json(WeatherResponseSerializer, result, context={'units': units})
+            if content is None:
+                return Response(convert_response(result, units), status=status.HTTP_200_OK)
+            key = weather_key(request.query_params) if 'error' not in result else None
+            return self.rendered_response(request, content, key)
 
         except Exception as e:
             logger.error(f"Error fetching weather data: {e}", exc_info=True)
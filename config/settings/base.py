@@ -156,7 +156,7 @@ REST_FRAMEWORK = {
         'apps.core.authentication.HasValidAPIKey',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'apps.api.rendering.FastJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -258,7 +258,12 @@ AIR_QUALITY_SETTINGS = {
     # Retry Settings
     'MAX_RETRIES': 3,
     'RETRY_BACKOFF_FACTOR': 2,
+    'RETRY_MAX_BACKOFF': 8,              # Cap on a single jittered backoff (seconds)
+    'RETRY_BUDGET_RATIO': 0.1,           # Retries add at most ~10% on top of requests
+    'RETRY_BUDGET_MIN_PER_SECOND': 0.1,  # Reserve so low-traffic sources can still retry
     'REQUEST_TIMEOUT': 10,
+    'REQUEST_DEADLINE': 12,              # Total seconds per upstream call incl. retries
+    'STREAMING_THRESHOLD_BYTES': 262144, # Larger sensor/station lists are parsed incrementally
 }
 
 
@@ -266,12 +271,44 @@ AIR_QUALITY_SETTINGS = {
 
 WEATHER_SETTINGS = {
     'CURRENT_CACHE_TTL': 300,          # 5 minutes for current conditions
-    'FORECAST_CACHE_TTL': 1800,        # 30 minutes for daily forecast
+    'FORECAST_CACHE_TTL': 1800,        # 30 minutes for hourly + daily forecast (cached apart from current)
     'FORECAST_DAYS': 10,
     'DEFAULT_UNITS': 'imperial',       # 'metric' or 'imperial'
     'REQUEST_TIMEOUT': 10,
     'MAX_RETRIES': 3,
     'RETRY_BACKOFF_FACTOR': 2,
+    # Hedging: once the primary is slower than its recent p90, race the
+    # fallback against it and take the first valid result
+    'HEDGE_FALLBACK': True,
+    'HEDGE_PERCENTILE': 0.9,
+    'HEDGE_MIN_SAMPLES': 20,           # Timed calls needed before the percentile is trusted
+    'HEDGE_DEFAULT_DELAY': 2.0,        # Seconds to wait until then
+    'HEDGE_MIN_DELAY': 0.2,
+    'HEDGE_MAX_DELAY': 5.0,
+}
+
+
+# Air Quality Forecast Blending Settings
+
+FORECAST_SETTINGS = {
+    'HOURLY_HOURS': 48,                  # Length of the hourly forecast series
+    'DAILY_DAYS': 10,                    # Length of the daily forecast series
+    'MAX_INTERPOLATION_GAP_HOURS': 6,    # Longest per-source gap filled linearly
+    'INTERPOLATED_WEIGHT': 0.5,          # Weight multiplier for interpolated values
+    'DEFAULT_HALF_LIFE_HOURS': 48,       # Hours of lead time until a source's weight halves
+    'LEAD_TIME_HALF_LIFE_HOURS': {
+        'EPA_AIRNOW': 24,                # Forecaster-issued daily AQI; best for today/tomorrow
+        'OPENWEATHERMAP': 48,
+        'OPEN_METEO_AQ': 72,             # CAMS model output degrades slowly
+    },
+    # How often each source publishes a new forecast; a source's series is
+    # cached for its current window and only refetched once a new one starts
+    'DEFAULT_SOURCE_REFRESH_SECONDS': 3600,
+    'SOURCE_REFRESH_SECONDS': {
+        'EPA_AIRNOW': 21600,             # Issued daily, occasionally amended
+        'OPENWEATHERMAP': 3600,          # Hourly updates
+        'OPEN_METEO_AQ': 10800,          # CAMS runs, republished every few hours
+    },
 }
 
 
@@ -280,6 +317,124 @@ WEATHER_SETTINGS = {
 CACHE_SETTINGS = {
     'GEOHASH_PRECISION': 6,          # ~1.2km cells (nearby requests share cache)
     'WRITE_THROUGH_TO_DB': True,     # Also write to DB models for analytics
+    'SNAP_TO_MODEL_GRID': True,      # Snap upstream calls for gridded sources to the model grid
+    'RENDERED_RESPONSE_TTL': 60,     # Encoded bodies for repeat requests in the same geohash cell (0 = off)
+    'NEGATIVE_CACHE_TTL': 1800,      # A source with no data for a cell is skipped there this long (0 = off)
+    # Namespaces whose keys are listed per geohash prefix so an area can be
+    # evicted at once (KEY_INDEX_PRECISION must not exceed their precision)
+    'INDEXED_NAMESPACES': ('aq', 'aq_wide', 'jaspr', 'rendered'),
+    'KEY_INDEX_PRECISION': 4,        # ~39km x 20km index cells
+    'KEY_INDEX_TTL': 7200,           # At least the longest TTL of an indexed entry
+    # A station changing AQI category evicts these namespaces around it
+    'INVALIDATION_NAMESPACES': ('aq', 'aq_wide', 'jaspr', 'rendered'),
+    'INVALIDATION_RADIUS_KM': 25,
+    'INVALIDATION_AQI_MARGIN': 10,    # AQI points past the old category's range before it counts
+    # A miss may be answered from an adjacent cell's blend this close and
+    # this recent, while the cell itself is refreshed in the background
+    'NEIGHBOR_MAX_DISTANCE_KM': 2.0,  # 0 = off
+    'NEIGHBOR_MAX_AGE': 300,
+    'BACKGROUND_REFRESH_WORKERS': 2,
+}
+
+
+# Publish Schedule Settings
+# Blended data is cached until shortly after its sources are next expected
+# to publish newer readings (see apps/core/freshness.py). INTERVAL is the
+# publish cadence, LAG how long after a reading's timestamp it is posted.
+
+PUBLISH_SCHEDULES = {
+    'GRACE_SECONDS': 300,            # Expire this long after the next expected update
+    'MIN_TTL': 60,
+    'MAX_TTL': 3600,
+    'SOURCES': {
+        'EPA_AIRNOW': {'INTERVAL': 3600, 'LAG': 5400},   # Hourly averages, posted ~30 min after the hour ends
+        'WAQI': {'INTERVAL': 3600, 'LAG': 1800},
+        'AIRVISUAL': {'INTERVAL': 3600, 'LAG': 0},
+        'OPENWEATHERMAP': {'INTERVAL': 3600, 'LAG': 0},
+        'OPEN_METEO_AQ': {'INTERVAL': 3600, 'LAG': 0},   # Hourly model values
+        'OPEN_METEO': {'INTERVAL': 900, 'LAG': 0},       # 15-minutely current conditions
+        'PURPLEAIR': {'INTERVAL': 120, 'LAG': 0, 'GRACE': 30},
+    },
+}
+
+
+# Adaptive TTL Settings
+# The schedule-based TTL of a blended AQ result is stretched while the
+# cell's recent AQI readings are stable and cut while they swing.
+
+ADAPTIVE_TTL_SETTINGS = {
+    'ENABLED': True,
+    'HISTORY_SIZE': 12,              # Recent blended readings kept per cell...
+    'HISTORY_WINDOW': 21600,         # ...from the last 6 hours
+    'STABLE_STDEV': 5,               # AQI spread at or below which a cell counts as stable
+    'VOLATILE_STDEV': 25,            # AQI spread at or above which it counts as volatile
+    'STABLE_MULTIPLIER': 2.0,
+    'VOLATILE_MULTIPLIER': 0.25,
+    'MIN_TTL': 60,
+    'MAX_TTL': 7200,
+}
+
+
+# Upstream HTTP Cache Settings
+# Identical upstream GETs are answered from the shared cache while fresh.
+
+HTTP_CACHE_SETTINGS = {
+    'ENABLED': env.bool('HTTP_CACHE_ENABLED', default=True),
+    'MAX_TTL': 86400,                # Never trust upstream freshness beyond a day
+    'STALE_RETENTION': 3600,         # Keep expired entries with ETag/Last-Modified for revalidation
+}
+
+
+# Station Mapping Settings
+# Nearest-station sources (WAQI, AirVisual, AirNow) remember which station
+# answers for a cell and share that station's reading across cells.
+
+STATION_SETTINGS = {
+    'ENABLED': env.bool('STATION_MAPPING_ENABLED', default=True),
+    'MAPPING_TTL': 7 * 86400,        # Cell -> station mappings are re-learned weekly
+    'INDEX_PRECISION': 5,            # Geohash area cells (~5km) listing the stations known there
+}
+
+
+# Upstream Batching Settings
+# Concurrent single-location calls to sources that accept coordinate lists
+# (Open-Meteo) are collected per process and sent as one request.
+
+BATCH_SETTINGS = {
+    'ENABLED': env.bool('UPSTREAM_BATCHING_ENABLED', default=True),
+    'WINDOW_MS': 5,                  # How long the first caller waits for others to join
+    'MAX_LOCATIONS': 50,             # A full batch is sent without waiting out the window
+}
+
+
+# Circuit Breaker Settings
+
+CIRCUIT_BREAKER_SETTINGS = {
+    'SHARED': env.bool('SHARED_CIRCUIT_BREAKER', default=True),  # Share state across workers via Redis
+    'WINDOW_SECONDS': 60,            # Sliding window for failure-rate tracking
+    'BUCKET_SECONDS': 10,            # Window granularity
+    'FAILURE_RATE_THRESHOLD': 0.5,   # Trip when >= 50% of requests in the window fail...
+    'MIN_REQUESTS': 10,              # ...and the window holds at least this many requests
+    'PROBE_TIMEOUT': 30,             # How long one worker holds the HALF_OPEN probe
+}
+
+
+# Upstream Quota Settings
+# Limits are shared across workers via the cache. Sources not listed are unlimited.
+
+QUOTA_SETTINGS = {
+    'ENABLED': env.bool('UPSTREAM_QUOTAS_ENABLED', default=True),
+    'LOW_WATERMARK': 0.2,            # Below 20% remaining the orchestrator degrades
+    'LOW_TRUST_THRESHOLD': 0.75,     # Sources weighted below this are skipped when low
+    'LIMITS': {
+        'PURPLEAIR': {
+            'PER_DAY': env.int('PURPLEAIR_DAILY_POINTS', default=100000),
+            'COST_PER_CALL': 50,     # Approx. points for one bounding-box sensors query
+        },
+        'WAQI': {'PER_MINUTE': 1000},
+        'AIRVISUAL': {'PER_MINUTE': 5, 'PER_DAY': 500},
+        'OPENWEATHERMAP': {'PER_MINUTE': 60, 'PER_DAY': 1000},
+    },
 }
 
 
@@ -36,6 +36,9 @@ CACHES = {
     }
 }
 
+# DummyCache cannot hold shared circuit breaker state
+CIRCUIT_BREAKER_SETTINGS = {**CIRCUIT_BREAKER_SETTINGS, 'SHARED': False}
+
 # Disable rate limiting in development
 REST_FRAMEWORK = REST_FRAMEWORK.copy()
 REST_FRAMEWORK['DEFAULT_THROTTLE_CLASSES'] = []
@@ -50,6 +53,6 @@ CORS_ALLOW_ALL_ORIGINS = True
 
 # REST Framework - Add browsable API in development
 REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
-    'rest_framework.renderers.JSONRenderer',
+    'apps.api.rendering.FastJSONRenderer',
     'rest_framework.renderers.BrowsableAPIRenderer',
 ]
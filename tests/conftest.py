@@ -6,16 +6,18 @@ from datetime import timedelta
 from decimal import Decimal
 from unittest.mock import MagicMock
 
+from django.core.cache import cache
+from django.test import override_settings
 from django.utils import timezone
 from rest_framework.test import APIClient
 
 
 @pytest.fixture
 def sample_source_data():
-    """Create a SourceData instance (unsaved) for testing."""
-    from apps.adapters.models import SourceData
+    """Create an Observation for testing."""
+    from apps.adapters.observation import Observation
 
-    return SourceData(
+    return Observation(
         source='EPA_AIRNOW',
         lat=Decimal('34.050'),
         lon=Decimal('-118.240'),
@@ -31,27 +33,70 @@ def sample_source_data():
 
 @pytest.fixture
 def make_source_data():
-    """Factory fixture to create SourceData instances with custom values."""
-    from apps.adapters.models import SourceData
+    """Factory fixture to create Observation records with custom values."""
+    from apps.adapters.observation import Observation
 
     def _make(source='EPA_AIRNOW', aqi=50, distance_km=5.0,
               confidence_score=100.0, quality_level='verified',
               pollutants=None, timestamp=None, **kwargs):
-        return SourceData(
+        return Observation(
             source=source,
-            lat=Decimal('34.050'),
-            lon=Decimal('-118.240'),
+            lat=kwargs.get('lat', Decimal('34.050')),
+            lon=kwargs.get('lon', Decimal('-118.240')),
             timestamp=timestamp or (timezone.now() - timedelta(minutes=10)),
             aqi=aqi,
             pollutants=pollutants or {'pm25': 12.0},
             quality_level=quality_level,
             distance_km=distance_km,
             confidence_score=confidence_score,
+            station_id=kwargs.get('station_id', ''),
             station_name=kwargs.get('station_name', 'Test Station'),
         )
     return _make
 
 
+@pytest.fixture
+def locmem_cache():
+    """Replace the DummyCache of the test settings with an empty LocMemCache."""
+    locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests'}}
+    with override_settings(CACHES=locmem):
+        cache.clear()
+        yield cache
+        cache.clear()
+
+
+@pytest.fixture
+def make_adapter():
+    """
+    Factory fixture for minimal BaseAdapter instances.
+
+    The source code names the adapter (its metrics, quota, cache keys);
+    other class attributes (HTTP_CACHE_MIN_FRESHNESS, ...) are passed as
+    keywords. fetch_current(adapter, lat, lon) defaults to returning [].
+    _log_response, _update_status and _get_api_key (returning api_key;
+    an API key is required when one is given) are MagicMocks.
+    """
+    from apps.adapters.base import BaseAdapter
+
+    def _make(source_code='TEST', api_key=None, fetch_current=None, **attrs):
+        adapter_class = type(f"{source_code.title().replace('_', '')}Adapter", (BaseAdapter,), {
+            'SOURCE_NAME': source_code,
+            'SOURCE_CODE': source_code,
+            'API_BASE_URL': f"https://api.{source_code.lower()}.example.com/",
+            'REQUIRES_API_KEY': api_key is not None,
+            'fetch_current': lambda self, lat, lon, **kwargs: (
+                fetch_current(self, lat, lon) if fetch_current else []
+            ),
+            **attrs,
+        })
+        adapter = adapter_class()
+        adapter._log_response = MagicMock()
+        adapter._update_status = MagicMock()
+        adapter._get_api_key = MagicMock(return_value=api_key)
+        return adapter
+    return _make
+
+
 @pytest.fixture
 def api_key(db):
     """Create an active API key for authenticated test requests."""
@@ -94,3 +139,12 @@ def mock_adapter_settings():
         'RETRY_BACKOFF_FACTOR': 0,
         'REQUEST_TIMEOUT': 2,
     }
+
+
+@pytest.fixture(autouse=True)
+def no_retry_sleep(monkeypatch):
+    """Skip real backoff sleeps and start every test with fresh retry budgets."""
+    from apps.adapters import retry
+
+    monkeypatch.setattr(retry, '_sleep', lambda seconds: None)
+    monkeypatch.setattr(retry, '_budgets', {})
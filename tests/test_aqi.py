@@ -0,0 +1,92 @@
+"""
+Tests for the AQI breakpoint engine.
+"""
+import pytest
+
+from apps.core import aqi
+
+
+class TestSubIndex:
+
+    @pytest.mark.parametrize('concentration, expected', [
+        (0.0, 0),
+        (9.0, 50),
+        (9.05, 50),     # truncated to 9.0, not lost in the gap before 9.1
+        (9.1, 51),
+        (35.4, 100),
+        (35.5, 101),
+        (125.4, 200),
+        (325.4, 500),
+        (900.0, 500),
+    ])
+    def test_pm25_2024_breakpoints(self, concentration, expected):
+        assert aqi.sub_index('pm25', concentration) == expected
+
+    def test_truncation_uses_reporting_precision(self):
+        # 0.0709 ppm truncates to 0.070, the top of "Moderate"
+        assert aqi.sub_index('o3', 0.0709) == 100
+        assert aqi.sub_index('o3', 0.071) == 101
+
+    def test_o3_8_hour_table_ends_at_0_200(self):
+        assert aqi.sub_index('o3', 0.200) == 300
+        # No EPA 8-hour segment above 0.200 ppm
+        assert aqi.sub_index('o3', 0.201) == aqi.MAX_INDEX
+        assert aqi.sub_index('o3', 0.3) == aqi.MAX_INDEX
+
+    def test_ugm3_conversion(self):
+        # 100 µg/m³ NO2 is ~53 ppb
+        assert aqi.sub_index('no2', 100, ugm3=True) == aqi.sub_index('no2', 53)
+
+    def test_missing_and_unknown(self):
+        assert aqi.sub_index('pm25', None) is None
+        assert aqi.sub_index('radon', 1.0) is None
+        assert aqi.sub_index('pm10', -3) == 0
+
+    def test_batch_matches_scalar(self):
+        values = [None, 0.0, 4.2, 9.1, 40.0, 130.7, 400.0]
+        assert aqi.sub_indices('pm25', values) == [aqi.sub_index('pm25', v) for v in values]
+
+
+class TestOverallAQI:
+
+    def test_dominant_pollutant(self):
+        assert aqi.aqi_from_concentrations({'pm25': 12.0, 'o3': 0.080, 'co': None}) == (
+            aqi.sub_index('o3', 0.080), 'o3'
+        )
+
+    def test_nothing_computable(self):
+        assert aqi.aqi_from_concentrations({'pm25': None}) == (None, None)
+
+    def test_series(self):
+        values, dominant = aqi.series_aqi(
+            {'pm25': [5.0, 40.0, None], 'o3': [0.060, 0.010]}, length=3
+        )
+        assert values == [aqi.sub_index('o3', 0.060), aqi.sub_index('pm25', 40.0), None]
+        assert dominant == ['o3', 'pm25', None]
+
+
+class TestCategory:
+
+    def test_epa(self):
+        assert aqi.category(50)['category'] == 'Good'
+        assert aqi.category(51)['category'] == 'Moderate'
+        assert aqi.category(500)['category'] == 'Hazardous'
+        assert aqi.category(501) is None
+
+    def test_aqhi(self):
+        assert aqi.category(1, scale='AQHI')['category'] == 'Low Risk'
+        assert aqi.category(10, scale='AQHI')['category'] == 'High Risk'
+        assert aqi.category(0, scale='AQHI') is None
+
+    def test_unknown_scale(self):
+        assert aqi.category(72, scale='FOO') is None
+        assert aqi.category(2, scale='FOO') is None
+
+    def test_category_name_clamps(self):
+        assert aqi.category_name(None) == 'unknown'
+        assert aqi.category_name(-5) == 'Good'
+        assert aqi.category_name(650) == 'Hazardous'
+
+    def test_aqhi_formula(self):
+        assert aqi.aqhi(0, 0, 0) == 1
+        assert aqi.aqhi(30, 20, 10) == 4
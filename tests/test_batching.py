@@ -0,0 +1,148 @@
+"""
+Tests for micro-batching concurrent upstream calls into multi-location requests.
+"""
+import threading
+from unittest.mock import MagicMock, patch
+
+from apps.adapters.batching import MicroBatcher, get_batcher
+from apps.adapters.open_meteo_air_quality import OpenMeteoAirQualityAdapter
+
+
+def _submit_concurrently(submit, coordinates):
+    """Run submit(coordinate) for each coordinate on its own thread; results in order."""
+    results = [None] * len(coordinates)
+    start = threading.Barrier(len(coordinates))
+
+    def run(i):
+        start.wait()
+        results[i] = submit(coordinates[i])
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(coordinates))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestMicroBatcher:
+
+    def test_concurrent_calls_share_one_fetch(self):
+        batcher = MicroBatcher(window=0.2, max_size=10)
+        calls = []
+
+        def fetch_many(coordinates):
+            calls.append(list(coordinates))
+            return [f"{lat},{lon}" for lat, lon in coordinates]
+
+        coordinates = [(1.0, 2.0), (3.0, 4.0), (1.0, 2.0)]
+        results = _submit_concurrently(
+            lambda c: batcher.submit('q', c, fetch_many, timeout=5), coordinates
+        )
+
+        assert results == ['1.0,2.0', '3.0,4.0', '1.0,2.0']
+        assert len(calls) == 1
+        assert sorted(calls[0]) == [(1.0, 2.0), (3.0, 4.0)]
+
+    def test_full_batch_is_sent_without_waiting(self):
+        batcher = MicroBatcher(window=5, max_size=2)
+        calls = []
+
+        def fetch_many(coordinates):
+            calls.append(len(coordinates))
+            return list(coordinates)
+
+        results = _submit_concurrently(
+            lambda c: batcher.submit('q', c, fetch_many, timeout=5), [(1.0, 1.0), (2.0, 2.0)]
+        )
+
+        assert results == [(1.0, 1.0), (2.0, 2.0)]
+        assert calls == [2]
+
+    def test_groups_are_not_mixed(self):
+        batcher = MicroBatcher(window=0.05, max_size=10)
+        calls = []
+
+        def fetch_many(coordinates):
+            calls.append(len(coordinates))
+            return list(coordinates)
+
+        _submit_concurrently(
+            lambda c: batcher.submit(c[0], c, fetch_many, timeout=5), [(1.0, 0.0), (2.0, 0.0)]
+        )
+        assert calls == [1, 1]
+
+    def test_failed_fetch_gives_none_to_every_caller(self):
+        batcher = MicroBatcher(window=0.1, max_size=10)
+        results = _submit_concurrently(
+            lambda c: batcher.submit('q', c, lambda coordinates: None, timeout=5),
+            [(1.0, 1.0), (2.0, 2.0)],
+        )
+        assert results == [None, None]
+
+    def test_disabled(self, settings):
+        settings.BATCH_SETTINGS = {'ENABLED': False}
+        assert get_batcher('OPEN_METEO') is None
+
+
+class TestBatchedAdapter:
+
+    def test_concurrent_misses_become_one_multi_location_call(self, settings):
+        settings.BATCH_SETTINGS = {'ENABLED': True, 'WINDOW_MS': 200, 'MAX_LOCATIONS': 10}
+        upstream = []
+
+        def make_request(adapter, endpoint, params=None, **kwargs):
+            upstream.append(params)
+            return [
+                {'current': {'us_aqi': 10 * (i + 1)}, 'hourly': {}}
+                for i in range(len(params['latitude'].split(',')))
+            ]
+
+        with patch.object(OpenMeteoAirQualityAdapter, '_make_request', make_request):
+            results = _submit_concurrently(
+                lambda c: OpenMeteoAirQualityAdapter().fetch_current(*c),
+                [(34.06, -118.24), (40.71, -74.01)],
+            )
+
+        assert len(upstream) == 1
+        params = upstream[0]
+        assert params['forecast_days'] == 2
+        locations = list(zip(params['latitude'].split(','), params['longitude'].split(',')))
+        aqi_by_location = {
+            ('34.1', '-118.2'): results[0]['current']['aqi'],
+            ('40.7', '-74.0'): results[1]['current']['aqi'],
+        }
+        assert [aqi_by_location[location] for location in locations] == [10, 20]
+
+    def test_single_call_keeps_plain_params(self, settings):
+        settings.BATCH_SETTINGS = {'ENABLED': True, 'WINDOW_MS': 1, 'MAX_LOCATIONS': 10}
+        adapter = OpenMeteoAirQualityAdapter()
+        with patch.object(adapter, '_make_request', return_value=None) as mock_request:
+            assert adapter.fetch_current(34.0522, -118.2437) is None
+
+        params = mock_request.call_args[1]['params']
+        assert (params['latitude'], params['longitude']) == (34.1, -118.2)
+
+    @patch.object(OpenMeteoAirQualityAdapter, '_log_response')
+    @patch.object(OpenMeteoAirQualityAdapter, '_update_status')
+    def test_batch_answer_cached_per_point(self, mock_status, mock_log, settings, locmem_cache):
+        settings.BATCH_SETTINGS = {'ENABLED': True, 'WINDOW_MS': 200, 'MAX_LOCATIONS': 10}
+        points = [(34.1, -118.2), (40.7, -74.0)]
+        response = MagicMock(status_code=200, headers={'Cache-Control': 'max-age=600'})
+        response.json.return_value = [{'current': {'us_aqi': 10}}, {'current': {'us_aqi': 20}}]
+        adapters = [OpenMeteoAirQualityAdapter() for _ in points]
+
+        def fetch(index):
+            params = {'latitude': points[index][0], 'longitude': points[index][1], 'current': 'us_aqi'}
+            return adapters[index]._make_location_request('air-quality', params)
+
+        with patch('requests.Session.request', return_value=response) as mock_request:
+            results = _submit_concurrently(fetch, [0, 1])
+            # Each point is now answered from its own cache entry
+            assert fetch(1) == results[1]
+            assert fetch(0) == results[0]
+
+        assert mock_request.call_count == 1
+        assert sorted(r['current']['us_aqi'] for r in results) == [10, 20]
+        # The follower's adapter succeeded too, though only the leader called upstream
+        assert all(adapter.last_request_ok for adapter in adapters)
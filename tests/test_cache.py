@@ -2,13 +2,17 @@
 Tests for geohash encoding and ResponseCache.
 """
 import json
+import threading
 import pytest
 from datetime import datetime, date
 from decimal import Decimal
 from unittest.mock import patch, MagicMock
 
-from apps.core.geohash import encode
-from apps.core.cache import ResponseCache, _CacheEncoder
+from django.core.cache import cache
+from django.test import override_settings
+
+from apps.core.geohash import cells_within, decode, decode_bbox, encode, neighbors
+from apps.core.cache import ResponseCache, _CacheEncoder, invalidate_within
 
 
 # ---------------------------------------------------------------------------
@@ -204,3 +208,253 @@ class TestResponseCache:
         result = rc.delete(34.05, -118.24)
         assert result is True
         mock_cache.delete.assert_called_once()
+
+
+# ---------------------------------------------------------------------------
+# Geohash-prefix index and area invalidation
+# ---------------------------------------------------------------------------
+
+class TestGeohashDecode:
+
+    def test_decode_round_trips(self):
+        gh = encode(34.05, -118.24, 6)
+        lat_min, lat_max, lon_min, lon_max = decode_bbox(gh)
+        assert lat_min <= 34.05 <= lat_max and lon_min <= -118.24 <= lon_max
+        assert encode(*decode(gh), 6) == gh
+
+    def test_neighbors_surround_the_cell(self):
+        gh = encode(34.05, -118.24, 6)
+        cells = neighbors(gh)
+        assert len(set(cells)) == 8 and gh not in cells
+        lat, lon = decode(gh)
+        lat_min, lat_max, lon_min, lon_max = decode_bbox(gh)
+        assert encode(lat + (lat_max - lat_min), lon, 6) in cells
+        assert encode(lat, lon - (lon_max - lon_min), 6) in cells
+
+    def test_neighbors_wrap_the_antimeridian(self):
+        cells = neighbors(encode(0.0, 179.99, 3))
+        assert any(decode(cell)[1] < 0 for cell in cells)
+
+    def test_cells_within_cover_the_circle(self):
+        cells = cells_within(34.05, -118.24, 25, 4)
+        for lat, lon in [(34.05, -118.24), (34.27, -118.24), (34.05, -118.51), (33.83, -117.97)]:
+            assert encode(lat, lon, 4) in cells
+        assert encode(40.71, -74.01, 4) not in cells
+
+
+class TestAreaInvalidation:
+
+    @pytest.fixture(autouse=True)
+    def indexed_namespaces(self, locmem_cache, settings):
+        settings.CACHE_SETTINGS = {
+            **settings.CACHE_SETTINGS,
+            'INDEXED_NAMESPACES': ('aq', 'jaspr'),
+            'KEY_INDEX_PRECISION': 4,
+        }
+
+    def test_evicts_only_cells_within_radius(self):
+        aq = ResponseCache(namespace='aq', default_ttl=600)
+        jaspr = ResponseCache(namespace='jaspr', default_ttl=300)
+        fcst = ResponseCache(namespace='fcst', default_ttl=600)
+        aq.set(34.05, -118.24, {'aqi': 50})
+        aq.set(34.10, -118.30, {'aqi': 55})
+        aq.set(34.60, -118.24, {'aqi': 30})   # ~61km north
+        jaspr.set_raw(34.05, -118.24, b'{}', 'hist')
+        fcst.set(34.05, -118.24, {'hourly': []})
+
+        evicted = invalidate_within(['aq', 'jaspr', 'fcst'], 34.06, -118.25, 15)
+
+        assert evicted == 3
+        assert aq.get(34.05, -118.24) is None
+        assert aq.get(34.10, -118.30) is None
+        assert jaspr.get_raw(34.05, -118.24, 'hist') is None
+        assert aq.get(34.60, -118.24) == {'aqi': 30}
+        # Not indexed: left to expire
+        assert fcst.get(34.05, -118.24) == {'hourly': []}
+
+    def test_category_change_evicts_around_station(self, make_source_data):
+        from apps.fusion.invalidation import evict_around_changes
+
+        aq = ResponseCache(namespace='aq', default_ttl=600)
+        station = dict(station_name='Los Angeles-North Main Street')
+        aq.set(34.05, -118.24, {'aqi': 48})
+
+        with override_settings(CACHE_SETTINGS={
+            'INDEXED_NAMESPACES': ('aq',), 'INVALIDATION_NAMESPACES': ('aq',),
+            'INVALIDATION_RADIUS_KM': 25,
+        }):
+            assert evict_around_changes([make_source_data(aqi=48, **station)]) == 0
+            assert evict_around_changes([make_source_data(aqi=50, **station)]) == 0
+            assert aq.get(34.05, -118.24) == {'aqi': 48}
+            assert evict_around_changes([make_source_data(aqi=120, **station)]) == 1
+
+        assert aq.get(34.05, -118.24) is None
+
+    def test_same_named_sensors_are_separate_stations(self, make_source_data):
+        from apps.fusion.invalidation import changed_stations
+
+        def outside(lat, aqi):
+            return make_source_data(source='PURPLEAIR', aqi=aqi, station_name='Outside', lat=lat)
+
+        # Blends around each sensor see only that one
+        assert changed_stations([outside(34.05, 30)]) == []
+        assert changed_stations([outside(34.30, 160)]) == []
+        assert changed_stations([outside(34.05, 32)]) == []
+
+    def test_boundary_noise_does_not_count_as_change(self, make_source_data):
+        from apps.fusion.invalidation import changed_stations
+
+        def reading(aqi):
+            return make_source_data(source='PURPLEAIR', aqi=aqi, station_id='131077')
+
+        assert changed_stations([reading(48)]) == []
+        assert changed_stations([reading(53)]) == []
+        assert changed_stations([reading(47)]) == []
+        assert changed_stations([reading(61)]) != []
+        # Now recorded as moderate: back into good only past the margin
+        assert changed_stations([reading(45)]) == []
+        assert changed_stations([reading(39)]) != []
+
+    def test_concurrent_writers_on_redis_keep_both_keys(self):
+        redis = _FakeRedis()
+        aq = ResponseCache(namespace='aq', default_ttl=600)
+        barrier = threading.Barrier(2)
+
+        def write(lat, lon):
+            barrier.wait()
+            aq.set(lat, lon, {'aqi': 50})
+
+        with patch('apps.core.cache._redis_connection', return_value=redis):
+            writers = [
+                threading.Thread(target=write, args=point)
+                for point in ((34.05, -118.24), (34.06, -118.26))
+            ]
+            for writer in writers:
+                writer.start()
+            for writer in writers:
+                writer.join()
+
+            assert len(redis.sets[cache.make_key('idx:aq:9q5c')]) == 2
+            assert invalidate_within(['aq'], 34.05, -118.25, 10) == 2
+
+        assert aq.get(34.05, -118.24) is None
+        assert aq.get(34.06, -118.26) is None
+        assert redis.sets[cache.make_key('idx:aq:9q5c')] == set()
+
+
+class _FakeRedis:
+    """The set commands of a Redis client, each applied atomically."""
+
+    def __init__(self):
+        self.sets = {}
+        self._lock = threading.Lock()
+
+    def pipeline(self):
+        return _FakePipeline(self)
+
+    def sadd(self, name, *values):
+        with self._lock:
+            self.sets.setdefault(name, set()).update(v.encode() for v in values)
+
+    def expire(self, name, seconds):
+        pass
+
+    def smembers(self, name):
+        with self._lock:
+            return set(self.sets.get(name, ()))
+
+    def srem(self, name, *values):
+        with self._lock:
+            self.sets.get(name, set()).difference_update(v.encode() for v in values)
+
+
+class _FakePipeline:
+
+    def __init__(self, redis):
+        self._redis = redis
+        self._commands = []
+
+    def __getattr__(self, command):
+        return lambda *args: self._commands.append((command, args))
+
+    def execute(self):
+        for command, args in self._commands:
+            getattr(self._redis, command)(*args)
+
+
+@pytest.mark.usefixtures('locmem_cache')
+class TestNeighborLookup:
+
+    def _neighbor_point(self, lat, lon):
+        """Centre of the cell east of the point's cell."""
+        gh = encode(lat, lon, 6)
+        lat_min, lat_max, lon_min, lon_max = decode_bbox(gh)
+        return decode(gh)[0], lon_max + (lon_max - lon_min) / 2
+
+    def test_recent_neighbor_entry_served(self):
+        from django.utils import timezone
+
+        rc = ResponseCache(namespace='aq', default_ttl=600, geohash_precision=6)
+        neighbor = self._neighbor_point(34.05, -118.24)
+        rc.set(*neighbor, {'aqi': 42, 'cached_at': timezone.now().isoformat()})
+
+        assert rc.get(34.05, -118.24) is None
+        assert rc.get_nearby(34.05, -118.24, max_distance_km=2.0, max_age=300) == {
+            'aqi': 42, 'cached_at': rc.get(*neighbor)['cached_at'],
+        }
+        assert rc.get_nearby(34.05, -118.24, max_distance_km=0.1) is None
+
+    def test_old_or_unstamped_neighbor_entry_ignored(self):
+        from datetime import timedelta
+        from django.utils import timezone
+
+        rc = ResponseCache(namespace='aq', default_ttl=600, geohash_precision=6)
+        neighbor = self._neighbor_point(34.05, -118.24)
+        old = (timezone.now() - timedelta(minutes=10)).isoformat()
+        rc.set(*neighbor, {'aqi': 42, 'cached_at': old})
+        assert rc.get_nearby(34.05, -118.24, max_distance_km=2.0, max_age=300) is None
+
+        rc.set(*neighbor, {'aqi': 42})
+        assert rc.get_nearby(34.05, -118.24, max_distance_km=2.0, max_age=300) is None
+        assert rc.get_nearby(34.05, -118.24, max_distance_km=2.0) == {'aqi': 42}
+
+    @pytest.mark.django_db
+    def test_orchestrator_refreshes_cell_after_neighbor_hit(self, settings, make_source_data):
+        from apps.api.orchestrator import AirQualityOrchestrator, _refresh_cell
+        from apps.fusion.engine import FusionEngine
+
+        settings.CACHE_SETTINGS = {**settings.CACHE_SETTINGS, 'NEIGHBOR_MAX_DISTANCE_KM': 2.0}
+        FusionEngine().blend(*self._neighbor_point(34.05, -118.24), [make_source_data(aqi=42)], use_cache=False)
+
+        orch = AirQualityOrchestrator()
+        orch.location_service = MagicMock()
+        orch.location_service.reverse_geocode.return_value = {'country': 'US'}
+        orch.location_service.get_region_config.return_value = {'source_priority': [], 'aqi_scale': 'EPA'}
+        with patch('apps.api.orchestrator.schedule_refresh') as mock_schedule, \
+                patch.object(orch, '_fetch_all_current') as mock_fetch:
+            result = orch.get_air_quality(34.05, -118.24)
+
+        assert result['current']['aqi'] == 42
+        assert (result['lat'], result['lon']) == (34.05, -118.24)
+        mock_fetch.assert_not_called()
+        key, refresh, *args = mock_schedule.call_args[0]
+        assert key == f"aq:{encode(34.05, -118.24, 6)}"
+        assert (refresh, args) == (_refresh_cell, [34.05, -118.24, 25])
+
+    def test_background_refresh_runs_once_per_key(self):
+        import threading
+        from apps.core.background import schedule_refresh
+
+        release, done = threading.Event(), threading.Event()
+        calls = []
+
+        def refresh(value):
+            calls.append(value)
+            release.wait(5)
+            done.set()
+
+        assert schedule_refresh('aq:9q5ctr', refresh, 1) is True
+        assert schedule_refresh('aq:9q5ctr', refresh, 2) is False
+        release.set()
+        assert done.wait(5)
+        assert calls == [1]
@@ -103,3 +103,119 @@ class TestBaseAdapterCircuitBreaker:
             adapter.circuit_breaker.record_failure()
 
         assert adapter.is_available() is False
+
+
+@pytest.mark.usefixtures('locmem_cache')
+class TestSharedCircuitBreaker:
+    """Tests for the cache-backed breaker shared across workers."""
+
+    def _make(self, **kwargs):
+        from apps.adapters.base import SharedCircuitBreaker
+        defaults = {'name': 'TEST', 'failure_threshold': 3, 'recovery_timeout': 10,
+                    'min_requests': 100}
+        defaults.update(kwargs)
+        return SharedCircuitBreaker(**defaults)
+
+    def test_failures_are_shared_between_workers(self):
+        worker_a = self._make()
+        worker_b = self._make()
+        worker_a.record_failure()
+        worker_a.record_failure()
+        worker_b.record_failure()
+
+        assert worker_a.state == CircuitBreaker.OPEN
+        assert worker_b.allow_request() is False
+
+    def test_success_resets_shared_consecutive_count(self):
+        worker_a = self._make()
+        worker_b = self._make()
+        worker_a.record_failure()
+        worker_a.record_failure()
+        worker_b.record_success()
+        worker_a.record_failure()
+        assert worker_a.state == CircuitBreaker.CLOSED
+
+    def test_trips_on_failure_rate(self):
+        cb = self._make(failure_threshold=100, min_requests=4, failure_rate_threshold=0.5)
+        cb.record_success()
+        cb.record_failure()
+        cb.record_success()
+        assert cb.state == CircuitBreaker.CLOSED
+        cb.record_failure()
+        assert cb.state == CircuitBreaker.OPEN
+
+    def test_single_probe_across_fleet_in_half_open(self):
+        worker_a = self._make(failure_threshold=1, recovery_timeout=0.1)
+        worker_b = self._make(failure_threshold=1, recovery_timeout=0.1)
+        worker_a.record_failure()
+        time.sleep(0.15)
+
+        assert worker_a.state == CircuitBreaker.HALF_OPEN
+        assert worker_a.allow_request() is True
+        assert worker_b.allow_request() is False
+
+        worker_a.record_success()
+        assert worker_b.state == CircuitBreaker.CLOSED
+        assert worker_b.allow_request() is True
+
+    def test_late_success_keeps_breaker_open_for_probe(self):
+        worker_a = self._make(failure_threshold=1, recovery_timeout=0.1)
+        worker_b = self._make(failure_threshold=1, recovery_timeout=0.1)
+        worker_a.record_failure()
+
+        # A request worker_b sent before the trip succeeds afterwards
+        worker_b.record_success()
+        assert worker_b.state == CircuitBreaker.OPEN
+        time.sleep(0.15)
+        assert worker_a.state == CircuitBreaker.HALF_OPEN
+        assert worker_a.allow_request() is True
+        assert worker_b.allow_request() is False
+
+    def test_closing_from_half_open_clears_window(self):
+        cb = self._make(failure_threshold=100, recovery_timeout=0.1, min_requests=4)
+        for _ in range(4):
+            cb.record_failure()
+        assert cb.state == CircuitBreaker.OPEN
+        time.sleep(0.15)
+        assert cb.allow_request() is True
+        cb.record_success()
+        assert cb.state == CircuitBreaker.CLOSED
+
+        # Without the pre-trip failures one more failure stays under the rate
+        cb.record_failure()
+        cb.record_success()
+        cb.record_success()
+        cb.record_failure()
+        assert cb.state == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens(self):
+        cb = self._make(failure_threshold=5, recovery_timeout=0.1)
+        for _ in range(5):
+            cb.record_failure()
+        time.sleep(0.15)
+        assert cb.allow_request() is True
+        cb.record_failure()
+        assert cb.state == CircuitBreaker.OPEN
+
+    def test_falls_back_to_local_state_when_cache_down(self):
+        cb = self._make(failure_threshold=2)
+        with patch('apps.adapters.base.cache') as mock_cache:
+            mock_cache.get_many.side_effect = ConnectionError("Redis down")
+            mock_cache.add.side_effect = ConnectionError("Redis down")
+            assert cb.allow_request() is True
+            cb.record_failure()
+            cb.record_failure()
+            assert cb.state == CircuitBreaker.OPEN
+            assert cb.allow_request() is False
+
+    def test_adapter_uses_shared_breaker_when_enabled(self):
+        from django.test import override_settings
+        from apps.adapters.airnow import AirNowAdapter
+        from apps.adapters.base import SharedCircuitBreaker
+
+        with override_settings(CIRCUIT_BREAKER_SETTINGS={'SHARED': True}), \
+                patch.object(AirNowAdapter, '_get_api_key', return_value='test-key'):
+            adapter = AirNowAdapter()
+
+        assert isinstance(adapter.circuit_breaker, SharedCircuitBreaker)
+        assert adapter.circuit_breaker.name == 'EPA_AIRNOW'
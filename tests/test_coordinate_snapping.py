@@ -0,0 +1,50 @@
+"""
+Tests for snapping upstream query coordinates to model grids.
+"""
+from unittest.mock import patch
+
+from django.test import override_settings
+
+from apps.adapters.airnow import AirNowAdapter
+from apps.adapters.open_meteo import OpenMeteoWeatherAdapter
+from apps.adapters.open_meteo_air_quality import OpenMeteoAirQualityAdapter
+
+
+class TestSnapCoordinates:
+
+    def test_snaps_to_grid(self):
+        adapter = OpenMeteoAirQualityAdapter()
+        assert adapter._snap_coordinates(34.0522, -118.2437) == (34.1, -118.2)
+
+    def test_nearby_points_share_a_cell(self):
+        adapter = OpenMeteoWeatherAdapter()
+        assert adapter._snap_coordinates(34.0522, -118.2437) == adapter._snap_coordinates(34.0531, -118.2455)
+
+    def test_station_sources_not_snapped(self):
+        with patch.object(AirNowAdapter, '_get_api_key', return_value='k'):
+            adapter = AirNowAdapter()
+        assert adapter._snap_coordinates(34.0522, -118.2437) == (34.0522, -118.2437)
+
+    @override_settings(CACHE_SETTINGS={'SNAP_TO_MODEL_GRID': False})
+    def test_can_be_disabled(self):
+        adapter = OpenMeteoAirQualityAdapter()
+        assert adapter._snap_coordinates(34.0522, -118.2437) == (34.0522, -118.2437)
+
+
+class TestSnappedRequests:
+
+    def test_upstream_called_with_snapped_point(self):
+        adapter = OpenMeteoAirQualityAdapter()
+        with patch.object(adapter, '_make_request', return_value=None) as mock_request:
+            adapter.fetch_current(34.0522, -118.2437)
+
+        params = mock_request.call_args[1]['params']
+        assert (params['latitude'], params['longitude']) == (34.1, -118.2)
+
+    def test_normalize_uses_true_point(self):
+        adapter = OpenMeteoWeatherAdapter()
+        with patch.object(adapter, '_make_request', return_value={'current': {}}), \
+                patch.object(adapter, '_normalize', return_value={}) as mock_normalize:
+            adapter.fetch_current(34.0522, -118.2437)
+
+        assert mock_normalize.call_args[0][1:] == (34.0522, -118.2437)
@@ -0,0 +1,208 @@
+"""
+Tests for blending source forecasts onto a common hourly axis.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest.mock import patch
+
+import pytest
+
+from apps.forecast.blending import ForecastBlender, interpolate_gaps, parse_forecasts
+from apps.forecast.services import ForecastAggregator
+
+
+NOW = datetime(2025, 6, 1, 10, 25, tzinfo=dt_timezone.utc)
+ORIGIN = NOW.replace(minute=0)
+
+FORECAST_SETTINGS = {
+    'HOURLY_HOURS': 48,
+    'DAILY_DAYS': 3,
+    'MAX_INTERPOLATION_GAP_HOURS': 2,
+    'INTERPOLATED_WEIGHT': 0.5,
+    'DEFAULT_HALF_LIFE_HOURS': 48,
+    'LEAD_TIME_HALF_LIFE_HOURS': {'FAST_DECAY': 1},
+}
+
+
+@pytest.fixture(autouse=True)
+def forecast_settings(settings):
+    settings.FORECAST_SETTINGS = FORECAST_SETTINGS
+    settings.CACHE_SETTINGS = {'WRITE_THROUGH_TO_DB': False}
+    settings.TIME_ZONE = 'UTC'
+
+
+def _hourly(source, values, start=ORIGIN, **extra):
+    return [
+        {'timestamp': (start + timedelta(hours=i)).isoformat(), 'aqi': v, 'source': source, **extra}
+        for i, v in enumerate(values)
+    ]
+
+
+def _blend(forecasts):
+    return ForecastBlender().blend(parse_forecasts(forecasts, NOW), now=NOW)
+
+
+class TestInterpolateGaps:
+
+    def test_fills_short_interior_gaps(self):
+        values = [10, None, 30, None, None, None, 70]
+        filled = interpolate_gaps(values, max_gap=2)
+        assert values == [10, 20, 30, None, None, None, 70]
+        assert filled == [False, True, False, False, False, False, False]
+
+    def test_never_extrapolates(self):
+        values = [None, 5, None]
+        interpolate_gaps(values, max_gap=5)
+        assert values == [None, 5, None]
+
+
+class TestForecastBlender:
+
+    def test_past_hours_dropped_and_axis_starts_now(self):
+        result = _blend(_hourly('OPENWEATHERMAP', [50, 60, 70], start=ORIGIN - timedelta(hours=1)))
+        assert [h['aqi'] for h in result['hourly']] == [60, 70]
+        assert result['hourly'][0]['timestamp'] == ORIGIN.isoformat()
+
+    def test_trust_weighted(self, settings):
+        settings.AIR_QUALITY_SETTINGS = {'SOURCE_WEIGHTS': {'HIGH': 1.0, 'LOW': 0.25}}
+        result = _blend(_hourly('HIGH', [100]) + _hourly('LOW', [50]))
+        # (100 * 1.0 + 50 * 0.25) / 1.25
+        assert result['hourly'][0]['aqi'] == 90
+        assert result['hourly'][0]['sources'] == ['HIGH', 'LOW']
+
+    def test_lead_time_decay(self, settings):
+        settings.AIR_QUALITY_SETTINGS = {'SOURCE_WEIGHTS': {'FAST_DECAY': 1.0, 'STEADY': 1.0}}
+        result = _blend(_hourly('FAST_DECAY', [100] * 12) + _hourly('STEADY', [0] * 12))
+        hourly = result['hourly']
+        assert hourly[0]['aqi'] == 50
+        # FAST_DECAY halves every hour, so STEADY dominates later hours
+        assert hourly[11]['aqi'] < 5
+
+    def test_daily_source_spread_over_its_day(self):
+        midnight = ORIGIN.replace(hour=0) + timedelta(days=1)
+        forecasts = [
+            {'timestamp': midnight.isoformat(), 'aqi': 80, 'source': 'EPA_AIRNOW', 'period_hours': 24},
+            {'timestamp': midnight.isoformat(), 'aqi': 40, 'source': 'EPA_AIRNOW', 'period_hours': 24},
+        ]
+        result = _blend(forecasts)
+        assert len(result['hourly']) == 24
+        # One record per pollutant: the highest AQI represents the hour
+        assert {h['aqi'] for h in result['hourly']} == {80}
+
+    def test_gaps_interpolated_and_pollutants_blended(self):
+        forecasts = _hourly('OPENWEATHERMAP', [40, None, 60], pollutants={'pm25': 10.0})
+        result = _blend(forecasts)
+        assert [h['aqi'] for h in result['hourly']] == [40, 50, 60]
+        assert result['hourly'][1]['pollutants'] == {'pm25': 10.0}
+
+    def test_negative_aqi_ignored(self):
+        assert _blend(_hourly('EPA_AIRNOW', [-1]))['hourly'] == []
+
+    def test_daily_summary(self):
+        result = _blend(_hourly('OPENWEATHERMAP', [20] * 10 + [120] * 4))
+
+        assert result['daily'] == [{
+            'date': '2025-06-01', 'aqi': 120, 'aqi_avg': 49,
+            'category': 'Unhealthy for Sensitive Groups', 'hours': 14,
+            'sources': ['OPENWEATHERMAP'],
+        }]
+
+
+class TestForecastAggregator:
+
+    @pytest.mark.django_db
+    def test_aggregate_stores_and_blends(self):
+        from apps.forecast.models import ForecastData
+
+        aggregator = ForecastAggregator()
+        forecasts = _hourly('OPENWEATHERMAP', [30, 40], start=ORIGIN + timedelta(hours=1))
+        with patch('apps.forecast.services.timezone.now', return_value=NOW), \
+                patch('apps.forecast.blending.timezone.now', return_value=NOW):
+            result = aggregator.aggregate_forecasts(34.05, -118.24, forecasts, use_cache=False)
+
+        assert [h['aqi'] for h in result['hourly']] == [30, 40]
+        assert ForecastData.objects.count() == 2
+
+    def test_empty(self):
+        assert ForecastAggregator().aggregate_forecasts(1.0, 2.0, []) == {'hourly': [], 'daily': []}
+
+
+class TestOpenMeteoForecast:
+
+    def test_fetch_forecast_shape(self):
+        from apps.adapters.open_meteo_air_quality import OpenMeteoAirQualityAdapter
+
+        adapter = OpenMeteoAirQualityAdapter()
+        raw = {'hourly': {
+            'time': ['2025-06-01T10:00', '2025-06-01T11:00'],
+            'us_aqi': [42, 45],
+            'pm2_5': [8.1, None],
+            'ozone': [60.0, 62.0],
+        }}
+        with patch.object(adapter, '_make_request', return_value=raw) as mock_request:
+            forecasts = adapter.fetch_forecast(34.05, -118.24)
+
+        assert mock_request.call_args[1]['params']['timezone'] == 'GMT'
+        assert forecasts[0]['timestamp'] == '2025-06-01T10:00:00+00:00'
+        assert forecasts[0]['aqi'] == 42
+        assert forecasts[0]['pollutants']['pm25'] == 8.1
+        assert forecasts[1]['pollutants']['pm25'] is None
+        assert forecasts[1]['pollutants']['co'] is None
+        assert {f['source'] for f in forecasts} == {'OPEN_METEO_AQ'}
+
+
+def _forecast_adapter(code, values):
+    from unittest.mock import MagicMock
+
+    adapter = MagicMock()
+    adapter.SOURCE_CODE = code
+    adapter.SOURCE_NAME = code
+    adapter.is_available.return_value = True
+    adapter.fetch_forecast.return_value = _hourly(code, values, start=ORIGIN + timedelta(hours=1))
+    return adapter
+
+
+class TestPerSourceForecastCache:
+
+    @pytest.fixture
+    def orchestrator(self, locmem_cache):
+        from apps.api.orchestrator import AirQualityOrchestrator
+
+        orchestrator = AirQualityOrchestrator()
+        orchestrator.adapters = {
+            'EPA_AIRNOW': _forecast_adapter('EPA_AIRNOW', [40]),
+            'OPENWEATHERMAP': _forecast_adapter('OPENWEATHERMAP', [60]),
+        }
+        orchestrator.om_aq_adapter = _forecast_adapter('OPEN_METEO_AQ', [50])
+        return orchestrator
+
+    def test_cached_sources_not_refetched(self, orchestrator):
+        forecasts, fresh = orchestrator._fetch_all_forecasts(34.05, -118.24, {})
+        assert fresh == {'EPA_AIRNOW', 'OPENWEATHERMAP', 'OPEN_METEO_AQ'}
+
+        forecasts_again, fresh_again = orchestrator._fetch_all_forecasts(34.05, -118.24, {})
+        assert fresh_again == set()
+        assert sorted(f['source'] for f in forecasts_again) == sorted(f['source'] for f in forecasts)
+        assert orchestrator.om_aq_adapter.fetch_forecast.call_count == 1
+
+    def test_only_source_with_new_run_refetched(self, orchestrator):
+        aggregator = orchestrator.forecast_aggregator
+        orchestrator._fetch_all_forecasts(34.05, -118.24, {})
+
+        real_window = aggregator._run_window
+        with patch.object(aggregator, '_run_window', side_effect=lambda source: (
+                (real_window(source)[0] + 1, 60) if source == 'OPENWEATHERMAP' else real_window(source))):
+            _, fresh = orchestrator._fetch_all_forecasts(34.05, -118.24, {})
+
+        assert fresh == {'OPENWEATHERMAP'}
+        assert orchestrator.adapters['EPA_AIRNOW'].fetch_forecast.call_count == 1
+
+    def test_failed_source_not_cached(self, orchestrator):
+        orchestrator.adapters['EPA_AIRNOW'].fetch_forecast.return_value = []
+        orchestrator._fetch_all_forecasts(34.05, -118.24, {})
+        orchestrator._fetch_all_forecasts(34.05, -118.24, {})
+        assert orchestrator.adapters['EPA_AIRNOW'].fetch_forecast.call_count == 2
+
+    def test_no_cache_bypasses_source_cache(self, orchestrator):
+        orchestrator._fetch_all_forecasts(34.05, -118.24, {})
+        _, fresh = orchestrator._fetch_all_forecasts(34.05, -118.24, {}, use_cache=False)
+        assert fresh == {'EPA_AIRNOW', 'OPENWEATHERMAP', 'OPEN_METEO_AQ'}
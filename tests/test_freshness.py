@@ -0,0 +1,82 @@
+"""
+Tests for publish-schedule-aware cache expiry.
+"""
+from datetime import datetime, timezone as dt_timezone
+
+import pytest
+
+from apps.adapters.airnow import AirNowAdapter
+from apps.core.freshness import earliest_expiry, expires_in, next_update
+
+
+SCHEDULES = {
+    'GRACE_SECONDS': 300,
+    'MIN_TTL': 60,
+    'MAX_TTL': 7200,
+    'SOURCES': {
+        'HOURLY': {'INTERVAL': 3600, 'LAG': 5400},
+        'FAST': {'INTERVAL': 120, 'LAG': 0, 'GRACE': 30},
+    },
+}
+
+NOW = datetime(2026, 3, 23, 15, 40, tzinfo=dt_timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def schedules(settings):
+    settings.PUBLISH_SCHEDULES = SCHEDULES
+
+
+class TestPublishSchedule:
+
+    def test_expires_after_next_expected_update(self):
+        # The 14:00 average was posted ~15:30; the 15:00 one is due ~16:30
+        observed = datetime(2026, 3, 23, 14, 0, tzinfo=dt_timezone.utc)
+        assert next_update('HOURLY', observed, now=NOW) == datetime(
+            2026, 3, 23, 16, 30, tzinfo=dt_timezone.utc
+        ).timestamp()
+        assert expires_in('HOURLY', observed, now=NOW) == 55 * 60
+
+    def test_overdue_reading_rolls_to_next_slot(self):
+        observed = '2026-03-23T12:00:00+00:00'
+        assert expires_in('HOURLY', observed, now=NOW) == 55 * 60
+
+    def test_slots_without_timestamp(self):
+        # Slots at :30 past each hour (LAG 5400 modulo the interval)
+        assert expires_in('HOURLY', now=NOW) == 55 * 60
+
+    def test_clamped_and_defaults(self):
+        observed = datetime(2026, 3, 23, 15, 39, 50, tzinfo=dt_timezone.utc)
+        assert expires_in('FAST', observed, now=NOW) == 140
+        assert expires_in('FAST', '2026-03-23T15:38:01+00:00', now=NOW) == 60
+        assert expires_in('FAST', '2026-03-23T15:37:59+00:00', now=NOW) == 149
+        assert expires_in('UNKNOWN', observed, default=600, now=NOW) == 600
+
+    def test_blend_takes_earliest_input(self):
+        readings = [
+            ('HOURLY', datetime(2026, 3, 23, 14, 0, tzinfo=dt_timezone.utc)),
+            ('FAST', datetime(2026, 3, 23, 15, 39, 50, tzinfo=dt_timezone.utc)),
+            ('UNKNOWN', None),
+        ]
+        assert earliest_expiry(readings, default=600, now=NOW) == 140
+        assert earliest_expiry(readings[:1] + readings[2:], default=600, now=NOW) == 600
+        assert earliest_expiry([], default=600, now=NOW) == 600
+
+
+class TestAirNowObservationTime:
+
+    def test_uses_observed_hour_in_local_time(self):
+        raw = [{
+            'DateObserved': '2026-03-23 ',
+            'HourObserved': 14,
+            'LocalTimeZone': 'PST',
+            'ReportingArea': 'Los Angeles',
+            'StateCode': 'CA',
+            'Latitude': 34.066,
+            'Longitude': -118.227,
+            'ParameterName': 'PM2.5',
+            'AQI': 61,
+            'Value': 17.2,
+        }]
+        observation = AirNowAdapter().normalize_data(raw, 34.05, -118.24)[0]
+        assert observation.timestamp == datetime(2026, 3, 23, 22, 0, tzinfo=dt_timezone.utc)
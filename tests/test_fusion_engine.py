@@ -176,3 +176,42 @@ class TestCalculateWeight:
         w_close = engine._calculate_weight(sd_close, 'DEFAULT', 34.05, -118.24)
         w_far = engine._calculate_weight(sd_far, 'DEFAULT', 34.05, -118.24)
         assert w_close > w_far
+
+
+class TestAdaptiveTTL:
+    """Tests for volatility-adaptive TTLs of blended results"""
+
+    @pytest.fixture(autouse=True)
+    def ttl_settings(self, settings):
+        settings.ADAPTIVE_TTL_SETTINGS = {
+            'ENABLED': True, 'STABLE_STDEV': 5, 'VOLATILE_STDEV': 25,
+            'STABLE_MULTIPLIER': 2.0, 'VOLATILE_MULTIPLIER': 0.25,
+            'MIN_TTL': 60, 'MAX_TTL': 7200,
+        }
+
+    def test_stable_cell_kept_longer(self):
+        from apps.fusion.volatility import adaptive_ttl
+        assert adaptive_ttl(1800, [42, 43, 42, 41]) == 3600
+
+    def test_volatile_cell_refreshed_sooner(self):
+        from apps.fusion.volatility import adaptive_ttl
+        assert adaptive_ttl(1800, [60, 150, 90, 210]) == 450
+
+    def test_interpolated_and_bounded(self):
+        from apps.fusion.volatility import adaptive_ttl
+        assert 450 < adaptive_ttl(1800, [40, 60, 40, 60]) < 3600
+        assert adaptive_ttl(5000, [42, 42, 42]) == 7200
+        assert adaptive_ttl(100, [0, 300, 0]) == 60
+
+    def test_too_few_readings_keep_base_ttl(self):
+        from apps.fusion.volatility import adaptive_ttl
+        assert adaptive_ttl(1800, [42, 250]) == 1800
+
+    def test_history_is_per_cell(self, locmem_cache):
+        from apps.fusion.volatility import AQIHistory
+
+        history = AQIHistory(size=3)
+        for aqi in (40, 50, 60, 70):
+            readings = history.record(34.05, -118.24, aqi)
+        assert readings == [50, 60, 70]
+        assert history.record(40.71, -74.01, None) == []
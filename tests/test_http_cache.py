@@ -0,0 +1,136 @@
+"""
+Tests for the upstream HTTP cache and its use in BaseAdapter._make_request.
+"""
+import time
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from apps.adapters.http_cache import HTTPCache, freshness_lifetime
+
+
+@pytest.fixture(autouse=True)
+def http_cache_settings(locmem_cache, settings):
+    settings.HTTP_CACHE_SETTINGS = {'ENABLED': True}
+
+
+def _response(status_code=200, headers=None, payload=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = payload
+    response.raise_for_status = MagicMock()
+    return response
+
+
+class TestFreshnessLifetime:
+
+    def test_max_age(self):
+        assert freshness_lifetime(_response(headers={'Cache-Control': 'public, max-age=600'})) == 600
+
+    def test_s_maxage_preferred(self):
+        assert freshness_lifetime(_response(headers={'Cache-Control': 'max-age=60, s-maxage=300'})) == 300
+
+    def test_age_subtracted(self):
+        assert freshness_lifetime(_response(headers={'Cache-Control': 'max-age=600', 'Age': '100'})) == 500
+
+    def test_no_store(self):
+        assert freshness_lifetime(_response(headers={'Cache-Control': 'no-store'})) is None
+
+    def test_no_cache(self):
+        assert freshness_lifetime(_response(headers={'Cache-Control': 'no-cache'})) == 0
+
+    def test_expires(self):
+        from email.utils import formatdate
+        lifetime = freshness_lifetime(_response(headers={'Expires': formatdate(time.time() + 120, usegmt=True)}))
+        assert 115 <= lifetime <= 120
+
+    def test_no_headers(self):
+        assert freshness_lifetime(_response()) == 0
+
+
+class TestHTTPCache:
+
+    def test_key_ignores_param_order(self):
+        http_cache = HTTPCache('SRC')
+        url = 'https://x/y'
+        assert http_cache.make_key('GET', url, {'a': 1, 'b': 2}) == http_cache.make_key('GET', url, {'b': 2, 'a': 1})
+        assert http_cache.make_key('GET', url, {'a': 1}) != http_cache.make_key('GET', url, {'a': 2})
+
+    def test_min_freshness_applies_without_headers(self):
+        http_cache = HTTPCache('SRC', min_freshness=900)
+        assert http_cache.store('k', _response(), {'v': 1})
+        entry = http_cache.get('k')
+        assert entry.is_fresh
+        assert entry.data == {'v': 1}
+
+    def test_uncacheable_without_freshness_or_validator(self):
+        assert HTTPCache('SRC').store('k', _response(), {'v': 1}) is False
+
+    def test_min_freshness_does_not_override_no_cache(self):
+        http_cache = HTTPCache('SRC', min_freshness=900)
+        http_cache.store('k', _response(headers={'Cache-Control': 'no-cache', 'ETag': '"a"'}), {'v': 1})
+        entry = http_cache.get('k')
+        assert not entry.is_fresh
+        assert entry.conditional_headers() == {'If-None-Match': '"a"'}
+
+    def test_no_store_never_stored(self):
+        http_cache = HTTPCache('SRC', min_freshness=900)
+        assert http_cache.store('k', _response(headers={'Cache-Control': 'no-store'}), {}) is False
+
+
+class TestAdapterHTTPCache:
+
+    @pytest.fixture
+    def adapter(self, make_adapter):
+        return make_adapter('HTTP_CACHE_TEST', api_key='secret', HTTP_CACHE_MIN_FRESHNESS=0)
+
+    def test_fresh_hit_skips_upstream(self, adapter):
+        response = _response(headers={'Cache-Control': 'max-age=600'}, payload={'v': 1})
+
+        with patch.object(adapter.session, 'request', return_value=response) as mock_request:
+            assert adapter._make_request('data', params={'lat': 1}) == {'v': 1}
+            assert adapter.last_request_upstream is True
+            assert adapter._make_request('data', params={'lat': 1}) == {'v': 1}
+            assert adapter.last_request_upstream is False
+
+        assert mock_request.call_count == 1
+
+    def test_fresh_hit_bypasses_open_breaker(self, adapter):
+        response = _response(headers={'Cache-Control': 'max-age=600'}, payload={'v': 1})
+
+        with patch.object(adapter.session, 'request', return_value=response):
+            adapter._make_request('data')
+        adapter.circuit_breaker.allow_request = MagicMock(return_value=False)
+
+        assert adapter._make_request('data') == {'v': 1}
+
+    def test_conditional_request_and_304(self, adapter):
+        first = _response(headers={'ETag': '"v1"'}, payload={'v': 1})
+        not_modified = _response(status_code=304, headers={'Cache-Control': 'max-age=60'})
+
+        with patch.object(adapter.session, 'request', side_effect=[first, not_modified]) as mock_request:
+            assert adapter._make_request('data') == {'v': 1}
+            assert adapter._make_request('data') == {'v': 1}
+
+        assert mock_request.call_args[1]['headers']['If-None-Match'] == '"v1"'
+        # The 304 refreshed freshness, so the next call is a local hit
+        assert adapter._make_request('data') == {'v': 1}
+
+
+class TestOpenMeteoConditionsFreshness:
+
+    def test_current_only_fresh_until_next_update(self):
+        from datetime import datetime, timezone as dt_timezone
+        from apps.adapters.open_meteo import OpenMeteoWeatherAdapter
+
+        adapter = OpenMeteoWeatherAdapter()
+        now = datetime(2026, 3, 23, 12, 10, tzinfo=dt_timezone.utc)
+        with patch('django.utils.timezone.now', return_value=now):
+            assert adapter._http_cache_min_freshness({'current': 'temperature_2m'}) == 300
+            assert adapter._http_cache_min_freshness({'current': 'x', 'hourly': 'y'}) == 900
+
+    def test_store_with_request_floor(self):
+        http_cache = HTTPCache('TEST', min_freshness=900)
+        assert http_cache.store('k', _response(), {'v': 1}, min_freshness=300)
+        assert http_cache.get('k').expires_at <= time.time() + 300
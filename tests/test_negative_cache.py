@@ -0,0 +1,97 @@
+"""
+Tests for per-adapter negative caching of cells without data.
+"""
+from unittest.mock import patch, MagicMock
+
+import pytest
+import requests
+
+from apps.core import metrics
+
+
+pytestmark = pytest.mark.usefixtures('locmem_cache')
+
+
+def _fetch_stations(adapter, lat, lon):
+    return adapter._make_request('stations', params={'lat': lat, 'lon': lon}) or []
+
+
+def _response(status_code, payload=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {}
+    response.json.return_value = payload
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            f"{status_code} error", response=response
+        )
+    else:
+        response.raise_for_status = MagicMock()
+    return response
+
+
+class TestAdapterNegativeCache:
+
+    @pytest.fixture
+    def adapter(self, make_adapter):
+        return make_adapter('NEGATIVE_TEST', fetch_current=_fetch_stations)
+
+    def test_empty_answer_is_remembered_per_cell(self, adapter):
+        with patch.object(adapter.session, 'request', return_value=_response(200, [])):
+            assert adapter.fetch_current(34.05, -118.24) == []
+
+        assert adapter.record_no_data(34.05, -118.24, 25) is True
+        assert adapter.has_no_data(34.05, -118.24, 25) is True
+        assert adapter.has_no_data(34.05, -118.24, 50) is False
+        assert adapter.has_no_data(40.71, -74.01, 25) is False
+        assert metrics.get_counters('NEGATIVE_TEST')['negative_cache_hits'] >= 1
+
+    def test_failed_request_is_not_remembered(self, adapter):
+        with patch.object(adapter.session, 'request', return_value=_response(404)):
+            assert adapter.fetch_current(34.05, -118.24) == []
+
+        assert adapter.record_no_data(34.05, -118.24) is False
+        assert adapter.has_no_data(34.05, -118.24) is False
+
+    def test_disabled_with_zero_ttl(self, make_adapter, settings):
+        settings.CACHE_SETTINGS = {**settings.CACHE_SETTINGS, 'NEGATIVE_CACHE_TTL': 0}
+        adapter = make_adapter('NEGATIVE_TEST', fetch_current=_fetch_stations)
+        adapter.last_request_ok = True
+
+        assert adapter.negative_cache is None
+        assert adapter.record_no_data(34.05, -118.24) is False
+        assert adapter.has_no_data(34.05, -118.24) is False
+
+
+class TestOrchestratorSkipsEmptySources:
+
+    @pytest.fixture
+    def orchestrator(self):
+        from apps.api.orchestrator import AirQualityOrchestrator
+
+        orch = AirQualityOrchestrator()
+        for code in orch.adapters:
+            adapter = MagicMock(SOURCE_CODE=code, SOURCE_NAME=code, quota=None)
+            adapter.is_available.return_value = True
+            adapter.has_no_data.return_value = False
+            adapter.fetch_current.return_value = []
+            orch.adapters[code] = adapter
+        return orch
+
+    def test_source_without_data_is_not_called(self, orchestrator):
+        orchestrator.adapters['WAQI'].has_no_data.return_value = True
+
+        orchestrator._fetch_all_current(34.05, -118.24, 25, {'source_priority': ['EPA_AIRNOW', 'WAQI']})
+
+        orchestrator.adapters['WAQI'].fetch_current.assert_not_called()
+        orchestrator.adapters['EPA_AIRNOW'].fetch_current.assert_called_once()
+
+    def test_empty_result_is_recorded(self, orchestrator):
+        airnow = orchestrator.adapters['EPA_AIRNOW']
+        orchestrator._safe_fetch_current(airnow, 34.05, -118.24, 25)
+        airnow.record_no_data.assert_called_once_with(34.05, -118.24, 25)
+
+        airnow.reset_mock()
+        airnow.fetch_current.return_value = [MagicMock()]
+        orchestrator._safe_fetch_current(airnow, 34.05, -118.24, 25)
+        airnow.record_no_data.assert_not_called()
@@ -0,0 +1,49 @@
+"""
+Tests for the in-flight Observation record.
+"""
+from django.utils import timezone
+
+import pytest
+
+from apps.adapters.models import SourceData
+from apps.adapters.observation import Observation
+
+
+def _observation(**kwargs):
+    values = dict(
+        source='EPA_AIRNOW', lat=34.05, lon=-118.24, timestamp=timezone.now(),
+        aqi=42, pollutants={'pm25': 10.1}, quality_level='verified',
+        distance_km=3.2, confidence_score=100.0, station_name='Downtown',
+    )
+    values.update(kwargs)
+    return Observation(**values)
+
+
+class TestObservation:
+
+    def test_slotted(self):
+        observation = _observation()
+        assert not hasattr(observation, '__dict__')
+        with pytest.raises(AttributeError):
+            observation.unknown = 1
+
+    def test_defaults(self):
+        observation = Observation(source='X', lat=1.0, lon=2.0, timestamp=timezone.now(), aqi=None)
+        assert observation.pollutants == {}
+        assert observation.station_id == ''
+        assert observation.distance_km is None
+
+    def test_to_model(self):
+        observation = _observation(station_id='060371103')
+        model = observation.to_model()
+
+        assert isinstance(model, SourceData)
+        assert model.pk is None
+        for name in ('source', 'lat', 'lon', 'timestamp', 'aqi', 'pollutants', 'quality_level',
+                     'distance_km', 'confidence_score', 'station_id', 'station_name'):
+            assert getattr(model, name) == getattr(observation, name)
+
+    @pytest.mark.django_db
+    def test_to_model_persists(self):
+        _observation().to_model().save()
+        assert SourceData.objects.get().station_name == 'Downtown'
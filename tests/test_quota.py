@@ -0,0 +1,164 @@
+"""
+Tests for shared upstream quotas and quota-aware orchestration.
+"""
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from apps.adapters.quota import QuotaBucket, get_quota
+
+
+QUOTAS = {
+    'ENABLED': True,
+    'LOW_WATERMARK': 0.2,
+    'LOW_TRUST_THRESHOLD': 0.75,
+    'LIMITS': {
+        'QUOTA_TEST': {'PER_MINUTE': 2},
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def quota_settings(locmem_cache, settings):
+    settings.QUOTA_SETTINGS = QUOTAS
+
+
+class TestQuotaBucket:
+
+    def test_acquire_until_limit(self):
+        bucket = QuotaBucket('SRC', per_minute=3)
+        assert all(bucket.try_acquire() for _ in range(3))
+        assert bucket.try_acquire() is False
+
+    def test_denied_call_consumes_nothing(self):
+        bucket = QuotaBucket('SRC', per_minute=10, per_day=3)
+        assert bucket.try_acquire(cost=2)
+        assert bucket.try_acquire(cost=2) is False
+        assert bucket.status()['minute']['used'] == 2
+        assert bucket.status()['day']['used'] == 2
+
+    def test_cost_per_call(self):
+        bucket = QuotaBucket('SRC', per_day=100, cost_per_call=40)
+        assert bucket.try_acquire()
+        assert bucket.try_acquire()
+        assert bucket.try_acquire() is False
+
+    def test_shared_across_instances(self):
+        QuotaBucket('SRC', per_minute=1).try_acquire()
+        assert QuotaBucket('SRC', per_minute=1).try_acquire() is False
+
+    def test_remaining_fraction_and_low(self):
+        bucket = QuotaBucket('SRC', per_minute=10)
+        assert bucket.remaining_fraction() == 1.0
+        bucket.try_acquire(cost=9)
+        assert bucket.remaining_fraction() == pytest.approx(0.1)
+        assert bucket.is_low()
+
+    def test_refund(self):
+        bucket = QuotaBucket('SRC', per_minute=1)
+        bucket.try_acquire()
+        bucket.refund()
+        assert bucket.try_acquire()
+
+    def test_fails_open_when_cache_down(self):
+        bucket = QuotaBucket('SRC', per_minute=1)
+        with patch('apps.adapters.quota.cache') as mock_cache:
+            mock_cache.incr.side_effect = ConnectionError("redis down")
+            assert bucket.try_acquire() is True
+
+    def test_unconfigured_source_has_no_quota(self):
+        assert get_quota('UNKNOWN') is None
+        assert get_quota('QUOTA_TEST') is not None
+
+
+class TestAdapterQuota:
+
+    @pytest.fixture
+    def adapter(self, make_adapter):
+        return make_adapter('QUOTA_TEST')
+
+    def test_exhausted_quota_skips_request_without_tripping_breaker(self, adapter):
+        response = MagicMock(status_code=200, headers={})
+        response.json.return_value = {'ok': True}
+
+        with patch.object(adapter.session, 'request', return_value=response) as mock_request:
+            assert adapter._make_request('a') == {'ok': True}
+            assert adapter._make_request('b') == {'ok': True}
+            assert adapter._make_request('c') is None
+
+        assert mock_request.call_count == 2
+        assert adapter.circuit_breaker._failure_count == 0
+        adapter._update_status.assert_called_with(success=True)
+
+    def test_open_breaker_refunds_quota(self, adapter):
+        adapter.circuit_breaker.allow_request = MagicMock(return_value=False)
+
+        assert adapter._make_request('a') is None
+        assert adapter.quota.status()['minute']['used'] == 0
+
+
+class TestQuotaAwareOrchestrator:
+
+    @pytest.fixture
+    def orchestrator(self):
+        from apps.api.orchestrator import AirQualityOrchestrator
+
+        orch = AirQualityOrchestrator()
+        orch.location_service = MagicMock()
+        orch.location_service.reverse_geocode.return_value = {'country': 'US'}
+        orch.location_service.get_region_config.return_value = {
+            'source_priority': ['EPA_AIRNOW', 'WAQI'], 'aqi_scale': 'EPA',
+        }
+        orch.fusion_engine = MagicMock()
+        orch.fusion_engine.get_cached.return_value = None
+        orch.fusion_engine.get_cached_wide.return_value = None
+        orch.fusion_engine.neighbor_hit = False
+        orch.fusion_engine.blend.return_value = {'current': {'aqi': None}}
+        for code in orch.adapters:
+            adapter = MagicMock(SOURCE_CODE=code, SOURCE_NAME=code, quota=None)
+            adapter.is_available.return_value = True
+            adapter.has_no_data.return_value = False
+            adapter.fetch_current.return_value = []
+            orch.adapters[code] = adapter
+        return orch
+
+    def test_cache_checked_before_fetching(self, orchestrator):
+        orchestrator.fusion_engine.get_cached.return_value = {'current': {'aqi': None}}
+        orchestrator._low_quota_sources = MagicMock()
+
+        orchestrator.get_air_quality(34.05, -118.24)
+
+        orchestrator.fusion_engine.get_cached.assert_called_once_with(34.05, -118.24)
+        # A hit spends no upstream calls, so quota is not consulted
+        orchestrator._low_quota_sources.assert_not_called()
+        orchestrator.fusion_engine.get_cached_wide.assert_not_called()
+        for adapter in orchestrator.adapters.values():
+            adapter.fetch_current.assert_not_called()
+        orchestrator.fusion_engine.blend.assert_not_called()
+
+    def test_low_quota_widens_cache_and_skips_low_trust(self, orchestrator):
+        waqi_quota = MagicMock()
+        waqi_quota.is_low.return_value = True
+        orchestrator.adapters['WAQI'].quota = waqi_quota
+
+        orchestrator.get_air_quality(34.05, -118.24)
+
+        orchestrator.fusion_engine.get_cached.assert_called_once_with(34.05, -118.24)
+        orchestrator.fusion_engine.get_cached_wide.assert_called_once_with(34.05, -118.24)
+        orchestrator.adapters['WAQI'].fetch_current.assert_not_called()
+        orchestrator.adapters['EPA_AIRNOW'].fetch_current.assert_called_once()
+
+    def test_low_quota_high_trust_source_still_fetched(self, orchestrator):
+        airnow_quota = MagicMock()
+        airnow_quota.is_low.return_value = True
+        orchestrator.adapters['EPA_AIRNOW'].quota = airnow_quota
+
+        orchestrator.get_air_quality(34.05, -118.24)
+
+        orchestrator.adapters['EPA_AIRNOW'].fetch_current.assert_called_once()
+
+    def test_miss_without_low_quota_skips_wide_cache(self, orchestrator):
+        orchestrator.get_air_quality(34.05, -118.24)
+
+        orchestrator.fusion_engine.get_cached_wide.assert_not_called()
+        orchestrator.fusion_engine.blend.assert_called_once()
@@ -0,0 +1,153 @@
+"""
+Tests for the fast response rendering path (projections, encoder, rendered cache).
+"""
+import json
+from datetime import datetime, timezone as dt_timezone
+from unittest.mock import patch
+
+import pytest
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.utils.encoders import JSONEncoder
+
+from apps.api.rendering import FastJSONRenderer, ProjectionError, encode, project, render_json
+from apps.api.serializers import AirQualityResponseSerializer
+from apps.jaspr.serializers import JasprCurrentSerializer
+
+
+def _aq_payload():
+    return {
+        'location': {'lat': 34.05, 'lon': -118.24, 'city': 'Los Angeles', 'region': '', 'country': 'US'},
+        'current': {
+            'aqi': 55,
+            'category': 'moderate',
+            'pollutants': {'pm25': 12.3, 'o3': None},
+            'sources': ['EPA_AIRNOW'],
+            'last_updated': datetime(2026, 3, 23, 14, 0, 5, 123456, tzinfo=dt_timezone.utc),
+        },
+        'forecast': [{
+            'timestamp': '2026-03-23T15:00:00+00:00',
+            'aqi': 50,
+            'category': 'good',
+            'pollutants': {'pm25': 5.0},
+            'sources': ['OPEN_METEO_AQ'],
+            'source_count': 1,
+        }],
+        'forecast_daily': [{
+            'date': '2026-03-23', 'aqi': 50, 'aqi_avg': 40, 'category': 'good',
+            'hours': 10, 'sources': ['OPEN_METEO_AQ'],
+        }],
+        'health_advice': 'Air quality is acceptable.',
+        'source_details': [{'source': 'EPA_AIRNOW', 'aqi': 55}],
+        'internal': 'not whitelisted',
+    }
+
+
+class TestProjection:
+
+    def test_matches_validated_serializer_output(self):
+        payload = _aq_payload()
+        serializer = AirQualityResponseSerializer(data=payload)
+        assert serializer.is_valid(), serializer.errors
+        expected = json.loads(json.dumps(serializer.data, cls=JSONEncoder))
+        assert json.loads(render_json(AirQualityResponseSerializer, payload)) == expected
+
+    def test_fills_defaults_and_drops_undeclared_fields(self):
+        current = {
+            'temperature': 20, 'feels_like': None, 'dew_point': 10.0, 'humidity': 50.0,
+            'pressure': 1013.25, 'visibility': None, 'cloud_cover': 0, 'uv_index': 5.0,
+            'wind_speed': 1.0, 'wind_direction': 90, 'wind_gusts': None,
+            'sunrise': None, 'sunset': None, 'aqi': 42, 'dominant_pollutant': None,
+            'unexpected': True,
+        }
+        result = project(JasprCurrentSerializer, current, {'units': 'imperial'})
+        assert result['temperature'] == 68.0
+        assert result['humidity'] == 50 and type(result['humidity']) is int
+        assert result['weather_description'] == ''
+        assert 'unexpected' not in result
+        assert 'pollutants' not in result
+
+    def test_missing_required_field(self):
+        payload = _aq_payload()
+        del payload['current']
+        with pytest.raises(ProjectionError):
+            project(AirQualityResponseSerializer, payload)
+        assert render_json(AirQualityResponseSerializer, payload) is None
+
+
+class TestFastJSONRenderer:
+
+    def test_encodes_like_drf(self):
+        data = {'when': datetime(2026, 3, 23, 14, 0, tzinfo=dt_timezone.utc), 'name': 'Zürich', 1: None}
+        expected = json.dumps(
+            data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')
+        ).encode('utf-8')
+        assert encode(data) == expected
+
+    def test_passes_encoded_bodies_through(self):
+        assert FastJSONRenderer().render(b'{"aqi":1}') == b'{"aqi":1}'
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('locmem_cache')
+class TestRenderedCache:
+
+    def _get(self, api_key, headers=None, **params):
+        from apps.api.views import AirQualityView
+
+        request = APIRequestFactory().get(
+            '/api/v1/air-quality/', {'lat': '34.05', 'lon': '-118.24', **params}, **(headers or {})
+        )
+        if api_key is not None:
+            force_authenticate(request, user=None, token=api_key)
+        response = AirQualityView.as_view()(request)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    def test_repeat_request_served_from_encoded_body(self, api_key):
+        with patch('apps.api.views.AirQualityOrchestrator') as MockOrch:
+            MockOrch.return_value.get_air_quality.return_value = _aq_payload()
+            first = self._get(api_key)
+            second = self._get(api_key)
+            third = self._get(api_key, no_cache='true')
+
+        assert first.status_code == second.status_code == 200
+        assert second.content == first.content
+        assert second['ETag'] == first['ETag']
+        assert json.loads(first.content)['current']['aqi'] == 55
+        # The second request never reached the orchestrator; no_cache did
+        assert MockOrch.return_value.get_air_quality.call_count == 2
+        assert third.content == first.content
+
+    def test_if_none_match_returns_304(self, api_key):
+        with patch('apps.api.views.AirQualityOrchestrator') as MockOrch:
+            MockOrch.return_value.get_air_quality.return_value = _aq_payload()
+            etag = self._get(api_key)['ETag']
+            cached = self._get(api_key, headers={'HTTP_IF_NONE_MATCH': f'W/{etag}'})
+            changed = self._get(api_key, headers={'HTTP_IF_NONE_MATCH': '"stale"'})
+
+        assert cached.status_code == 304
+        assert cached['ETag'] == etag
+        assert cached.content == b''
+        assert changed.status_code == 200
+
+    def test_cached_body_still_requires_api_key(self, api_key):
+        with patch('apps.api.views.AirQualityOrchestrator') as MockOrch:
+            MockOrch.return_value.get_air_quality.return_value = _aq_payload()
+            self._get(api_key)
+            anonymous = self._get(None)
+
+        assert anonymous.status_code in (401, 403)
+
+    def test_result_without_aqi_is_not_cached(self, api_key):
+        payload = _aq_payload()
+        payload['current']['aqi'] = None
+        with patch('apps.api.views.AirQualityOrchestrator') as MockOrch:
+            MockOrch.return_value.get_air_quality.return_value = payload
+            first = self._get(api_key)
+            MockOrch.return_value.get_air_quality.return_value = _aq_payload()
+            second = self._get(api_key)
+
+        assert first.status_code == second.status_code == 200
+        assert json.loads(second.content)['current']['aqi'] == 55
+        assert MockOrch.return_value.get_air_quality.call_count == 2
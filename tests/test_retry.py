@@ -0,0 +1,176 @@
+"""
+Tests for the retry policy, retry budget and deadline-aware retry loop.
+"""
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest.mock import patch, MagicMock
+
+import pytest
+import requests
+
+from apps.adapters import retry
+from apps.adapters.retry import RetryBudget, RetryPolicy, get_retry_budget
+from apps.core import metrics
+
+
+def _response(status_code, headers=None, payload=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = payload or {}
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            f"{status_code} error", response=response
+        )
+    else:
+        response.raise_for_status = MagicMock()
+    return response
+
+
+class TestRetryBudget:
+
+    def test_starts_with_capacity(self):
+        budget = RetryBudget(ratio=0.1, min_per_second=0, capacity=2)
+        assert budget.try_spend() is True
+        assert budget.try_spend() is True
+        assert budget.try_spend() is False
+
+    def test_requests_earn_retries_at_ratio(self):
+        budget = RetryBudget(ratio=0.25, min_per_second=0, capacity=5)
+        budget._tokens = 0
+        for _ in range(3):
+            budget.record_request()
+        assert budget.try_spend() is False
+        budget.record_request()
+        assert budget.try_spend() is True
+
+    def test_balance_capped_at_capacity(self):
+        budget = RetryBudget(ratio=1.0, min_per_second=0, capacity=3)
+        for _ in range(10):
+            budget.record_request()
+        assert budget.available == pytest.approx(3)
+
+    def test_registry_shares_budget_per_source(self):
+        assert get_retry_budget('A') is get_retry_budget('A')
+        assert get_retry_budget('A') is not get_retry_budget('B')
+
+
+class TestRetryPolicy:
+
+    def test_retryable_statuses_and_errors(self):
+        policy = RetryPolicy()
+        assert policy.is_retryable(response=_response(503))
+        assert policy.is_retryable(response=_response(429))
+        assert not policy.is_retryable(response=_response(404))
+        assert policy.is_retryable(error=requests.exceptions.Timeout())
+        assert not policy.is_retryable(error=ValueError())
+
+    def test_backoff_is_jittered_and_capped(self):
+        policy = RetryPolicy(backoff_factor=2, max_backoff=5)
+        for attempt in range(6):
+            assert 0 <= policy.backoff(attempt) <= 5
+
+    def test_retry_after_seconds(self):
+        assert RetryPolicy.retry_after(_response(429, {'Retry-After': '7'})) == 7.0
+
+    def test_retry_after_http_date(self):
+        when = datetime.now(dt_timezone.utc) + timedelta(seconds=30)
+        delay = RetryPolicy.retry_after(_response(503, {'Retry-After': format_datetime(when, usegmt=True)}))
+        assert 25 <= delay <= 31
+
+    def test_retry_after_missing_or_garbage(self):
+        assert RetryPolicy.retry_after(_response(503)) is None
+        assert RetryPolicy.retry_after(_response(503, {'Retry-After': 'soon'})) is None
+
+
+class TestRetryLoop:
+
+    @pytest.fixture
+    def adapter(self, make_adapter):
+        return make_adapter('RETRY_TEST')
+
+    def test_retries_transient_error_then_succeeds(self, adapter):
+        responses = [_response(503), _response(200, payload={'ok': True})]
+
+        with patch.object(adapter.session, 'request', side_effect=responses) as mock_request:
+            result = adapter._make_request('endpoint')
+
+        assert result == {'ok': True}
+        assert mock_request.call_count == 2
+        adapter._update_status.assert_called_with(success=True)
+
+    def test_does_not_retry_client_errors(self, adapter):
+        with patch.object(adapter.session, 'request', return_value=_response(404)) as mock_request:
+            assert adapter._make_request('endpoint') is None
+
+        assert mock_request.call_count == 1
+
+    def test_honours_retry_after(self, adapter):
+        responses = [_response(429, {'Retry-After': '3'}), _response(200)]
+        sleeps = []
+
+        with patch.object(retry, '_sleep', sleeps.append), \
+                patch.object(adapter.session, 'request', side_effect=responses):
+            adapter._make_request('endpoint', deadline=10)
+
+        assert sleeps == [3.0]
+
+    def test_gives_up_when_retry_after_exceeds_deadline(self, adapter):
+        with patch.object(adapter.session, 'request',
+                          return_value=_response(503, {'Retry-After': '120'})) as mock_request:
+            assert adapter._make_request('endpoint', deadline=5) is None
+
+        assert mock_request.call_count == 1
+
+    def test_backoff_capped_by_remaining_deadline(self, adapter):
+        adapter.retry_policy = RetryPolicy(max_retries=1, backoff_factor=100, max_backoff=100)
+        sleeps = []
+
+        with patch.object(retry, '_sleep', sleeps.append), \
+                patch.object(adapter.session, 'request', side_effect=[_response(502), _response(200)]):
+            adapter._make_request('endpoint', deadline=3)
+
+        assert len(sleeps) == 1
+        assert sleeps[0] <= 2.0
+
+    def test_per_attempt_timeout_never_exceeds_deadline(self, adapter):
+        with patch.object(adapter.session, 'request', return_value=_response(200)) as mock_request:
+            adapter._make_request('endpoint', deadline=4)
+
+        assert mock_request.call_args[1]['timeout'] <= 4
+
+    def test_exhausted_budget_stops_retries(self, adapter):
+        adapter.retry_budget._tokens = 0
+        adapter.retry_budget.min_per_second = 0
+
+        with patch.object(adapter.session, 'request', return_value=_response(503)) as mock_request:
+            assert adapter._make_request('endpoint') is None
+
+        assert mock_request.call_count == 1
+
+    def test_connection_errors_retried_then_recorded_once(self, adapter):
+        with patch.object(adapter.session, 'request',
+                          side_effect=requests.exceptions.ConnectionError("down")) as mock_request:
+            assert adapter._make_request('endpoint') is None
+
+        assert mock_request.call_count == adapter.retry_policy.max_retries + 1
+        assert adapter.circuit_breaker._failure_count == 1
+
+    def test_retry_metrics_recorded(self, locmem_cache, adapter):
+        with patch.object(adapter.session, 'request', side_effect=[_response(503), _response(200)]):
+            adapter._make_request('endpoint')
+
+        counters = metrics.get_counters('RETRY_TEST')
+        assert counters['requests'] == 1
+        assert counters['retries'] == 1
+
+    def test_cancelled_adapter_stops_retrying(self, adapter):
+        def cancel_then_fail(**kwargs):
+            adapter.cancel()
+            return _response(503)
+
+        with patch.object(adapter.session, 'request', side_effect=cancel_then_fail) as mock_request:
+            assert adapter._make_request('endpoint') is None
+            assert adapter._make_request('endpoint') is None
+
+        assert mock_request.call_count == 1
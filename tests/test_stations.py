@@ -0,0 +1,88 @@
+"""
+Tests for the learned point → station mapping of nearest-station sources.
+"""
+from unittest.mock import patch
+
+import pytest
+
+from apps.adapters.stations import StationIndex, create_station_index
+from apps.adapters.waqi import WAQIAdapter
+
+
+pytestmark = pytest.mark.usefixtures('locmem_cache')
+
+
+def _feed(idx=1234, geo=(34.066, -118.227), aqi=61):
+    return {
+        'status': 'ok',
+        'data': {
+            'idx': idx,
+            'aqi': aqi,
+            'city': {'name': 'Los Angeles-North Main Street', 'geo': list(geo)},
+            'time': {'iso': '2026-03-23T14:00:00-07:00'},
+            'iaqi': {'pm25': {'v': 61}},
+        },
+    }
+
+
+class TestStationIndex:
+
+    def test_known_cell_and_nearby_unseen_cell(self):
+        index = StationIndex('SRC', data_ttl=60)
+        station = {'id': '1', 'lat': 34.046, 'lon': -118.2455}
+        assert index.remember(34.0522, -118.2437, station)
+
+        assert index.lookup(34.0522, -118.2437) == station
+        # Different fine cell, same ~5km area cell, station within a cell of it
+        assert index.lookup(34.045, -118.245) == station
+        # Another area altogether
+        assert index.lookup(40.71, -74.01) is None
+
+    def test_unseen_cell_resolves_farther_stations_upstream(self):
+        index = StationIndex('SRC', data_ttl=60)
+        index.remember(34.0522, -118.2437, {'id': '1', 'lat': 34.066, 'lon': -118.227})
+        # ~2.8km away: a closer station may exist, so it is not reused
+        assert index.lookup(34.045, -118.245) is None
+
+    def test_station_across_area_border(self):
+        index = StationIndex('SRC', data_ttl=60)
+        station = {'id': '1', 'lat': 34.0585, 'lon': -118.2437}
+        # Learned from a point in the area south of 34.0576
+        index.remember(34.0522, -118.2437, station)
+        assert index.lookup(34.0590, -118.2440) == station
+
+    def test_payload_shared_by_station_id(self):
+        index = StationIndex('SRC', data_ttl=60)
+        index.set_data('Los Angeles/CA', {'aqi': 50})
+        assert index.get_data('Los Angeles/CA') == {'aqi': 50}
+        assert StationIndex('OTHER', data_ttl=60).get_data('Los Angeles/CA') is None
+
+    def test_disabled(self, settings):
+        settings.STATION_SETTINGS = {'ENABLED': False}
+        assert create_station_index('WAQI', 3600) is None
+
+
+class TestWAQIStationMapping:
+
+    def test_nearby_cells_share_one_upstream_call(self):
+        adapter = WAQIAdapter()
+        with patch.object(adapter, '_make_request', return_value=_feed(geo=(34.046, -118.2455))) as mock_request:
+            first = adapter.fetch_current(34.0522, -118.2437)
+            second = WAQIAdapter().fetch_current(34.045, -118.245)
+
+        assert mock_request.call_count == 1
+        assert first[0].aqi == second[0].aqi == 61
+        # Distances are still computed from each query point
+        assert first[0].distance_km != second[0].distance_km
+
+    def test_expired_station_reading_fetched_by_id(self):
+        adapter = WAQIAdapter()
+        with patch.object(adapter, '_make_request', return_value=_feed()):
+            adapter.fetch_current(34.0522, -118.2437)
+        adapter.stations.set_data('1234', None)
+
+        with patch.object(adapter, '_make_request', return_value=_feed(aqi=70)) as mock_request:
+            result = adapter.fetch_current(34.0522, -118.2437)
+
+        mock_request.assert_called_once_with('feed/@1234/')
+        assert result[0].aqi == 70
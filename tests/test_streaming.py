@@ -0,0 +1,226 @@
+"""
+Tests for streamed parsing of large upstream payloads.
+"""
+import json
+import random
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from apps.adapters.purpleair import PurpleAirAdapter
+from apps.adapters.streaming import JSONArrayStream, NearestK
+from apps.adapters.waqi import WAQIAdapter
+
+
+FIELDS = ['sensor_index', 'name', 'latitude', 'longitude', 'pm2.5_atm',
+          'pm2.5_atm_a', 'pm2.5_atm_b', 'confidence', 'last_seen']
+
+
+def _sensors_payload(count=300, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        rows.append([
+            i, f"Sensor é {i}",
+            round(34.0 + rng.uniform(-0.2, 0.2), 5),
+            round(-118.2 + rng.uniform(-0.2, 0.2), 5),
+            round(rng.uniform(0, 80), 1),
+            round(rng.uniform(0, 80), 1),
+            None if i % 7 == 0 else round(rng.uniform(0, 80), 1),
+            rng.choice([None, 50, 90, 100]),
+            1700000000 + i,
+        ])
+    return {'api_version': 'V1', 'fields': FIELDS, 'data': rows}
+
+
+def _chunks(payload, size):
+    body = json.dumps(payload).encode()
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+class TestJSONArrayStream:
+
+    @pytest.mark.parametrize('size', [1, 7, 64, 100000])
+    def test_rows_and_meta_across_chunk_sizes(self, size):
+        payload = _sensors_payload(50)
+        stream = JSONArrayStream(_chunks(payload, size), 'data')
+
+        assert list(stream) == payload['data']
+        assert stream.meta == {'api_version': 'V1', 'fields': FIELDS}
+        assert stream.rows == 50
+
+    def test_numbers_split_at_every_offset(self):
+        body = '{"x":1.5,"data":[34.522,1e-3,-0.5,[1.25E+10,7],12],"y":-12,"z":2e5}'
+        expected = json.loads(body)
+        for split in range(1, len(body)):
+            stream = JSONArrayStream([body[:split].encode(), body[split:].encode()], 'data')
+            assert list(stream) == expected['data'], split
+            assert stream.meta == {'x': 1.5, 'y': -12, 'z': 2e5}, split
+
+    def test_meta_before_array_available_during_iteration(self):
+        stream = JSONArrayStream(_chunks(_sensors_payload(3), 5), 'data')
+        next(iter(stream))
+        assert stream.meta['fields'] == FIELDS
+
+    def test_missing_or_non_array_key(self):
+        stream = JSONArrayStream([b'{"status": "error", "data": "Invalid key"}'], 'data')
+        assert list(stream) == []
+        assert stream.meta == {'status': 'error', 'data': 'Invalid key'}
+
+    def test_truncated_body_raises(self):
+        body = json.dumps(_sensors_payload(5)).encode()[:-20]
+        with pytest.raises(ValueError):
+            list(JSONArrayStream([body], 'data'))
+
+    def test_from_parsed(self):
+        stream = JSONArrayStream.from_parsed({'status': 'ok', 'data': [1, 2]}, 'data')
+        assert list(stream) == [1, 2]
+        assert stream.meta == {'status': 'ok'}
+
+
+class TestNearestK:
+
+    def test_keeps_nearest_in_order(self):
+        nearest = NearestK(3)
+        for distance in [5, 1, 4, 2, 3, 0.5]:
+            nearest.offer(distance, distance)
+        assert nearest.items() == [0.5, 1, 2]
+
+    def test_ties_keep_first_seen(self):
+        nearest = NearestK(2)
+        for name in 'abc':
+            nearest.offer(1.0, name)
+        assert nearest.items() == ['a', 'b']
+
+    def test_unbounded(self):
+        nearest = NearestK(None)
+        for distance in [3, 1, 2]:
+            nearest.offer(distance, distance)
+        assert nearest.items() == [1, 2, 3]
+
+
+def _summary(source_data):
+    return [(sd.station_name, sd.distance_km, sd.aqi, sd.pollutants) for sd in source_data]
+
+
+def _full_sort_reference(adapter, payload, lat, lon, max_sensors):
+    """Select every usable sensor, then sort and slice (the pre-streaming behaviour)."""
+    everything = adapter.normalize_data(payload, lat, lon, max_sensors=len(payload['data']))
+    return everything[:max_sensors]
+
+
+@patch.object(PurpleAirAdapter, '_get_api_key', return_value='key')
+class TestPurpleAirSelection:
+
+    def test_top_k_matches_full_sort(self, mock_key):
+        adapter = PurpleAirAdapter()
+        payload = _sensors_payload()
+
+        selected = adapter.normalize_data(payload, 34.0, -118.2, max_sensors=10)
+
+        assert len(selected) == 10
+        assert _summary(selected) == _summary(_full_sort_reference(adapter, payload, 34.0, -118.2, 10))
+        # Sensors are identified by sensor_index, not their (non-unique) names
+        assert all(o.station_id == o.station_name.rsplit(' ', 1)[1] for o in selected)
+
+    def test_streamed_matches_parsed(self, mock_key):
+        adapter = PurpleAirAdapter()
+        payload = _sensors_payload()
+
+        streamed = adapter._nearest_from_stream(
+            JSONArrayStream(_chunks(payload, 256), 'data'), 34.0, -118.2, 10
+        )
+        assert _summary(streamed) == _summary(adapter.normalize_data(payload, 34.0, -118.2, 10))
+
+    def test_fields_after_data(self, mock_key):
+        adapter = PurpleAirAdapter()
+        payload = _sensors_payload(40)
+        reordered = {'data': payload['data'], 'fields': payload['fields']}
+
+        streamed = adapter._nearest_from_stream(
+            JSONArrayStream(_chunks(reordered, 64), 'data'), 34.0, -118.2, 5
+        )
+        assert _summary(streamed) == _summary(adapter.normalize_data(payload, 34.0, -118.2, 5))
+
+
+def _streaming_response(payload, content_length=None):
+    response = MagicMock()
+    response.status_code = 200
+    response.headers = {'Content-Length': content_length} if content_length else {}
+    response.raise_for_status = MagicMock()
+    response.iter_content.side_effect = lambda chunk_size: iter(_chunks(payload, 1024))
+    response.json.return_value = payload
+    return response
+
+
+@patch.object(PurpleAirAdapter, '_get_api_key', return_value='key')
+@patch.object(PurpleAirAdapter, '_log_response')
+@patch.object(PurpleAirAdapter, '_update_status')
+class TestStreamedRequest:
+
+    def test_large_body_is_streamed(self, mock_status, mock_log, mock_key):
+        adapter = PurpleAirAdapter()
+        response = _streaming_response(_sensors_payload())
+
+        with patch.object(adapter.session, 'request', return_value=response) as mock_request:
+            sensors = adapter.fetch_current(34.0, -118.2, max_sensors=5)
+
+        assert len(sensors) == 5
+        assert mock_request.call_args[1]['stream'] is True
+        response.json.assert_not_called()
+        response.close.assert_called()
+        # The log gets a summary, not the full body
+        logged = mock_log.call_args[1]['data']
+        assert logged['rows_streamed'] == 300
+        assert 'data' not in logged
+
+    def test_small_body_parsed_directly(self, mock_status, mock_log, mock_key):
+        adapter = PurpleAirAdapter()
+        response = _streaming_response(_sensors_payload(20), content_length='2000')
+
+        with patch.object(adapter.session, 'request', return_value=response):
+            sensors = adapter.fetch_current(34.0, -118.2, max_sensors=5)
+
+        assert len(sensors) == 5
+        response.iter_content.assert_not_called()
+
+    def test_malformed_stream_records_failure(self, mock_status, mock_log, mock_key):
+        adapter = PurpleAirAdapter()
+        response = _streaming_response({})
+        response.iter_content.side_effect = lambda chunk_size: iter([b'{"fields": [], "data": [[1,'])
+
+        with patch.object(adapter.session, 'request', return_value=response):
+            assert adapter.fetch_current(34.0, -118.2) == []
+
+        assert adapter.circuit_breaker._failure_count == 1
+
+
+@patch.object(WAQIAdapter, '_get_api_key', return_value='token')
+@patch.object(WAQIAdapter, '_log_response')
+@patch.object(WAQIAdapter, '_update_status')
+class TestWAQINearbyStations:
+
+    def _payload(self, status='ok'):
+        stations = [
+            {'lat': 34.0 + i / 100, 'lon': -118.2, 'uid': i, 'aqi': str(40 + i),
+             'station': {'name': f'Station {i}'}}
+            for i in range(30)
+        ]
+        stations.append({'lat': 34.0, 'lon': -118.2, 'uid': 99, 'aqi': '-', 'station': {'name': 'Offline'}})
+        return {'status': status, 'data': stations}
+
+    def test_nearest_stations_streamed(self, mock_status, mock_log, mock_key):
+        adapter = WAQIAdapter()
+        response = _streaming_response(self._payload())
+
+        with patch.object(adapter.session, 'request', return_value=response):
+            stations = adapter.fetch_nearby_stations(34.0, -118.2, max_stations=3)
+
+        assert [s.station_name for s in stations] == ['Station 0', 'Station 1', 'Station 2']
+
+    def test_error_status(self, mock_status, mock_log, mock_key):
+        adapter = WAQIAdapter()
+        response = _streaming_response(self._payload(status='error'))
+
+        with patch.object(adapter.session, 'request', return_value=response):
+            assert adapter.fetch_nearby_stations(34.0, -118.2) == []
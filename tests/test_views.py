@@ -138,6 +138,13 @@ class TestHealthAdviceViewValidation:
         response = self._get_view()(request)
         assert response.status_code == 400
 
+    def test_unknown_scale_returns_400(self, api_key):
+        factory = APIRequestFactory()
+        request = factory.get('/api/v1/health-advice/', {'aqi': '72', 'scale': 'FOO'})
+        _authenticate(request, api_key)
+        response = self._get_view()(request)
+        assert response.status_code == 400
+
 
 @pytest.mark.django_db
 class TestHealthCheckIsPublic:
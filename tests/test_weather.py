@@ -92,6 +92,163 @@ class TestUnitConversions:
         assert result[0]['weather_description'] == 'Rain'
 
 
+    def test_serializer_converts_at_render_time(self):
+        from apps.weather.serializers import HourlyForecastSerializer
+        hour = {
+            'time': '2026-03-23T12:00', 'temperature': 20.0, 'feels_like': None,
+            'dew_point': 10.0, 'humidity': 50, 'precipitation': 25.4,
+            'precipitation_probability': 10, 'weather_code': 0,
+            'weather_description': 'Clear', 'weather_icon': 'clear-day',
+            'cloud_cover': 0, 'visibility': 1609.344, 'wind_speed': 1.0,
+            'wind_direction': 90, 'wind_gusts': None, 'is_day': 1, 'uv_index': 5.0,
+        }
+        snapshot = dict(hour)
+        imperial = HourlyForecastSerializer(hour, context={'units': 'imperial'}).data
+        assert imperial['temperature'] == 68.0
+        assert imperial['precipitation'] == 1.0
+        assert imperial['visibility'] == 1.0
+        assert imperial['feels_like'] is None
+        assert imperial['uv_index'] == 5.0
+        assert HourlyForecastSerializer(hour).data['temperature'] == 20.0
+        assert hour == snapshot
+
+    def test_cache_hit_does_not_modify_cached_payload(self):
+        from apps.weather.orchestrator import WeatherOrchestrator
+        cached = {'current': {'temperature': 20.0}, 'source': 'OPEN_METEO'}
+        forecast = {'hourly_forecast': [], 'daily_forecast': [{'temp_high': 25.0}], 'source': 'OPEN_METEO'}
+        orchestrator = WeatherOrchestrator()
+        with patch.object(orchestrator.location_service, 'reverse_geocode', return_value={}), \
+                patch.object(orchestrator, '_get_from_cache', return_value=(cached, forecast)):
+            result = orchestrator.get_weather(34.05, -118.24, units='imperial')
+        assert result['units'] == 'imperial'
+        assert result['current'] is cached['current']
+        assert 'units' not in cached and 'location' not in cached
+        assert cached['current']['temperature'] == 20.0
+
+
+class TestWeatherRefreshCadence:
+
+    def _orchestrator(self, cached_current, cached_forecast):
+        from apps.weather.orchestrator import WeatherOrchestrator
+        orchestrator = WeatherOrchestrator()
+        orchestrator.location_service = MagicMock()
+        orchestrator.location_service.reverse_geocode.return_value = {}
+        orchestrator.primary = MagicMock(SOURCE_CODE='OPEN_METEO')
+        orchestrator.primary.is_available.return_value = True
+        orchestrator._get_from_cache = MagicMock(return_value=(cached_current, cached_forecast))
+        orchestrator._save_current = MagicMock()
+        orchestrator._save_to_cache = MagicMock()
+        return orchestrator
+
+    def test_expired_current_refreshed_alone(self):
+        forecast = {'hourly_forecast': [], 'daily_forecast': [{'uv_index_max': 6.5}], 'source': 'OPEN_METEO'}
+        orchestrator = self._orchestrator(None, forecast)
+        orchestrator.primary.fetch_conditions.return_value = {'temperature': 21.0, 'uv_index': None}
+
+        result = orchestrator.get_weather(34.05, -118.24)
+
+        orchestrator.primary.fetch_current.assert_not_called()
+        assert result['current'] == {'temperature': 21.0, 'uv_index': 6.5}
+        assert result['daily_forecast'] is forecast['daily_forecast']
+        orchestrator._save_current.assert_called_once()
+        orchestrator._save_to_cache.assert_not_called()
+
+    def test_expired_forecast_refetches_everything(self):
+        orchestrator = self._orchestrator({'current': {}, 'source': 'OPEN_METEO'}, None)
+        orchestrator.primary.fetch_current.return_value = {
+            'current': {'temperature': 21.0}, 'hourly_forecast': [], 'daily_forecast': [],
+            'source': 'OPEN_METEO',
+        }
+
+        result = orchestrator.get_weather(34.05, -118.24)
+
+        orchestrator.primary.fetch_conditions.assert_not_called()
+        assert result['current'] == {'temperature': 21.0}
+        orchestrator._save_to_cache.assert_called_once()
+
+    def test_conditions_request_asks_for_current_block_only(self):
+        from apps.adapters.open_meteo import OpenMeteoWeatherAdapter
+        adapter = OpenMeteoWeatherAdapter()
+        raw = {'timezone': 'America/Los_Angeles', 'current': {'time': '2026-03-23T14:00', 'temperature_2m': 21.0}}
+        with patch.object(adapter, '_make_request', return_value=raw) as mock_request:
+            current = adapter.fetch_conditions(37.77, -122.42)
+
+        params = mock_request.call_args[1]['params']
+        assert 'hourly' not in params and 'daily' not in params
+        assert current['temperature'] == 21.0
+        assert current['sunrise'] == '2026-03-23T07:09'
+
+
+class TestHedgedFetch:
+
+    @pytest.fixture
+    def orchestrator(self, settings):
+        from apps.weather.orchestrator import WeatherOrchestrator
+        settings.WEATHER_SETTINGS = {**settings.WEATHER_SETTINGS, 'HEDGE_DEFAULT_DELAY': 0.05}
+        orchestrator = WeatherOrchestrator()
+        orchestrator.primary = MagicMock(SOURCE_CODE='OPEN_METEO')
+        orchestrator.fallback = MagicMock(SOURCE_CODE='OWM_WEATHER')
+        for adapter in (orchestrator.primary, orchestrator.fallback):
+            adapter.is_available.return_value = True
+        return orchestrator
+
+    def test_latency_percentile(self):
+        from apps.weather.hedging import LatencyTracker
+        tracker = LatencyTracker()
+        assert tracker.percentile(0.9) is None
+        for ms in range(1, 11):
+            tracker.record(ms / 1000)
+        assert tracker.percentile(0.9) == 0.01
+        assert tracker.percentile(0.9, min_samples=20) is None
+
+    def test_cache_hits_do_not_move_hedge_delay(self, orchestrator, settings):
+        from apps.weather.hedging import hedge_delay
+        settings.WEATHER_SETTINGS = {**settings.WEATHER_SETTINGS, 'HEDGE_MIN_SAMPLES': 5}
+        primary = orchestrator.primary
+        primary.SOURCE_CODE = 'HEDGE_CACHE_TEST'
+        primary.fetch_current.return_value = {'source': 'OPEN_METEO'}
+        primary.last_request_upstream = False
+
+        for _ in range(10):
+            orchestrator._fetch_from(primary, 34.05, -118.24)
+
+        assert hedge_delay('HEDGE_CACHE_TEST') == settings.WEATHER_SETTINGS['HEDGE_DEFAULT_DELAY']
+
+    def test_slow_primary_loses_to_hedged_fallback(self, orchestrator):
+        import threading
+        release = threading.Event()
+
+        def slow_primary(*args, **kwargs):
+            release.wait(5)
+            return {'source': 'OPEN_METEO'}
+
+        orchestrator.primary.fetch_current.side_effect = slow_primary
+        orchestrator.fallback.fetch_current.return_value = {'source': 'OWM_WEATHER'}
+        with patch('apps.weather.orchestrator.metrics') as mock_metrics:
+            result = orchestrator._fetch(34.05, -118.24)
+        release.set()
+
+        assert result == {'source': 'OWM_WEATHER'}
+        orchestrator.primary.cancel.assert_called_once()
+        counted = [c.args for c in mock_metrics.increment.call_args_list]
+        assert ('OPEN_METEO', 'hedges') in counted
+        assert ('OWM_WEATHER', 'hedge_requests') in counted
+        assert ('OWM_WEATHER', 'hedge_wins') in counted
+
+    def test_fast_primary_is_not_hedged(self, orchestrator):
+        orchestrator.primary.fetch_current.return_value = {'source': 'OPEN_METEO'}
+        assert orchestrator._fetch(34.05, -118.24) == {'source': 'OPEN_METEO'}
+        orchestrator.fallback.fetch_current.assert_not_called()
+
+    def test_failed_primary_fails_over_without_hedging(self, orchestrator):
+        orchestrator.primary.fetch_current.return_value = None
+        orchestrator.fallback.fetch_current.return_value = {'source': 'OWM_WEATHER'}
+        with patch('apps.weather.orchestrator.metrics') as mock_metrics:
+            assert orchestrator._fetch(34.05, -118.24) == {'source': 'OWM_WEATHER'}
+        counted = [c.args for c in mock_metrics.increment.call_args_list]
+        assert ('OPEN_METEO', 'hedges') not in counted
+
+
 # ---------------------------------------------------------------------------
 # Open-Meteo adapter tests
 # ---------------------------------------------------------------------------
@@ -144,6 +301,143 @@ class TestOpenMeteoAdapter:
         result = _decode_weather_code(None)
         assert result['description'] == 'Unknown'
 
+    def test_wmo_night_icon(self):
+        from apps.adapters.open_meteo import _decode_weather_code
+        assert _decode_weather_code(0, is_day=0)['icon'] == 'clear-night'
+        assert _decode_weather_code(2, is_day=0)['icon'] == 'partly-cloudy-night'
+        assert _decode_weather_code(3, is_day=0)['icon'] == 'cloudy'
+
+    def test_columns_pad_and_truncate(self):
+        from apps.adapters.open_meteo import columns
+        raw = {'a': [1, 2, 3], 'b': [1]}
+        assert columns(raw, ('a', 'b', 'missing'), 2) == [[1, 2], [1, None], [None, None]]
+
+    def test_hourly_normalize_handles_ragged_arrays(self):
+        from apps.adapters.open_meteo import OpenMeteoWeatherAdapter
+        raw = {'hourly': {
+            'time': ['2025-06-01T00:00', '2025-06-01T01:00'],
+            'temperature_2m': [15.0],
+            'weather_code': [0, 0],
+            'is_day': [0, None],
+        }}
+        hourly = OpenMeteoWeatherAdapter()._normalize(raw, 34.05, -118.24)['hourly_forecast']
+        assert [h['temperature'] for h in hourly] == [15.0, None]
+        assert [h['weather_icon'] for h in hourly] == ['clear-night', 'clear-night']
+        assert hourly[1]['is_day'] == 0
+
+    def test_daily_sun_events_computed_locally(self):
+        from apps.adapters.open_meteo import OpenMeteoWeatherAdapter
+        raw = {
+            'timezone': 'America/Los_Angeles',
+            'daily': {'time': ['2026-03-23', 'not-a-date'], 'weather_code': [0, 0]},
+        }
+        result = OpenMeteoWeatherAdapter()._normalize(raw, 37.7749, -122.4194)
+        today, bad = result['daily_forecast']
+        assert today['sunrise'] == '2026-03-23T07:09'
+        assert today['sunset'] == '2026-03-23T19:23'
+        assert today['golden_hour']['morning']['start'] < today['sunrise']
+        assert today['blue_hour']['evening']['start'] == today['golden_hour']['evening']['end']
+        assert result['current']['sunrise'] == today['sunrise']
+        assert bad['sunrise'] is None and bad['moon_phase'] is None
+
+    def test_pollen_summary(self):
+        from apps.adapters.open_meteo_air_quality import OpenMeteoAirQualityAdapter
+        pollen = OpenMeteoAirQualityAdapter()._extract_pollen({
+            'alder_pollen': 10.0, 'birch_pollen': 30.0, 'olive_pollen': None,
+            'grass_pollen': 25.0, 'mugwort_pollen': 0.0, 'ragweed_pollen': None,
+        })
+        assert pollen['tree'] == {'level': 'moderate', 'value': 20.0}
+        assert pollen['grass'] == {'level': 'high', 'value': 25.0}
+        assert pollen['weed'] == {'level': 'none', 'value': 0.0}
+        assert pollen['dominant_allergen'] == 'Birch'
+
+    def test_combined_fetch_splits_history_from_forecast(self):
+        from apps.adapters.open_meteo_air_quality import OpenMeteoAirQualityAdapter
+        adapter = OpenMeteoAirQualityAdapter()
+        # One past day then two forecast days
+        times = [f"2026-03-{day:02d}T{hour:02d}:00" for day in (22, 23, 24) for hour in range(24)]
+        raw = {
+            'utc_offset_seconds': -25200,
+            'current': {'time': '2026-03-23T14:00', 'us_aqi': 55, 'pm2_5': 12.0, 'ozone': None},
+            'hourly': {'time': times, 'us_aqi': [10] * 24 + [50] * 24 + [90] * 24},
+        }
+        with patch.object(adapter, '_make_request', return_value=raw) as mock_request:
+            result = adapter.fetch_combined(34.05, -118.24, past_days=1)
+
+        assert mock_request.call_count == 1
+        assert mock_request.call_args[1]['params']['past_days'] == 1
+        assert result['hourly'][0]['time'] == '2026-03-23T00:00'
+        assert len(result['hourly']) == 48
+        assert result['historical'] == {
+            'past_days': 1, 'aqi_avg': 30.0, 'aqi_min': 10, 'aqi_max': 50, 'sample_count': 48,
+        }
+        observation = result['observation']
+        assert (observation.source, observation.aqi) == ('OPEN_METEO_AQ', 55)
+        assert observation.pollutants == {'pm25': 12.0}
+        assert observation.timestamp.isoformat() == '2026-03-23T21:00:00+00:00'
+
+    def test_aq_orchestrator_blends_prefetched_reading(self):
+        from concurrent.futures import Future
+        from apps.api.orchestrator import AirQualityOrchestrator
+
+        orchestrator = AirQualityOrchestrator()
+        adapter = orchestrator.adapters['OPEN_METEO_AQ']
+        prefetched = Future()
+        prefetched.set_result({'observation': 'reading'})
+        with patch.object(adapter, 'fetch_combined') as mock_fetch:
+            data = orchestrator._safe_fetch_current(adapter, 34.05, -118.24, 25, om_aq=prefetched)
+
+        assert data == ['reading']
+        mock_fetch.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# Astronomy tests
+# ---------------------------------------------------------------------------
+
+class TestAstronomy:
+
+    def test_moon_phase_table_matches_direct_computation(self):
+        from datetime import date
+        from apps.weather.astronomy import TABLE_END, _moon_row, compute_moon_phase
+        assert compute_moon_phase(date(2000, 1, 6))['name'] == 'New Moon'
+        for d in (date(2024, 4, 23), TABLE_END, date(2100, 1, 1)):
+            name, value, illumination = _moon_row(d.toordinal())
+            assert compute_moon_phase(d) == {'name': name, 'value': value, 'illumination': illumination}
+
+    def test_full_moon_illumination(self):
+        from datetime import date
+        from apps.weather.astronomy import compute_moon_phase
+        phase = compute_moon_phase(date(2024, 4, 23))
+        assert phase['name'] == 'Full Moon'
+        assert phase['illumination'] >= 95
+
+    def test_sun_events_southern_hemisphere(self):
+        from datetime import date
+        from zoneinfo import ZoneInfo
+        from apps.weather.astronomy import compute_sun_events
+        (sydney,) = compute_sun_events(-33.87, 151.21, [date(2026, 1, 1)], ZoneInfo('Australia/Sydney'))
+        assert sydney['sunrise'] == '2026-01-01T05:47'
+        assert sydney['sunset'] == '2026-01-01T20:09'
+
+    def test_sun_events_across_the_date_line(self):
+        from datetime import date
+        from zoneinfo import ZoneInfo
+        from apps.weather.astronomy import compute_sun_events
+        # UTC+13 at ~175°W: Greenwich-based transit lands on the next local day
+        for lat, lon, zone in ((-21.1, -175.2, 'Pacific/Tongatapu'), (-13.83, -171.76, 'Pacific/Apia')):
+            (day,) = compute_sun_events(lat, lon, [date(2024, 6, 21)], ZoneInfo(zone))
+            assert day['sunrise'].startswith('2024-06-21T')
+            assert day['sunset'].startswith('2024-06-21T')
+            assert day['golden_hour']['evening']['end'].startswith('2024-06-21T')
+
+    def test_polar_day_and_night_have_no_events(self):
+        from datetime import date, timezone as dt_timezone
+        from apps.weather.astronomy import compute_sun_events
+        events = compute_sun_events(78.2, 15.6, [date(2026, 6, 21), date(2026, 12, 21)], dt_timezone.utc)
+        for day in events:
+            assert day == {'sunrise': None, 'sunset': None, 'golden_hour': None, 'blue_hour': None}
+
 
 # ---------------------------------------------------------------------------
 # OWM weather adapter tests